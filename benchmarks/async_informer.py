@@ -0,0 +1,122 @@
+# ============================================================
+#
+# Copyright (C) 2018 Jan Moringen
+#
+# This file may be licensed under the terms of the
+# GNU Lesser General Public License Version 3 (the ``LGPL''),
+# or (at your option) any later version.
+#
+# Software distributed under the License is distributed
+# on an ``AS IS'' basis, WITHOUT WARRANTY OF ANY KIND, either
+# express or implied. See the LGPL for the specific language
+# governing rights and limitations.
+#
+# You should have received a copy of the LGPL along with this
+# program. If not, go to http://www.gnu.org/licenses/lgpl.html
+# or write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ============================================================
+
+"""
+Measures the cost of publishing from a periodic control loop.
+
+A loop running at the requested frequency publishes one sample per
+cycle through an :obj:`rsb.Informer` with a socket transport out
+connector acting as bus server, either synchronously or with an
+:obj:`rsb.eventprocessing.AsyncEventSendingStrategy`. A separate client
+process receives the notifications through a raw socket connection.
+Reported are the median, 99th percentile and maximum duration of the
+publish calls and, for the asynchronous mode, the queue-to-connector
+latency reported by the sending strategy.
+
+Usage::
+
+    python benchmarks/async_informer.py --frequency 1000 --duration 5
+"""
+
+import argparse
+import multiprocessing
+import socket
+import statistics
+import time
+
+import rsb
+from rsb.eventprocessing import AsyncEventSendingStrategy
+from rsb.eventprocessing import OutRouteConfigurator
+from rsb.transport.socket import OutConnector
+
+
+SCOPE = '/benchmark/async'
+
+
+def _receive(port, ready):
+    client = socket.create_connection(('localhost', port))
+    assert client.recv(4, socket.MSG_WAITALL) == b'\0\0\0\0'
+    ready.set()
+    while client.recv(1 << 20):
+        pass
+    client.close()
+
+
+def run(mode, frequency, duration, port):
+    strategy = AsyncEventSendingStrategy() if mode == 'async' else None
+    connector = OutConnector(
+        converters=rsb.converter.get_global_converter_map(bytes),
+        options={'server': '1', 'port': str(port)})
+    informer = rsb.create_informer(
+        SCOPE, data_type=bytes,
+        configurator=OutRouteConfigurator(connectors=[connector],
+                                          sending_strategy=strategy))
+
+    ready = multiprocessing.Event()
+    client = multiprocessing.Process(target=_receive, args=(port, ready))
+    client.start()
+    ready.wait()
+    # Wait for the server to register the connection.
+    time.sleep(0.2)
+
+    sample = b'x' * 256
+    period = 1.0 / frequency
+    durations = []
+    start = time.perf_counter()
+    for i in range(int(frequency * duration)):
+        # Sleep until the start of the next cycle.
+        delay = start + i * period - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        before = time.perf_counter()
+        informer.publish_data(sample)
+        durations.append(time.perf_counter() - before)
+
+    informer.deactivate()
+    client.join()
+
+    durations.sort()
+    result = (statistics.median(durations) * 1e6,
+              durations[int(len(durations) * 0.99)] * 1e6,
+              durations[-1] * 1e6)
+    if strategy is not None:
+        result += (strategy.mean_latency * 1e6, strategy.max_latency * 1e6)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--frequency', type=float, default=1000)
+    parser.add_argument('--duration', type=float, default=5)
+    parser.add_argument('--port', type=int, default=55999)
+    arguments = parser.parse_args()
+
+    print('{:>6} {:>12} {:>12} {:>12} {:>16} {:>16}'.format(
+        'mode', 'median [us]', 'p99 [us]', 'max [us]',
+        'mean lat. [us]', 'max lat. [us]'))
+    for (offset, mode) in enumerate(('sync', 'async')):
+        result = run(mode, arguments.frequency, arguments.duration,
+                     arguments.port + offset)
+        print(('{:>6}' + ' {:>12.0f}' * 3 + ' {:>16.0f}' * (len(result) - 3))
+              .format(mode, *result))
+
+
+if __name__ == '__main__':
+    main()
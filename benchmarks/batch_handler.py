@@ -0,0 +1,101 @@
+# ============================================================
+#
+# Copyright (C) 2018 Jan Moringen
+#
+# This file may be licensed under the terms of the
+# GNU Lesser General Public License Version 3 (the ``LGPL''),
+# or (at your option) any later version.
+#
+# Software distributed under the License is distributed
+# on an ``AS IS'' basis, WITHOUT WARRANTY OF ANY KIND, either
+# express or implied. See the LGPL for the specific language
+# governing rights and limitations.
+#
+# You should have received a copy of the LGPL along with this
+# program. If not, go to http://www.gnu.org/licenses/lgpl.html
+# or write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ============================================================
+
+"""
+Compares storing received events one at a time and in batches.
+
+An informer publishes events through the inprocess transport to a
+listener whose handler stores the events in an SQLite database with one
+transaction per handler call. The handler is either added with
+:obj:`rsb.Listener.add_handler` and stores one event per transaction
+or with :obj:`rsb.Listener.add_batch_handler` and stores a list of
+events per transaction. Reported is the time until all events are
+stored.
+
+Usage::
+
+    python benchmarks/batch_handler.py --events 5000 --max-batch 100
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+import rsb
+
+
+SCOPE = '/benchmark/batch'
+
+
+def run(mode, num_events, max_batch, path):
+    config = rsb.ParticipantConfig.from_dict(
+        {'transport.inprocess.enabled': '1', 'introspection.enabled': '0'})
+    database = sqlite3.connect(path, check_same_thread=False)
+    database.execute('CREATE TABLE samples (sequence INTEGER, value REAL)')
+    database.commit()
+    done = threading.Event()
+    stored = [0]
+
+    def store(events):
+        with database:
+            database.executemany(
+                'INSERT INTO samples VALUES (?, ?)',
+                [(event.event_id.sequence_number, event.data)
+                 for event in events])
+        stored[0] += len(events)
+        if stored[0] == num_events:
+            done.set()
+
+    with rsb.create_listener(SCOPE, config) as listener, \
+            rsb.create_informer(SCOPE, config, data_type=float) as informer:
+        if mode == 'single':
+            listener.add_handler(lambda event: store([event]))
+        else:
+            listener.add_batch_handler(store, max_batch=max_batch,
+                                       max_latency=0.01)
+        start = time.perf_counter()
+        for i in range(num_events):
+            informer.publish_data(float(i))
+        done.wait()
+        elapsed = time.perf_counter() - start
+    database.close()
+    return elapsed * 1e3, num_events / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--events', type=int, default=5000)
+    parser.add_argument('--max-batch', type=int, default=100)
+    arguments = parser.parse_args()
+
+    print('{:>8} {:>12} {:>12}'.format('mode', 'total [ms]', 'events/s'))
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in ('single', 'batch'):
+            path = os.path.join(directory, mode + '.sqlite')
+            elapsed, rate = run(mode, arguments.events, arguments.max_batch,
+                                path)
+            print('{:>8} {:>12.1f} {:>12.0f}'.format(mode, elapsed, rate))
+
+
+if __name__ == '__main__':
+    main()
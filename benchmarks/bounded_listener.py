@@ -0,0 +1,94 @@
+# ============================================================
+#
+# Copyright (C) 2018 Jan Moringen
+#
+# This file may be licensed under the terms of the
+# GNU Lesser General Public License Version 3 (the ``LGPL''),
+# or (at your option) any later version.
+#
+# Software distributed under the License is distributed
+# on an ``AS IS'' basis, WITHOUT WARRANTY OF ANY KIND, either
+# express or implied. See the LGPL for the specific language
+# governing rights and limitations.
+#
+# You should have received a copy of the LGPL along with this
+# program. If not, go to http://www.gnu.org/licenses/lgpl.html
+# or write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ============================================================
+
+"""
+Measures the memory used by a listener with a slow handler.
+
+An informer publishes events through the inprocess transport as fast as
+possible to a listener whose handler takes a fixed amount of time per
+event, e.g. because it writes to disk. For unbounded handler queues and
+for bounded queues with each overflow policy, reported are the number of
+delivered and dropped events, the high-water mark of the handler queue,
+the peak memory allocated during the run and the publishing rate.
+
+Usage::
+
+    python benchmarks/bounded_listener.py --events 50000 --queue-size 1000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import rsb
+
+
+SCOPE = '/benchmark/bounded'
+
+
+def run(queue_size, overflow, num_events, work):
+    config = rsb.ParticipantConfig.from_dict(
+        {'transport.inprocess.enabled': '1', 'introspection.enabled': '0'})
+    delivered = [0]
+
+    def handler(event):
+        time.sleep(work)
+        delivered[0] += 1
+
+    tracemalloc.start()
+    with rsb.create_listener(SCOPE, config, queue_size=queue_size,
+                             overflow=overflow) as listener, \
+            rsb.create_informer(SCOPE, config, data_type=bytes) as informer:
+        listener.add_handler(handler)
+        sample = b'x' * 256
+        start = time.perf_counter()
+        for _ in range(num_events):
+            informer.publish_data(sample)
+        rate = num_events / (time.perf_counter() - start)
+        _, peak = tracemalloc.get_traced_memory()
+        dropped = listener.dropped_events
+        depth = listener.max_queue_depth
+    tracemalloc.stop()
+    return delivered[0], dropped, depth, peak / 2 ** 20, rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--events', type=int, default=20000)
+    parser.add_argument('--queue-size', type=int, default=1000)
+    parser.add_argument('--work', type=float, default=0.0001,
+                        help='Duration of each handler call in seconds')
+    arguments = parser.parse_args()
+
+    print('{:>12} {:>10} {:>9} {:>10} {:>10} {:>10}'.format(
+        'policy', 'delivered', 'dropped', 'max depth', 'peak [MiB]',
+        'events/s'))
+    for queue_size, overflow in ((None, 'block'),
+                                 (arguments.queue_size, 'block'),
+                                 (arguments.queue_size, 'drop-oldest'),
+                                 (arguments.queue_size, 'drop-newest')):
+        result = run(queue_size, overflow, arguments.events, arguments.work)
+        policy = 'unbounded' if queue_size is None else overflow
+        print('{:>12} {:>10} {:>9} {:>10} {:>10.1f} {:>10.0f}'.format(
+            policy, *result))
+
+
+if __name__ == '__main__':
+    main()
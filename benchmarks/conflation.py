@@ -0,0 +1,142 @@
+# ============================================================
+#
+# Copyright (C) 2018 Jan Moringen
+#
+# This file may be licensed under the terms of the
+# GNU Lesser General Public License Version 3 (the ``LGPL''),
+# or (at your option) any later version.
+#
+# Software distributed under the License is distributed
+# on an ``AS IS'' basis, WITHOUT WARRANTY OF ANY KIND, either
+# express or implied. See the LGPL for the specific language
+# governing rights and limitations.
+#
+# You should have received a copy of the LGPL along with this
+# program. If not, go to http://www.gnu.org/licenses/lgpl.html
+# or write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ============================================================
+
+"""
+Shows the effect of conflation in the socket transport on a slow link.
+
+A socket transport out connector acting as bus server publishes
+samples on a few sub-scopes at a fixed rate. A separate client process
+reads from its connection with a limited bandwidth. Without conflation
+the send queue of the connection fills up and the samples received by
+the client become older and older. With conflation (the ``conflate``
+option), the client receives fewer samples but their age stays
+bounded.
+
+Usage::
+
+    python benchmarks/conflation.py --rate 500 --size 16384 --bandwidth 2000000
+"""
+
+import argparse
+import multiprocessing
+import socket
+import time
+
+import rsb
+from rsb.eventprocessing import OutRouteConfigurator
+from rsb.protocol.Notification_pb2 import Notification
+from rsb.transport.socket import OutConnector
+from rsb.util import time_to_unix_microseconds
+
+
+SCOPE = '/benchmark/conflation'
+SUB_SCOPES = [rsb.Scope(SCOPE + '/joint{}'.format(i)) for i in range(4)]
+
+
+def _receive(port, bandwidth, ready, results):
+    client = socket.create_connection(('localhost', port))
+    client.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 65536)
+    assert client.recv(4, socket.MSG_WAITALL) == b'\0\0\0\0'
+    ready.set()
+    received, ages = 0, []
+    chunk = 4096
+    while True:
+        header = client.recv(4, socket.MSG_WAITALL)
+        if len(header) < 4:
+            break
+        size = int.from_bytes(header, 'little')
+        data = bytearray()
+        while len(data) < size:
+            data += client.recv(min(chunk, size - len(data)))
+            # Limit the bandwidth of the link.
+            time.sleep(chunk / bandwidth)
+        notification = Notification()
+        notification.ParseFromString(bytes(data))
+        # Ignore the notification announcing the shutdown of the bus.
+        if not notification.scope.startswith(SCOPE.encode()):
+            continue
+        received += 1
+        ages.append(time_to_unix_microseconds(time.time()) -
+                    notification.meta_data.send_time)
+    results.put((received, ages))
+
+
+def run(conflate, rate, duration, size, bandwidth, port):
+    connector = OutConnector(
+        converters=rsb.converter.get_global_converter_map(bytes),
+        options={'server': '1', 'port': str(port),
+                 'conflate': '1' if conflate else '0'})
+    informer = rsb.create_informer(
+        SCOPE, data_type=bytes,
+        configurator=OutRouteConfigurator(connectors=[connector]))
+
+    ready, results = multiprocessing.Event(), multiprocessing.Queue()
+    client = multiprocessing.Process(
+        target=_receive, args=(port, bandwidth, ready, results))
+    client.start()
+    ready.wait()
+    # Wait for the server to register the connection.
+    time.sleep(0.2)
+
+    sample = b'x' * size
+    sent = int(rate * duration)
+    start = time.perf_counter()
+    for i in range(sent):
+        delay = start + i / rate - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        informer.publish_event(rsb.Event(
+            scope=SUB_SCOPES[i % len(SUB_SCOPES)], data=sample,
+            data_type=bytes))
+
+    connection = connector.bus.connections[0]
+    max_depth = connection.max_queue_depth
+    conflated = connection.conflated_notifications
+    informer.deactivate()
+    received, ages = results.get()
+    client.join()
+    return (sent, received, conflated, max_depth,
+            sum(ages) / len(ages) / 1000.0, ages[-1] / 1000.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rate', type=float, default=1000)
+    parser.add_argument('--duration', type=float, default=3)
+    parser.add_argument('--size', type=int, default=16384,
+                        help='Size of the samples in bytes')
+    parser.add_argument('--bandwidth', type=float, default=2000000,
+                        help='Bandwidth of the client in bytes/s')
+    parser.add_argument('--port', type=int, default=56111)
+    arguments = parser.parse_args()
+
+    print('{:>9} {:>8} {:>9} {:>10} {:>10} {:>14} {:>14}'.format(
+        'conflate', 'sent', 'received', 'conflated', 'max depth',
+        'mean age [ms]', 'last age [ms]'))
+    for (offset, conflate) in enumerate((False, True)):
+        result = run(conflate, arguments.rate, arguments.duration,
+                     arguments.size, arguments.bandwidth,
+                     arguments.port + offset)
+        print('{:>9} {:>8} {:>9} {:>10} {:>10} {:>14.1f} {:>14.1f}'.format(
+            str(conflate), *result))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+# ============================================================
+#
+# Copyright (C) 2018 Jan Moringen
+#
+# This file may be licensed under the terms of the
+# GNU Lesser General Public License Version 3 (the ``LGPL''),
+# or (at your option) any later version.
+#
+# Software distributed under the License is distributed
+# on an ``AS IS'' basis, WITHOUT WARRANTY OF ANY KIND, either
+# express or implied. See the LGPL for the specific language
+# governing rights and limitations.
+#
+# You should have received a copy of the LGPL along with this
+# program. If not, go to http://www.gnu.org/licenses/lgpl.html
+# or write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ============================================================
+
+"""
+Measures how dispatching scales with the number of receivers.
+
+An :obj:`rsb.util.OrderedQueueDispatcherPool` with a fixed number of
+worker threads dispatches messages to an increasing number of
+registered receivers, each of which only counts its messages. Reported
+are the number of deliveries per second and the time per delivery for
+each number of receivers.
+
+Usage::
+
+    python benchmarks/dispatcher_pool.py --receivers 1 10 100 200 500
+"""
+
+import argparse
+import threading
+import time
+
+from rsb.util import OrderedQueueDispatcherPool
+
+
+class _Receiver:
+
+    def __init__(self):
+        self.count = 0
+
+
+def run(num_receivers, num_messages, num_threads):
+    done = threading.Event()
+    remaining = [num_receivers]
+    lock = threading.Lock()
+
+    def deliver(receiver, message):
+        receiver.count += 1
+        if receiver.count == num_messages:
+            with lock:
+                remaining[0] -= 1
+                if not remaining[0]:
+                    done.set()
+
+    pool = OrderedQueueDispatcherPool(num_threads, deliver)
+    for _ in range(num_receivers):
+        pool.register_receiver(_Receiver())
+    pool.start()
+
+    start = time.perf_counter()
+    for i in range(num_messages):
+        pool.push(i)
+    done.wait()
+    elapsed = time.perf_counter() - start
+    pool.stop()
+
+    deliveries = num_receivers * num_messages
+    return deliveries / elapsed, elapsed / deliveries * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--receivers', type=int, nargs='+',
+                        default=[1, 10, 50, 200, 500])
+    parser.add_argument('--deliveries', type=int, default=100000,
+                        help='Total number of deliveries per run')
+    parser.add_argument('--threads', type=int, default=5)
+    arguments = parser.parse_args()
+
+    print('{:>10} {:>15} {:>18}'.format(
+        'receivers', 'deliveries/s', 'us/delivery'))
+    for num_receivers in arguments.receivers:
+        num_messages = max(1, arguments.deliveries // num_receivers)
+        throughput, duration = run(num_receivers, num_messages,
+                                   arguments.threads)
+        print('{:>10} {:>15.0f} {:>18.2f}'.format(
+            num_receivers, throughput, duration))
+
+
+if __name__ == '__main__':
+    main()
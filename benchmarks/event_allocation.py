@@ -0,0 +1,119 @@
+# ============================================================
+#
+# Copyright (C) 2018 Jan Moringen
+#
+# This file may be licensed under the terms of the
+# GNU Lesser General Public License Version 3 (the ``LGPL''),
+# or (at your option) any later version.
+#
+# Software distributed under the License is distributed
+# on an ``AS IS'' basis, WITHOUT WARRANTY OF ANY KIND, either
+# express or implied. See the LGPL for the specific language
+# governing rights and limitations.
+#
+# You should have received a copy of the LGPL along with this
+# program. If not, go to http://www.gnu.org/licenses/lgpl.html
+# or write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ============================================================
+
+"""
+Measures memory and time per :obj:`rsb.Event`.
+
+For each scenario, the requested number of events (each with an
+:obj:`rsb.EventId` and :obj:`rsb.MetaData`) is created and retained
+while :mod:`tracemalloc` traces allocations, which yields the number of
+bytes allocated per live event. Afterwards, events are created (and
+converted to notifications) at the requested rate to check whether that
+rate can be sustained and how much time per second it leaves to the
+rest of the application.
+
+Usage::
+
+    python benchmarks/event_allocation.py --rate 100000
+"""
+
+import argparse
+import time
+import tracemalloc
+import uuid
+
+import rsb
+from rsb.converter import get_global_converter_map
+from rsb.protocol.Notification_pb2 import Notification
+from rsb.transport.conversion import event_to_notification
+
+
+SCOPE = rsb.Scope('/benchmark/allocation/')
+
+
+def _make_event(participant_id, sequence_number):
+    event = rsb.Event(event_id=rsb.EventId(participant_id, sequence_number),
+                      scope=SCOPE, data=b'x' * 16, data_type=bytes)
+    event.meta_data.set_send_time()
+    return event
+
+
+def _make_and_convert(participant_id, sequence_number, converter):
+    event = _make_event(participant_id, sequence_number)
+    wire_data, wire_schema = converter.serialize(event.data)
+    event_to_notification(Notification(), event, wire_schema, wire_data)
+    hash(event.event_id)
+
+
+def bytes_per_event(number):
+    participant_id = uuid.uuid4()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    events = [_make_event(participant_id, i) for i in range(number)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff
+                    for stat in after.compare_to(before, 'filename'))
+    del events
+    return allocated / number
+
+
+def paced(rate, duration, operation):
+    participant_id = uuid.uuid4()
+    total = int(rate * duration)
+    busy = 0.0
+    start = time.perf_counter()
+    for i in range(total):
+        # Wait for the slot of this event.
+        while time.perf_counter() < start + i / rate:
+            pass
+        operation_start = time.perf_counter()
+        operation(participant_id, i)
+        busy += time.perf_counter() - operation_start
+    elapsed = time.perf_counter() - start
+    return (total / elapsed, busy / elapsed * 100.0, busy / total * 1e9)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rate', type=int, default=100000)
+    parser.add_argument('--duration', type=float, default=2.0)
+    parser.add_argument('--events', type=int, default=100000)
+    arguments = parser.parse_args()
+
+    converter = get_global_converter_map(bytes) \
+        .get_converter_for_data_type(bytes)
+
+    print('{:>20} {:>12.0f}'.format(
+        'bytes/event', bytes_per_event(arguments.events)))
+    print('{:>20} {:>12} {:>12} {:>12}'.format(
+        'operation', 'events/s', 'busy [%]', 'ns/event'))
+    for name, operation in (
+            ('create', _make_event),
+            ('create+convert',
+             lambda p, i: _make_and_convert(p, i, converter))):
+        throughput, busy, duration = paced(
+            arguments.rate, arguments.duration, operation)
+        print('{:>20} {:>12.0f} {:>12.1f} {:>12.0f}'.format(
+            name, throughput, busy, duration))
+
+
+if __name__ == '__main__':
+    main()
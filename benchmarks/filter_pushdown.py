@@ -0,0 +1,121 @@
+# ============================================================
+#
+# Copyright (C) 2018 Jan Moringen
+#
+# This file may be licensed under the terms of the
+# GNU Lesser General Public License Version 3 (the ``LGPL''),
+# or (at your option) any later version.
+#
+# Software distributed under the License is distributed
+# on an ``AS IS'' basis, WITHOUT WARRANTY OF ANY KIND, either
+# express or implied. See the LGPL for the specific language
+# governing rights and limitations.
+#
+# You should have received a copy of the LGPL along with this
+# program. If not, go to http://www.gnu.org/licenses/lgpl.html
+# or write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ============================================================
+
+"""
+Measures the effect of pushing filters down into socket in connectors.
+
+A socket transport in connector receives a stream of notifications
+which resembles the traffic on a method scope of a remote server: most
+notifications are ``REPLY`` events while the listener only wants
+``REQUEST`` events. Without pushdown, every notification is decoded and
+queued before the receiving strategy discards it. With pushdown, the
+connector discards non-matching notifications before decoding them.
+
+Usage::
+
+    python benchmarks/filter_pushdown.py --notifications 50000 --size 1024
+"""
+
+import argparse
+import threading
+import time
+import uuid
+
+import rsb
+from rsb.converter import get_global_converter_map
+from rsb.eventprocessing import ParallelEventReceivingStrategy
+from rsb.filter import FilterAction, MethodFilter
+from rsb.protocol.Notification_pb2 import Notification
+from rsb.transport.socket import InConnector
+
+
+SCOPE = '/benchmark/pushdown/method/'
+
+
+def make_notifications(count, size, request_ratio):
+    notifications = []
+    sender_id = uuid.uuid4().bytes
+    data = 'x' * size
+    every = max(1, int(round(1 / request_ratio)))
+    for i in range(count):
+        notification = Notification()
+        notification.event_id.sender_id = sender_id
+        notification.event_id.sequence_number = i
+        notification.scope = SCOPE.encode('ASCII')
+        notification.method = b'REQUEST' if i % every == 0 else b'REPLY'
+        notification.wire_schema = b'utf-8-string'
+        notification.data = data.encode('utf-8')
+        notification.meta_data.create_time = 0
+        notification.meta_data.send_time = 0
+        notifications.append(notification)
+    return notifications
+
+
+def run(pushdown, notifications):
+    connector = InConnector(converters=get_global_converter_map(bytes))
+    connector.scope = rsb.Scope(SCOPE)
+    strategy = ParallelEventReceivingStrategy()
+    the_filter = MethodFilter('REQUEST')
+    strategy.add_filter(the_filter)
+    if pushdown:
+        connector.filter_notify(the_filter, FilterAction.ADD)
+    connector.set_observer_action(strategy.handle)
+
+    expected = sum(1 for n in notifications if n.method == b'REQUEST')
+    received = [0]
+    done = threading.Event()
+
+    def handler(event):
+        received[0] += 1
+        if received[0] == expected:
+            done.set()
+    strategy.add_handler(handler, wait=True)
+
+    start = time.perf_counter()
+    for notification in notifications:
+        connector.handle(notification)
+    done.wait()
+    elapsed = time.perf_counter() - start
+    strategy.deactivate()
+    return elapsed, len(notifications) / elapsed, received[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--notifications', type=int, default=50000)
+    parser.add_argument('--size', type=int, default=1024,
+                        help='Size of the payloads in bytes')
+    parser.add_argument('--request-ratio', type=float, default=0.1,
+                        help='Fraction of notifications which match')
+    arguments = parser.parse_args()
+
+    notifications = make_notifications(arguments.notifications,
+                                       arguments.size,
+                                       arguments.request_ratio)
+    print('{:>9} {:>10} {:>18} {:>9}'.format(
+        'pushdown', 'time [s]', 'notifications/s', 'received'))
+    for pushdown in (False, True):
+        result = run(pushdown, notifications)
+        print('{:>9} {:>10.3f} {:>18.0f} {:>9}'.format(
+            str(pushdown), *result))
+
+
+if __name__ == '__main__':
+    main()
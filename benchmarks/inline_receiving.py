@@ -0,0 +1,97 @@
+# ============================================================
+#
+# Copyright (C) 2018 Jan Moringen
+#
+# This file may be licensed under the terms of the
+# GNU Lesser General Public License Version 3 (the ``LGPL''),
+# or (at your option) any later version.
+#
+# Software distributed under the License is distributed
+# on an ``AS IS'' basis, WITHOUT WARRANTY OF ANY KIND, either
+# express or implied. See the LGPL for the specific language
+# governing rights and limitations.
+#
+# You should have received a copy of the LGPL along with this
+# program. If not, go to http://www.gnu.org/licenses/lgpl.html
+# or write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ============================================================
+
+"""
+Measures the delivery latency of the event receiving strategies.
+
+An informer publishes events one at a time through the inprocess
+transport to a listener with the respective receiving strategy. The
+next event is published after the handler has received the previous
+one. Reported are the median, 99th percentile and maximum time between
+starting to publish an event and the start of the handler call.
+
+Usage::
+
+    python benchmarks/inline_receiving.py --events 5000
+"""
+
+import argparse
+import statistics
+import threading
+import time
+
+import rsb
+from rsb.eventprocessing import FullyParallelEventReceivingStrategy
+from rsb.eventprocessing import InlineEventReceivingStrategy
+from rsb.eventprocessing import ParallelEventReceivingStrategy
+from rsb.eventprocessing import PartitionedEventReceivingStrategy
+
+
+SCOPE = '/benchmark/latency'
+
+STRATEGIES = (
+    ('parallel', ParallelEventReceivingStrategy),
+    ('fully-parallel', FullyParallelEventReceivingStrategy),
+    ('partitioned', PartitionedEventReceivingStrategy),
+    ('inline', InlineEventReceivingStrategy),
+)
+
+
+def run(strategy, num_events):
+    config = rsb.ParticipantConfig.from_dict(
+        {'transport.inprocess.enabled': '1', 'introspection.enabled': '0'})
+    received = threading.Event()
+    latencies = []
+    start = [0.0]
+
+    def handler(event):
+        latencies.append(time.perf_counter() - start[0])
+        received.set()
+
+    with rsb.create_listener(SCOPE, config,
+                             receiving_strategy=strategy) as listener, \
+            rsb.create_informer(SCOPE, config, data_type=int) as informer:
+        listener.add_handler(handler)
+        for i in range(num_events):
+            received.clear()
+            start[0] = time.perf_counter()
+            informer.publish_data(i)
+            received.wait()
+
+    latencies.sort()
+    return (statistics.median(latencies) * 1e6,
+            latencies[int(len(latencies) * 0.99)] * 1e6,
+            latencies[-1] * 1e6)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--events', type=int, default=5000)
+    arguments = parser.parse_args()
+
+    print('{:>15} {:>12} {:>12} {:>12}'.format(
+        'strategy', 'median [us]', 'p99 [us]', 'max [us]'))
+    for name, strategy_class in STRATEGIES:
+        result = run(strategy_class(), arguments.events)
+        print('{:>15} {:>12.1f} {:>12.1f} {:>12.1f}'.format(name, *result))
+
+
+if __name__ == '__main__':
+    main()
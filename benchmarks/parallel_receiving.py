@@ -0,0 +1,94 @@
+# ============================================================
+#
+# Copyright (C) 2018 Jan Moringen
+#
+# This file may be licensed under the terms of the
+# GNU Lesser General Public License Version 3 (the ``LGPL''),
+# or (at your option) any later version.
+#
+# Software distributed under the License is distributed
+# on an ``AS IS'' basis, WITHOUT WARRANTY OF ANY KIND, either
+# express or implied. See the LGPL for the specific language
+# governing rights and limitations.
+#
+# You should have received a copy of the LGPL along with this
+# program. If not, go to http://www.gnu.org/licenses/lgpl.html
+# or write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ============================================================
+
+"""
+Measures a burst of events dispatched to a handler in parallel.
+
+A burst of events is handed to a
+:obj:`rsb.eventprocessing.FullyParallelEventReceivingStrategy` with a
+single handler which simulates a short blocking operation, as a local
+method with ``allow_parallel_execution=True`` would see for a burst of
+requests. For comparison, the same burst is dispatched by starting one
+thread per event. Reported are the time until all events have been
+processed and the peak number of threads.
+
+Usage::
+
+    python benchmarks/parallel_receiving.py --events 2000 --workers 10 50
+"""
+
+import argparse
+import threading
+import time
+
+import rsb
+from rsb.eventprocessing import FullyParallelEventReceivingStrategy
+
+
+def run(workers, num_events, work):
+    done = threading.Event()
+    lock = threading.Lock()
+    state = {'remaining': num_events, 'peak': threading.active_count()}
+
+    def handler(event):
+        time.sleep(work)
+        with lock:
+            state['peak'] = max(state['peak'], threading.active_count())
+            state['remaining'] -= 1
+            if not state['remaining']:
+                done.set()
+
+    if workers is None:
+        def handle(event):
+            threading.Thread(target=handler, args=(event,)).start()
+    else:
+        strategy = FullyParallelEventReceivingStrategy(max_workers=workers)
+        strategy.add_handler(handler, True)
+        handle = strategy.handle
+
+    events = [rsb.Event(event_id=i) for i in range(num_events)]
+    start = time.perf_counter()
+    for event in events:
+        handle(event)
+    done.wait()
+    elapsed = time.perf_counter() - start
+    if workers is not None:
+        strategy.deactivate()
+    return elapsed * 1e3, state['peak']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--events', type=int, default=2000)
+    parser.add_argument('--work', type=float, default=0.001,
+                        help='Duration of each handler call in seconds')
+    parser.add_argument('--workers', type=int, nargs='+', default=[10, 50])
+    arguments = parser.parse_args()
+
+    print('{:>18} {:>12} {:>14}'.format('mode', 'total [ms]', 'peak threads'))
+    for workers in [None] + arguments.workers:
+        elapsed, peak = run(workers, arguments.events, arguments.work)
+        mode = 'thread per event' if workers is None \
+            else 'pool of {}'.format(workers)
+        print('{:>18} {:>12.1f} {:>14}'.format(mode, elapsed, peak))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+# ============================================================
+#
+# Copyright (C) 2018 Jan Moringen
+#
+# This file may be licensed under the terms of the
+# GNU Lesser General Public License Version 3 (the ``LGPL''),
+# or (at your option) any later version.
+#
+# Software distributed under the License is distributed
+# on an ``AS IS'' basis, WITHOUT WARRANTY OF ANY KIND, either
+# express or implied. See the LGPL for the specific language
+# governing rights and limitations.
+#
+# You should have received a copy of the LGPL along with this
+# program. If not, go to http://www.gnu.org/licenses/lgpl.html
+# or write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ============================================================
+
+"""
+Measures receiving throughput over the number of distinct event keys.
+
+Events on a number of sensor scopes are handed to a receiving strategy
+with a single handler which simulates a short blocking operation. The
+:obj:`rsb.eventprocessing.ParallelEventReceivingStrategy` calls the
+handler sequentially, whereas the
+:obj:`rsb.eventprocessing.PartitionedEventReceivingStrategy` processes
+events of different scopes in parallel. Reported is the number of
+processed events per second.
+
+Usage::
+
+    python benchmarks/partitioned_receiving.py --keys 1 4 16
+"""
+
+import argparse
+import threading
+import time
+
+import rsb
+from rsb.eventprocessing import ParallelEventReceivingStrategy
+from rsb.eventprocessing import PartitionedEventReceivingStrategy
+
+
+def run(strategy, num_keys, num_events, work):
+    done = threading.Event()
+    lock = threading.Lock()
+    remaining = [num_events]
+
+    def handler(event):
+        time.sleep(work)
+        with lock:
+            remaining[0] -= 1
+            if not remaining[0]:
+                done.set()
+
+    strategy.add_handler(handler, True)
+    scopes = [rsb.Scope('/sensor/{}'.format(i)) for i in range(num_keys)]
+    events = [rsb.Event(scope=scopes[i % num_keys], data=i)
+              for i in range(num_events)]
+    start = time.perf_counter()
+    for event in events:
+        strategy.handle(event)
+    done.wait()
+    elapsed = time.perf_counter() - start
+    strategy.deactivate()
+    return num_events / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--keys', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--events', type=int, default=2000)
+    parser.add_argument('--work', type=float, default=0.001,
+                        help='Duration of each handler call in seconds')
+    parser.add_argument('--threads', type=int, default=8)
+    arguments = parser.parse_args()
+
+    print('{:>6} {:>20} {:>20}'.format(
+        'keys', 'sequential [ev/s]', 'partitioned [ev/s]'))
+    for num_keys in arguments.keys:
+        sequential = run(
+            ParallelEventReceivingStrategy(num_threads=arguments.threads),
+            num_keys, arguments.events, arguments.work)
+        partitioned = run(
+            PartitionedEventReceivingStrategy(num_lanes=64,
+                                              num_threads=arguments.threads),
+            num_keys, arguments.events, arguments.work)
+        print('{:>6} {:>20.0f} {:>20.0f}'.format(
+            num_keys, sequential, partitioned))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+# ============================================================
+#
+# Copyright (C) 2018 Jan Moringen
+#
+# This file may be licensed under the terms of the
+# GNU Lesser General Public License Version 3 (the ``LGPL''),
+# or (at your option) any later version.
+#
+# Software distributed under the License is distributed
+# on an ``AS IS'' basis, WITHOUT WARRANTY OF ANY KIND, either
+# express or implied. See the LGPL for the specific language
+# governing rights and limitations.
+#
+# You should have received a copy of the LGPL along with this
+# program. If not, go to http://www.gnu.org/licenses/lgpl.html
+# or write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ============================================================
+
+"""
+Compares CPU-bound handlers running in threads and in worker processes.
+
+Events with undecoded payloads (as produced by in connectors with the
+``lazydata`` option) are dispatched to a handler which decodes the
+payload and performs a CPU-bound computation on it, either with a
+:obj:`rsb.eventprocessing.FullyParallelEventReceivingStrategy` using
+threads or with a
+:obj:`rsb.eventprocessing.ProcessPoolEventReceivingStrategy`. Reported
+are the time until all events have been processed and, for worker
+processes, their utilization. Speedups require multiple CPUs.
+
+Usage::
+
+    python benchmarks/process_pool_receiving.py --events 200 --workers 4
+"""
+
+import argparse
+import threading
+import time
+
+import rsb
+from rsb.converter import get_global_converter_map
+from rsb.eventprocessing import FullyParallelEventReceivingStrategy
+from rsb.eventprocessing import ProcessPoolEventReceivingStrategy
+
+
+def _process(event):
+    # Simulate image processing in pure Python.
+    total = 0
+    for value in event.data:
+        total = (total * 31 + value) & 0xffffffff
+    return total
+
+
+def _events(num_events, size):
+    converter = get_global_converter_map(bytes) \
+        .get_converter_for_data_type(bytes)
+    wire_data, wire_schema = converter.serialize(bytes(range(256)) *
+                                                 (size // 256))
+    return [rsb.Event(scope=rsb.Scope('/camera'),
+                      data=rsb.LazyData.from_wire(converter, wire_data,
+                                                  wire_schema))
+            for _ in range(num_events)]
+
+
+def run_threads(workers, events):
+    done = threading.Event()
+    lock = threading.Lock()
+    remaining = [len(events)]
+
+    def handler(event):
+        _process(event)
+        with lock:
+            remaining[0] -= 1
+            if not remaining[0]:
+                done.set()
+
+    strategy = FullyParallelEventReceivingStrategy(max_workers=workers)
+    strategy.add_handler(handler, True)
+    start = time.perf_counter()
+    for event in events:
+        strategy.handle(event)
+    done.wait()
+    elapsed = time.perf_counter() - start
+    strategy.deactivate()
+    return elapsed * 1e3, None
+
+
+def run_processes(workers, events):
+    strategy = ProcessPoolEventReceivingStrategy(num_processes=workers)
+    strategy.add_handler(_process, True)
+    start = time.perf_counter()
+    for event in events:
+        strategy.handle(event)
+    # Deactivating waits for all events to be processed.
+    strategy.deactivate()
+    elapsed = time.perf_counter() - start
+    return elapsed * 1e3, strategy.worker_utilization
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--events', type=int, default=200)
+    parser.add_argument('--size', type=int, default=65536,
+                        help='Payload size in bytes')
+    parser.add_argument('--workers', type=int, default=4)
+    arguments = parser.parse_args()
+
+    print('{:>10} {:>12} {:>30}'.format(
+        'mode', 'total [ms]', 'worker utilization [%]'))
+    for mode, run in (('threads', run_threads),
+                      ('processes', run_processes)):
+        events = _events(arguments.events, arguments.size)
+        elapsed, utilization = run(arguments.workers, events)
+        print('{:>10} {:>12.1f} {:>30}'.format(
+            mode, elapsed,
+            '' if utilization is None
+            else ' '.join('{:.0f}'.format(u * 100) for u in utilization)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+# ============================================================
+#
+# Copyright (C) 2018 Jan Moringen
+#
+# This file may be licensed under the terms of the
+# GNU Lesser General Public License Version 3 (the ``LGPL''),
+# or (at your option) any later version.
+#
+# Software distributed under the License is distributed
+# on an ``AS IS'' basis, WITHOUT WARRANTY OF ANY KIND, either
+# express or implied. See the LGPL for the specific language
+# governing rights and limitations.
+#
+# You should have received a copy of the LGPL along with this
+# program. If not, go to http://www.gnu.org/licenses/lgpl.html
+# or write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ============================================================
+
+"""
+Compares publishing events one at a time and in batches.
+
+An :obj:`rsb.Informer` with a socket transport out connector acting as
+bus server publishes a batch of small samples, either by calling
+:obj:`rsb.Informer.publish_data` for each sample or by calling
+:obj:`rsb.Informer.publish_many` once. A separate client process
+receives the notifications through a raw socket connection. Reported
+are the time spent in the publishing calls and the time until the
+client has received all notifications.
+
+Usage::
+
+    python benchmarks/publish_many.py --samples 10000
+"""
+
+import argparse
+import multiprocessing
+import socket
+import time
+
+import rsb
+from rsb.eventprocessing import OutRouteConfigurator
+from rsb.transport.socket import OutConnector
+
+
+SCOPE = '/benchmark/many'
+
+
+def _receive(port, count, ready, done):
+    client = socket.create_connection(('localhost', port))
+    assert client.recv(4, socket.MSG_WAITALL) == b'\0\0\0\0'
+    ready.set()
+    # Read in large chunks so that the client keeps up with the sender.
+    buffer = b''
+    while count:
+        buffer += client.recv(1 << 20)
+        offset = 0
+        while count and len(buffer) - offset >= 4:
+            size = int.from_bytes(buffer[offset:offset + 4], 'little')
+            if len(buffer) - offset - 4 < size:
+                break
+            offset += 4 + size
+            count -= 1
+        buffer = buffer[offset:]
+    done.set()
+    client.close()
+
+
+def run(mode, num_samples, port):
+    connector = OutConnector(
+        converters=rsb.converter.get_global_converter_map(bytes),
+        options={'server': '1', 'port': str(port)})
+    informer = rsb.create_informer(
+        SCOPE, data_type=float,
+        configurator=OutRouteConfigurator(connectors=[connector]))
+
+    ready, done = multiprocessing.Event(), multiprocessing.Event()
+    client = multiprocessing.Process(
+        target=_receive, args=(port, num_samples, ready, done))
+    client.start()
+    ready.wait()
+    # Wait for the server to register the connection.
+    time.sleep(0.2)
+
+    samples = [float(i) for i in range(num_samples)]
+    start = time.perf_counter()
+    if mode == 'single':
+        for sample in samples:
+            informer.publish_data(sample)
+    else:
+        informer.publish_many(samples)
+    published = time.perf_counter() - start
+    done.wait()
+    received = time.perf_counter() - start
+
+    client.join()
+    informer.deactivate()
+    return published * 1e3, received * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--samples', type=int, nargs='+',
+                        default=[100, 1000, 10000])
+    parser.add_argument('--port', type=int, default=55888)
+    arguments = parser.parse_args()
+
+    print('{:>8} {:>8} {:>15} {:>15}'.format(
+        'mode', 'samples', 'publish [ms]', 'received [ms]'))
+    port = arguments.port
+    for num_samples in arguments.samples:
+        for mode in ('single', 'many'):
+            published, received = run(mode, num_samples, port)
+            port += 1
+            print('{:>8} {:>8} {:>15.1f} {:>15.1f}'.format(
+                mode, num_samples, published, received))
+
+
+if __name__ == '__main__':
+    main()
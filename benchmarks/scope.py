@@ -0,0 +1,79 @@
+# ============================================================
+#
+# Copyright (C) 2018 Jan Moringen
+#
+# This file may be licensed under the terms of the
+# GNU Lesser General Public License Version 3 (the ``LGPL''),
+# or (at your option) any later version.
+#
+# Software distributed under the License is distributed
+# on an ``AS IS'' basis, WITHOUT WARRANTY OF ANY KIND, either
+# express or implied. See the LGPL for the specific language
+# governing rights and limitations.
+#
+# You should have received a copy of the LGPL along with this
+# program. If not, go to http://www.gnu.org/licenses/lgpl.html
+# or write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ============================================================
+
+"""
+Microbenchmarks for :obj:`rsb.Scope`.
+
+Measures parsing (of interned and of previously unseen scope strings),
+hashing, :obj:`rsb.Scope.is_sub_scope_of` and
+:obj:`rsb.Scope.super_scopes`.
+
+Usage::
+
+    python benchmarks/scope.py --depth 2 5 10
+"""
+
+import argparse
+import itertools
+import timeit
+
+import rsb
+
+
+def _measure(statement, number):
+    timer = timeit.Timer(statement)
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e9
+
+
+def run(depth, number):
+    string = ''.join('/component{}'.format(i) for i in range(depth)) + '/'
+    scope = rsb.Scope(string)
+    super_scope = scope.super_scopes()[-1] if depth else scope
+    counter = itertools.count()
+
+    def parse_new():
+        rsb.Scope('{}fresh{}/'.format(string, next(counter)))
+
+    return [
+        ('parse (interned)', _measure(lambda: rsb.Scope(string), number)),
+        ('parse (bytes)',
+         _measure(lambda: rsb.Scope(scope.to_bytes()), number)),
+        ('parse (new)', _measure(parse_new, number)),
+        ('hash', _measure(lambda: hash(scope), number)),
+        ('is_sub_scope_of',
+         _measure(lambda: scope.is_sub_scope_of(super_scope), number)),
+        ('super_scopes', _measure(scope.super_scopes, number)),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--depth', type=int, nargs='+', default=[2, 5, 10])
+    parser.add_argument('--number', type=int, default=20000)
+    arguments = parser.parse_args()
+
+    print('{:>6} {:>18} {:>10}'.format('depth', 'operation', 'ns/op'))
+    for depth in arguments.depth:
+        for name, duration in run(depth, arguments.number):
+            print('{:>6} {:>18} {:>10.0f}'.format(depth, name, duration))
+
+
+if __name__ == '__main__':
+    main()
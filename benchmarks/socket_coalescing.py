@@ -0,0 +1,111 @@
+# ============================================================
+#
+# Copyright (C) 2018 Jan Moringen
+#
+# This file may be licensed under the terms of the
+# GNU Lesser General Public License Version 3 (the ``LGPL''),
+# or (at your option) any later version.
+#
+# Software distributed under the License is distributed
+# on an ``AS IS'' basis, WITHOUT WARRANTY OF ANY KIND, either
+# express or implied. See the LGPL for the specific language
+# governing rights and limitations.
+#
+# You should have received a copy of the LGPL along with this
+# program. If not, go to http://www.gnu.org/licenses/lgpl.html
+# or write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ============================================================
+
+"""
+Measures the effect of write coalescing on small-event throughput.
+
+A :obj:`BusConnection` sends a stream of small serialized notifications
+over a local TCP connection while a reader thread consumes the raw
+frames. Each configuration is measured once without coalescing (one
+gather-write per notification) and once per requested coalescing
+window.
+
+Usage::
+
+    python benchmarks/socket_coalescing.py --windows 100 1000 --size 64
+"""
+
+import argparse
+import socket
+import threading
+import time
+
+from rsb.transport.socket import BusConnection
+
+
+def _read_frames(client_socket, count, done):
+    buffer = bytearray(1 << 20)
+    view = memoryview(buffer)
+    pending = 0
+    received = 0
+    while received < count:
+        pending += client_socket.recv_into(view[pending:])
+        offset = 0
+        while pending - offset >= 4:
+            size = int.from_bytes(buffer[offset:offset + 4], 'little')
+            if pending - offset < 4 + size:
+                break
+            offset += 4 + size
+            received += 1
+        buffer[:pending - offset] = buffer[offset:pending]
+        pending -= offset
+    done.set()
+
+
+def run(num_events, size, window):
+    listener = socket.socket()
+    listener.bind(('localhost', 0))
+    listener.listen(1)
+    client_socket = socket.create_connection(listener.getsockname())
+    server_socket, _ = listener.accept()
+    listener.close()
+
+    connection = BusConnection(socket_=server_socket, is_server=True,
+                               coalesce_window=window * 1e-6)
+    assert client_socket.recv(4, socket.MSG_WAITALL) == b'\0\0\0\0'
+    connection.activate()
+
+    done = threading.Event()
+    reader = threading.Thread(target=_read_frames,
+                              args=(client_socket, num_events, done))
+    reader.start()
+
+    payload = b'x' * size
+    start = time.time()
+    for _ in range(num_events):
+        connection.send_notification(payload)
+    done.wait()
+    duration = time.time() - start
+
+    reader.join()
+    connection.shutdown()
+    client_socket.close()
+    connection.wait_for_deactivation()
+    return num_events / duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--events', type=int, default=200000)
+    parser.add_argument('--size', type=int, nargs='+', default=[16, 64, 512])
+    parser.add_argument('--windows', type=int, nargs='+',
+                        default=[100, 1000],
+                        help='coalescing windows in microseconds')
+    arguments = parser.parse_args()
+
+    print('{:>8} {:>12} {:>12}'.format('size', 'window [us]', 'events/s'))
+    for size in arguments.size:
+        for window in [0] + arguments.windows:
+            throughput = run(arguments.events, size, window)
+            print('{:>8} {:>12} {:>12.0f}'.format(size, window, throughput))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+# ============================================================
+#
+# Copyright (C) 2018 Jan Moringen
+#
+# This file may be licensed under the terms of the
+# GNU Lesser General Public License Version 3 (the ``LGPL''),
+# or (at your option) any later version.
+#
+# Software distributed under the License is distributed
+# on an ``AS IS'' basis, WITHOUT WARRANTY OF ANY KIND, either
+# express or implied. See the LGPL for the specific language
+# governing rights and limitations.
+#
+# You should have received a copy of the LGPL along with this
+# program. If not, go to http://www.gnu.org/licenses/lgpl.html
+# or write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ============================================================
+
+"""
+Compares the I/O models of the socket transport's bus server.
+
+A bus server is started in the current process with either the
+``threads`` or the ``selector`` I/O model. A separate client process
+opens the requested number of raw client connections and sends small
+notifications over all of them in a round-robin fashion. The server
+process measures throughput and send-to-dispatch latency. Note that the
+bus server relays each notification to all other clients, so the cost
+per event grows with the number of clients for both I/O models.
+
+Usage::
+
+    python benchmarks/socket_server_io.py --clients 10 100 500
+"""
+
+import argparse
+import multiprocessing
+import selectors
+import socket
+import statistics
+import threading
+import time
+import uuid
+
+import rsb
+from rsb.converter import get_global_converter_map
+from rsb.protocol.Notification_pb2 import Notification
+from rsb.transport.socket import InConnector
+from rsb.util import time_to_unix_microseconds
+
+
+SCOPE = '/benchmark/io'
+
+
+def _frame(sequence_number, sender_id):
+    notification = Notification()
+    notification.event_id.sender_id = sender_id
+    notification.event_id.sequence_number = sequence_number
+    notification.scope = SCOPE.encode('ASCII') + b'/'
+    notification.wire_schema = b'bytes'
+    notification.data = b'x' * 64
+    notification.meta_data.create_time = time_to_unix_microseconds(
+        time.time())
+    notification.meta_data.send_time = notification.meta_data.create_time
+    serialized = notification.SerializeToString()
+    return len(serialized).to_bytes(4, 'little') + serialized
+
+
+def _drain(sockets):
+    # The bus server relays every notification to all other clients.
+    # Discard the relayed data until the server closes the connections.
+    selector = selectors.DefaultSelector()
+    for client in sockets:
+        selector.register(client, selectors.EVENT_READ)
+    remaining = len(sockets)
+    while remaining:
+        for (key, _) in selector.select():
+            if not key.fileobj.recv(65536):
+                selector.unregister(key.fileobj)
+                key.fileobj.close()
+                remaining -= 1
+
+
+def _run_clients(port, num_clients, num_events, ready):
+    sockets = []
+    for _ in range(num_clients):
+        client = socket.create_connection(('localhost', port))
+        client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        handshake = client.recv(4, socket.MSG_WAITALL)
+        assert handshake == b'\0\0\0\0'
+        sockets.append(client)
+    drainer = threading.Thread(target=_drain, args=(sockets,))
+    drainer.start()
+    ready.set()
+
+    sender_id = uuid.uuid4().bytes
+    for i in range(num_events):
+        sockets[i % num_clients].sendall(_frame(i, sender_id))
+
+    drainer.join()
+
+
+class _Recorder:
+
+    def __init__(self, expected):
+        self.expected = expected
+        self.latencies = []
+        self.done = threading.Event()
+
+    def __call__(self, event):
+        self.latencies.append(time.time() - event.meta_data.send_time)
+        if len(self.latencies) == self.expected:
+            self.done.set()
+
+
+def run(io, num_clients, num_events, port):
+    recorder = _Recorder(num_events)
+
+    connector = InConnector(converters=get_global_converter_map(bytes),
+                            options={'server': '1',
+                                     'port': str(port),
+                                     'io': io})
+    connector.scope = rsb.Scope(SCOPE)
+    connector.set_observer_action(recorder)
+    connector.activate()
+
+    ready = multiprocessing.Event()
+    clients = multiprocessing.Process(
+        target=_run_clients, args=(port, num_clients, num_events, ready))
+    clients.start()
+    ready.wait()
+
+    start = time.time()
+    recorder.done.wait()
+    duration = time.time() - start
+
+    connector.deactivate()
+    clients.join()
+
+    latencies = sorted(recorder.latencies)
+    return (num_events / duration,
+            statistics.median(latencies) * 1e6,
+            latencies[int(len(latencies) * 0.99)] * 1e6)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--clients', type=int, nargs='+',
+                        default=[10, 100, 500])
+    parser.add_argument('--events', type=int, default=5000)
+    parser.add_argument('--port', type=int, default=55777)
+    arguments = parser.parse_args()
+
+    print('{:>8} {:>8} {:>12} {:>12} {:>12}'.format(
+        'io', 'clients', 'events/s', 'median [us]', 'p99 [us]'))
+    port = arguments.port
+    for num_clients in arguments.clients:
+        for io in ('threads', 'selector'):
+            throughput, median, p99 = run(io, num_clients, arguments.events,
+                                          port)
+            port += 1
+            print('{:>8} {:>8} {:>12.0f} {:>12.0f} {:>12.0f}'.format(
+                io, num_clients, throughput, median, p99))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+# ============================================================
+#
+# Copyright (C) 2018 Jan Moringen
+#
+# This file may be licensed under the terms of the
+# GNU Lesser General Public License Version 3 (the ``LGPL''),
+# or (at your option) any later version.
+#
+# Software distributed under the License is distributed
+# on an ``AS IS'' basis, WITHOUT WARRANTY OF ANY KIND, either
+# express or implied. See the LGPL for the specific language
+# governing rights and limitations.
+#
+# You should have received a copy of the LGPL along with this
+# program. If not, go to http://www.gnu.org/licenses/lgpl.html
+# or write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ============================================================
+
+"""
+Compares AF_UNIX sockets with loopback TCP for the socket transport.
+
+A bus server with an in-direction connector and a bus client with an
+out-direction connector are created in the current process, either
+connected through a TCP port on ``localhost`` or through an ``AF_UNIX``
+socket. The informer sends events of the requested sizes and the
+listener measures throughput and send-to-dispatch latency.
+
+Usage::
+
+    python benchmarks/socket_unix.py --size 64 4096 --events 20000
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+
+import rsb
+from rsb.converter import get_global_converter_map
+from rsb.transport.socket import InConnector, OutConnector
+
+
+SCOPE = rsb.Scope('/benchmark/unix')
+
+
+class _Recorder:
+
+    def __init__(self, expected):
+        self.expected = expected
+        self.latencies = []
+        self.done = threading.Event()
+
+    def __call__(self, event):
+        self.latencies.append(time.time() - event.meta_data.send_time)
+        if len(self.latencies) == self.expected:
+            self.done.set()
+
+
+def _connector(clazz, options):
+    connector = clazz(converters=get_global_converter_map(bytes),
+                      options=options)
+    connector.scope = SCOPE
+    connector.activate()
+    return connector
+
+
+def run(options, num_events, size):
+    recorder = _Recorder(num_events)
+    listener = _connector(InConnector, dict(options, server='1'))
+    listener.set_observer_action(recorder)
+    informer = _connector(OutConnector, dict(options, server='0'))
+
+    sender_id = uuid.uuid4()
+    payload = b'x' * size
+    start = time.time()
+    for i in range(num_events):
+        informer.handle(rsb.Event(rsb.EventId(sender_id, i), scope=SCOPE,
+                                  data=payload, data_type=bytes))
+    recorder.done.wait()
+    duration = time.time() - start
+
+    informer.deactivate()
+    listener.deactivate()
+
+    latencies = sorted(recorder.latencies)
+    return (num_events / duration,
+            statistics.median(latencies) * 1e6,
+            latencies[int(len(latencies) * 0.99)] * 1e6)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--events', type=int, default=20000)
+    parser.add_argument('--size', type=int, nargs='+',
+                        default=[64, 4096, 65536])
+    parser.add_argument('--port', type=int, default=55888)
+    arguments = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    variants = [('tcp', {'host': 'localhost', 'port': str(arguments.port)}),
+                ('unix', {'path': os.path.join(directory, 'bus')})]
+
+    print('{:>8} {:>8} {:>12} {:>12} {:>12}'.format(
+        'socket', 'size', 'events/s', 'median [us]', 'p99 [us]'))
+    try:
+        for size in arguments.size:
+            for (name, options) in variants:
+                throughput, median, p99 = run(options, arguments.events,
+                                              size)
+                print('{:>8} {:>8} {:>12.0f} {:>12.0f} {:>12.0f}'.format(
+                    name, size, throughput, median, p99))
+    finally:
+        os.rmdir(directory)
+
+
+if __name__ == '__main__':
+    main()
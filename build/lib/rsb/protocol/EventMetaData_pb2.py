@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: rsb/protocol/EventMetaData.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n rsb/protocol/EventMetaData.proto\x12\x0crsb.protocol\"*\n\x08UserTime\x12\x0b\n\x03key\x18\x01 \x02(\x0c\x12\x11\n\ttimestamp\x18\x02 \x02(\x04\"&\n\x08UserInfo\x12\x0b\n\x03key\x18\x01 \x02(\x0c\x12\r\n\x05value\x18\x02 \x02(\x0c\"\xbb\x01\n\rEventMetaData\x12\x13\n\x0b\x63reate_time\x18\x02 \x02(\x03\x12\x11\n\tsend_time\x18\x03 \x02(\x03\x12\x14\n\x0creceive_time\x18\x04 \x01(\x03\x12\x14\n\x0c\x64\x65liver_time\x18\x05 \x01(\x03\x12*\n\nuser_times\x18\x06 \x03(\x0b\x32\x16.rsb.protocol.UserTime\x12*\n\nuser_infos\x18\x07 \x03(\x0b\x32\x16.rsb.protocol.UserInfoB\x13\x42\x11\x45ventMetaDataType')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'rsb.protocol.EventMetaData_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  DESCRIPTOR._serialized_options = b'B\021EventMetaDataType'
+  _USERTIME._serialized_start=50
+  _USERTIME._serialized_end=92
+  _USERINFO._serialized_start=94
+  _USERINFO._serialized_end=132
+  _EVENTMETADATA._serialized_start=135
+  _EVENTMETADATA._serialized_end=322
+# @@protoc_insertion_point(module_scope)
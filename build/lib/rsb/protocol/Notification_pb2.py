@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: rsb/protocol/Notification.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+from rsb.protocol import EventId_pb2 as rsb_dot_protocol_dot_EventId__pb2
+from rsb.protocol import EventMetaData_pb2 as rsb_dot_protocol_dot_EventMetaData__pb2
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1frsb/protocol/Notification.proto\x12\x0crsb.protocol\x1a\x1arsb/protocol/EventId.proto\x1a rsb/protocol/EventMetaData.proto\"\xd2\x01\n\x0cNotification\x12\'\n\x08\x65vent_id\x18l \x02(\x0b\x32\x15.rsb.protocol.EventId\x12\r\n\x05scope\x18\x06 \x01(\x0c\x12\x10\n\x06method\x18\x0e \x01(\x0c:\x00\x12\x13\n\x0bwire_schema\x18\x07 \x01(\x0c\x12\x0c\n\x04\x64\x61ta\x18\t \x01(\x0c\x12%\n\x06\x63\x61uses\x18\r \x03(\x0b\x32\x15.rsb.protocol.EventId\x12.\n\tmeta_data\x18\x0f \x01(\x0b\x32\x1b.rsb.protocol.EventMetaDataB\x12\x42\x10NotificationType')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'rsb.protocol.Notification_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  DESCRIPTOR._serialized_options = b'B\020NotificationType'
+  _NOTIFICATION._serialized_start=112
+  _NOTIFICATION._serialized_end=322
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: rsb/protocol/introspection/Bye.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n$rsb/protocol/introspection/Bye.proto\x12\x1arsb.protocol.introspection\"\x11\n\x03\x42ye\x12\n\n\x02id\x18\x01 \x02(\x0c\x42\tB\x07\x42yeType')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'rsb.protocol.introspection.Bye_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  DESCRIPTOR._serialized_options = b'B\007ByeType'
+  _BYE._serialized_start=68
+  _BYE._serialized_end=85
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: rsb/protocol/introspection/Hello.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+from rsb.protocol.operatingsystem import Process_pb2 as rsb_dot_protocol_dot_operatingsystem_dot_Process__pb2
+from rsb.protocol.operatingsystem import Host_pb2 as rsb_dot_protocol_dot_operatingsystem_dot_Host__pb2
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n&rsb/protocol/introspection/Hello.proto\x12\x1arsb.protocol.introspection\x1a*rsb/protocol/operatingsystem/Process.proto\x1a\'rsb/protocol/operatingsystem/Host.proto\"\xcb\x01\n\x05Hello\x12\x0c\n\x04kind\x18\x01 \x02(\t\x12\n\n\x02id\x18\x02 \x02(\x0c\x12\x0e\n\x06parent\x18\x03 \x01(\x0c\x12\r\n\x05scope\x18\x04 \x02(\t\x12\x0c\n\x04type\x18\x05 \x01(\t\x12\x11\n\ttransport\x18\x06 \x03(\t\x12\x36\n\x07process\x18\x07 \x02(\x0b\x32%.rsb.protocol.operatingsystem.Process\x12\x30\n\x04host\x18\x08 \x02(\x0b\x32\".rsb.protocol.operatingsystem.HostB\x0b\x42\tHelloType')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'rsb.protocol.introspection.Hello_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  DESCRIPTOR._serialized_options = b'B\tHelloType'
+  _HELLO._serialized_start=156
+  _HELLO._serialized_end=359
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,13 @@
+"""
+Provides runtime information about the version of RSB being currently used.
+
+.. codeauthor:: jwienke
+"""
+
+__version__ = '1.0.0-dev'
+__commit__ = 'gffc604b'
+
+
+def get_version():
+    """Return a descriptive string for the version of RSB."""
+    return "{}-{}".format(__version__, __commit__)
@@ -37,7 +37,7 @@ In order to create basic objects have a look at the functions
 import configparser
 import copy
 from enum import Enum
-from functools import reduce
+from functools import partial, reduce
 import importlib
 import logging
 import os
@@ -339,6 +339,10 @@ class ParticipantConfig:
     * Whether introspection should be enabled for the participant
       (enabled by default)
 
+    * Capacity and overflow policy of the per-handler event queues of
+      listeners (options ``receiving.queuesize`` and ``receiving.overflow``,
+      unbounded by default)
+
     .. codeauthor:: jmoringe
     """
 
@@ -432,7 +436,9 @@ class ParticipantConfig:
                  transports=None,
                  options=None,
                  qos=None,
-                 introspection=False):
+                 introspection=False,
+                 receive_queue_size=None,
+                 receive_overflow='block'):
         if transports is None:
             self._transports = {}
         else:
@@ -450,6 +456,9 @@ class ParticipantConfig:
 
         self._introspection = introspection
 
+        self._receive_queue_size = receive_queue_size
+        self._receive_overflow = receive_overflow
+
     @property
     def enabled_transports(self):
         return [t for t in list(self._transports.values()) if t.enabled]
@@ -477,6 +486,22 @@ class ParticipantConfig:
     def introspection(self, new_value):
         self._introspection = new_value
 
+    @property
+    def receive_queue_size(self):
+        return self._receive_queue_size
+
+    @receive_queue_size.setter
+    def receive_queue_size(self, new_value):
+        self._receive_queue_size = new_value
+
+    @property
+    def receive_overflow(self):
+        return self._receive_overflow
+
+    @receive_overflow.setter
+    def receive_overflow(self, new_value):
+        self._receive_overflow = new_value
+
     def __deepcopy__(self, memo):
         result = copy.copy(self)
         result._transports = copy.deepcopy(self._transports, memo)
@@ -514,7 +539,7 @@ class ParticipantConfig:
                 QualityOfServiceSpec().ordering.name)]
 
         # Transport options
-        for transport in ['spread', 'socket', 'inprocess']:
+        for transport in ['spread', 'socket', 'shm', 'inprocess']:
             transport_options = dict(
                 section_options('transport.{}'.format(transport)))
             if transport_options:
@@ -526,6 +551,12 @@ class ParticipantConfig:
         result._introspection = _config_value_is_true(
             introspection_options.get('enabled', '1'))
 
+        # Receiving options
+        receiving_options = dict(section_options('receiving'))
+        if 'queuesize' in receiving_options:
+            result._receive_queue_size = int(receiving_options['queuesize'])
+        result._receive_overflow = receiving_options.get('overflow', 'block')
+
         return result
 
     @classmethod
@@ -684,12 +715,24 @@ class Scope:
 
     It is defined by a surface syntax like ``"/a/deep/scope"``.
 
+    Scopes are immutable. Their string and bytes representations, their
+    components and their hash are computed once. Recently parsed scopes
+    are interned such that parsing the same string (or bytes) again
+    returns the existing object.
+
     .. codeauthor:: jwienke
     """
 
+    __slots__ = ('_components', '_string', '_bytes', '_hash')
+
     _COMPONENT_SEPARATOR = "/"
+    _SCOPE_REGEX = re.compile("^/(?:[-_a-zA-Z0-9]+/)*$")
     _COMPONENT_REGEX = re.compile("^[-_a-zA-Z0-9]+$")
 
+    _INTERN_LIMIT = 4096
+    _interned = {}
+    _interned_lock = threading.Lock()
+
     @classmethod
     def ensure_scope(cls, thing):
         if isinstance(thing, cls):
@@ -697,68 +740,144 @@ class Scope:
         else:
             return Scope(thing)
 
-    def __init__(self, string_rep):
+    def __new__(cls, string_rep):
         """
         Parse a scope from a string representation.
 
         Args:
-            string_rep (str or unicode):
+            string_rep (str or bytes-like):
                 string representation of the scope
         Raises:
             ValueError:
                 if ``string_rep`` does not have the right syntax
+            TypeError:
+                if ``string_rep`` is neither a string nor bytes-like
         """
+        # Mutable bytes-like objects cannot be used as keys of the
+        # interned scopes.
+        if not isinstance(string_rep, (str, bytes)):
+            try:
+                string_rep = memoryview(string_rep).tobytes()
+            except TypeError as e:
+                raise TypeError('Scopes can only be parsed from strings or '
+                                'bytes-like objects, not {}'.format(
+                                    type(string_rep).__name__)) from e
+
+        scope = cls._interned.get(string_rep)
+        if scope is not None:
+            return scope
 
         if len(string_rep) == 0:
             raise ValueError("The empty string does not designate a "
                              "scope; Use '/' to designate the root scope.")
 
-        if isinstance(string_rep, str):
-            try:
-                string_rep = string_rep.encode('ASCII').decode('ASCII')
-            except UnicodeEncodeError as e:
-                raise ValueError('Scope strings have be encodable as '
-                                 'ASCII-strings, but the supplied scope '
-                                 'string cannot be encoded '
-                                 'as ASCII-string: {}'.format(e)) from e
+        key = string_rep
+        try:
+            if isinstance(string_rep, str):
+                string_rep.encode('ASCII')
+            else:
+                string_rep = string_rep.decode('ASCII')
+        except UnicodeError as e:
+            raise ValueError('Scope strings have be encodable as '
+                             'ASCII-strings, but the supplied scope '
+                             'string cannot be encoded '
+                             'as ASCII-string: {}'.format(e)) from e
 
         # append missing trailing slash
-        if string_rep[-1] != self._COMPONENT_SEPARATOR:
-            string_rep += self._COMPONENT_SEPARATOR
+        if string_rep[-1] != cls._COMPONENT_SEPARATOR:
+            string_rep += cls._COMPONENT_SEPARATOR
+
+        if not cls._SCOPE_REGEX.match(string_rep):
+            cls._raise_syntax_error(string_rep)
+
+        return cls._intern(key, string_rep)
 
-        raw_components = string_rep.split(self._COMPONENT_SEPARATOR)
-        if len(raw_components) < 1:
-            raise ValueError("Empty scope is not allowed.")
+    @classmethod
+    def _raise_syntax_error(cls, string_rep):
+        # Produce the specific error message for an invalid scope string.
+        raw_components = string_rep.split(cls._COMPONENT_SEPARATOR)
         if len(raw_components[0]) != 0:
             raise ValueError("Scope must start with a slash. "
                              "Given was '{}'.".format(string_rep))
-        if len(raw_components[-1]) != 0:
-            raise ValueError("Scope must end with a slash. "
-                             "Given was '{}'.".format(string_rep))
-
-        self._components = raw_components[1:-1]
-
-        for com in self._components:
-            if not self._COMPONENT_REGEX.match(com):
+        for com in raw_components[1:-1]:
+            if not cls._COMPONENT_REGEX.match(com):
                 raise ValueError("Invalid character in component {}. "
                                  "Given was scope '{}'.".format(
                                      com, string_rep))
+        raise ValueError("Invalid scope '{}'.".format(string_rep))
+
+    @classmethod
+    def _make(cls, string, components=None):
+        # Create a new instance for the valid, normalized STRING.
+        scope = object.__new__(cls)
+        if components is None:
+            components = tuple(string.split(cls._COMPONENT_SEPARATOR)[1:-1])
+        object.__setattr__(scope, '_components', components)
+        object.__setattr__(scope, '_string', string)
+        object.__setattr__(scope, '_bytes', string.encode('ASCII'))
+        object.__setattr__(scope, '_hash', hash(string))
+        return scope
+
+    @classmethod
+    def _intern(cls, key, string, components=None):
+        # Return the interned instance for the valid, normalized STRING
+        # and make it available under KEY, the unparsed representation.
+        interned = cls._interned
+        with cls._interned_lock:
+            scope = interned.get(string)
+            if scope is None:
+                scope = cls._make(string, components)
+                keys = (string,)
+            else:
+                keys = ()
+            if key != string:
+                keys += (key,)
+            for key in keys:
+                if len(interned) >= cls._INTERN_LIMIT:
+                    del interned[next(iter(interned))]
+                interned[key] = scope
+        return scope
+
+    @classmethod
+    def _from_components(cls, components):
+        string = (cls._COMPONENT_SEPARATOR +
+                  ''.join(com + cls._COMPONENT_SEPARATOR
+                          for com in components))
+        scope = cls._interned.get(string)
+        if scope is not None:
+            return scope
+        return cls._intern(string, string, tuple(components))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Scope objects are immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('Scope objects are immutable')
+
+    def __reduce__(self):
+        return (Scope, (self._string,))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
     @property
     def components(self):
         """
-        Return all components of the scope as an ordered list.
+        Return all components of the scope as an ordered tuple.
 
         Components are the names between the separator character '/'. The first
-        entry in the list is the highest level of hierarchy. The scope '/'
-        returns an empty list.
+        entry in the tuple is the highest level of hierarchy. The scope '/'
+        returns an empty tuple.
 
         Returns:
-            list:
-                components of the represented scope as ordered list with
+            tuple:
+                components of the represented scope as ordered tuple with
                 highest level as first entry
         """
-        return copy.copy(self._components)
+        return self._components
 
     def to_string(self):
         """
@@ -768,12 +887,7 @@ class Scope:
             str:
                 string representation of the scope
         """
-
-        string = self._COMPONENT_SEPARATOR
-        for com in self._components:
-            string += com
-            string += self._COMPONENT_SEPARATOR
-        return string
+        return self._string
 
     def to_bytes(self):
         """
@@ -783,7 +897,7 @@ class Scope:
             bytes:
                 encoded string representation
         """
-        return self.to_string().encode('ASCII')
+        return self._bytes
 
     def concat(self, child_scope):
         """
@@ -802,10 +916,8 @@ class Scope:
             Scope:
                 new scope instance representing the created sub-scope
         """
-        new_scope = Scope("/")
-        new_scope._components = copy.copy(self._components)
-        new_scope._components += child_scope._components
-        return new_scope
+        return Scope._from_components(self._components +
+                                      child_scope._components)
 
     def is_sub_scope_of(self, other):
         """
@@ -824,11 +936,8 @@ class Scope:
                 gives ``False``, too
         """
 
-        if len(self._components) <= len(other._components):
-            return False
-
-        return other._components == \
-            self._components[:len(other._components)]
+        return (len(self._string) > len(other._string) and
+                self._string.startswith(other._string))
 
     def is_super_scope_of(self, other):
         """
@@ -847,10 +956,8 @@ class Scope:
 
         """
 
-        if len(self._components) >= len(other._components):
-            return False
-
-        return self._components == other._components[:len(self._components)]
+        return (len(self._string) < len(other._string) and
+                other._string.startswith(self._string))
 
     def super_scopes(self, include_self=False):
         """
@@ -869,57 +976,71 @@ class Scope:
                 list of all super scopes ordered by hierarchy, "/" being first
         """
 
+        count = len(self._components)
+        if include_self:
+            count += 1
+        # The string of each super scope is a prefix of this scope's
+        # string ending at a separator.
+        string = self._string
+        interned = Scope._interned
         supers = []
-
-        max_index = len(self._components)
-        if not include_self:
-            max_index -= 1
-        for i in range(max_index + 1):
-            super_scope = Scope("/")
-            super_scope._components = self._components[:i]
-            supers.append(super_scope)
-
+        end = 1
+        for i in range(count):
+            prefix = string[:end]
+            scope = interned.get(prefix)
+            if scope is None:
+                scope = Scope._intern(prefix, prefix, self._components[:i])
+            supers.append(scope)
+            end = string.find(self._COMPONENT_SEPARATOR, end) + 1
         return supers
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, self.__class__):
             return False
-        return self._components == other._components
+        return self._string == other._string
 
     def __ne__(self, other):
         return not self.__eq__(other)
 
     def __hash__(self):
-        return hash(self.to_string())
+        return self._hash
 
     def __lt__(self, other):
-        return self.to_string() < other.to_string()
+        return self._string < other._string
 
     def __le__(self, other):
-        return self.to_string() <= other.to_string()
+        return self._string <= other._string
 
     def __gt__(self, other):
-        return self.to_string() > other.to_string()
+        return self._string > other._string
 
     def __ge__(self, other):
-        return self.to_string() >= other.to_string()
+        return self._string >= other._string
 
     def __str__(self):
-        return "Scope[{}]".format(self.to_string())
+        return "Scope[{}]".format(self._string)
 
     def __repr__(self):
         return '{type_name}({str_repr!r})'.format(
             type_name=self.__class__.__name__,
-            str_repr=self.to_string())
+            str_repr=self._string)
 
 
 class MetaData:
     """
     Stores RSB-specific and user-supplied meta-data items for an event.
 
+    The dictionaries of user-supplied timestamps and meta-data items are
+    only created when they are first used.
+
     .. codeauthor:: jmoringe
     """
 
+    __slots__ = ('_create_time', '_send_time', '_receive_time',
+                 '_deliver_time', '_user_times', '_user_infos')
+
     def __init__(self,
                  create_time=None, send_time=None,
                  receive_time=None, deliver_time=None,
@@ -953,14 +1074,8 @@ class MetaData:
         self._send_time = send_time
         self._receive_time = receive_time
         self._deliver_time = deliver_time
-        if user_times is None:
-            self._user_times = {}
-        else:
-            self._user_times = user_times
-        if user_infos is None:
-            self._user_infos = {}
-        else:
-            self._user_infos = user_infos
+        self._user_times = user_times
+        self._user_infos = user_infos
 
     @property
     def create_time(self):
@@ -1020,6 +1135,8 @@ class MetaData:
 
     @property
     def user_times(self):
+        if self._user_times is None:
+            self._user_times = {}
         return self._user_times
 
     @user_times.setter
@@ -1028,12 +1145,14 @@ class MetaData:
 
     def set_user_time(self, key, timestamp=None):
         if timestamp is None:
-            self._user_times[key] = time.time()
+            self.user_times[key] = time.time()
         else:
-            self._user_times[key] = timestamp
+            self.user_times[key] = timestamp
 
     @property
     def user_infos(self):
+        if self._user_infos is None:
+            self._user_infos = {}
         return self._user_infos
 
     @user_infos.setter
@@ -1041,15 +1160,26 @@ class MetaData:
         self._user_infos = user_infos
 
     def set_user_info(self, key, value):
-        self._user_infos[key] = value
+        self.user_infos[key] = value
+
+    def __copy__(self):
+        # The copy does not share the user dictionaries.
+        return MetaData(create_time=self._create_time,
+                        send_time=self._send_time,
+                        receive_time=self._receive_time,
+                        deliver_time=self._deliver_time,
+                        user_times=(dict(self._user_times)
+                                    if self._user_times else None),
+                        user_infos=(dict(self._user_infos)
+                                    if self._user_infos else None))
 
     def __eq__(self, other):
         return (self._create_time == other._create_time) and \
             (self._send_time == other._send_time) and \
             (self._receive_time == other._receive_time) and \
             (self._deliver_time == other._deliver_time) and \
-            (self._user_infos == other._user_infos) and \
-            (self._user_times == other._user_times)
+            ((self._user_infos or {}) == (other._user_infos or {})) and \
+            ((self._user_times or {}) == (other._user_times or {}))
 
     def __neq__(self, other):
         return not self.__eq__(other)
@@ -1064,8 +1194,8 @@ class MetaData:
                     send_time=self._send_time,
                     receive_time=self._receive_time,
                     deliver_time=self._deliver_time,
-                    user_times=self._user_times,
-                    user_infos=self._user_infos))
+                    user_times=self._user_times or {},
+                    user_infos=self._user_infos or {}))
 
     def __repr__(self):
         return self.__str__()
@@ -1081,10 +1211,13 @@ class EventId:
     .. codeauthor:: jwienke
     """
 
+    __slots__ = ('_participant_id', '_sequence_number', '_id', '_hash')
+
     def __init__(self, participant_id, sequence_number):
         self._participant_id = participant_id
         self._sequence_number = sequence_number
         self._id = None
+        self._hash = None
 
     @property
     def participant_id(self):
@@ -1107,6 +1240,8 @@ class EventId:
                 sender id to set.
         """
         self._participant_id = participant_id
+        self._id = None
+        self._hash = None
 
     @property
     def sequence_number(self):
@@ -1128,6 +1263,8 @@ class EventId:
                 new sequence number of the id.
         """
         self._sequence_number = sequence_number
+        self._id = None
+        self._hash = None
 
     def get_as_uuid(self):
         """
@@ -1155,13 +1292,113 @@ class EventId:
                                             self._sequence_number)
 
     def __hash__(self):
-        prime = 31
-        result = 1
-        result = prime * result + hash(self._participant_id)
-        result = prime * result + \
-            (self._sequence_number ^ (self._sequence_number >> 32))
+        if self._hash is None:
+            prime = 31
+            result = 1
+            result = prime * result + hash(self._participant_id)
+            result = prime * result + \
+                (self._sequence_number ^ (self._sequence_number >> 32))
+            self._hash = result
+        return self._hash
+
+
+class LazyData:
+    """
+    Placeholder for event payloads which are decoded on first access.
+
+    When the data of an :obj:`Event` is an instance of this class,
+    :obj:`Event.data` transparently returns the decoded value. Decoding
+    happens at most once, even if multiple threads access the data
+    concurrently. Payloads which are never accessed are never decoded.
+    """
+
+    def __init__(self, decode):
+        """
+        Create a new instance.
+
+        Args:
+            decode (callable):
+                A callable without arguments which returns the decoded
+                value.
+        """
+        self._decode = decode
+        self._wire = None
+        self._value = None
+        self._decoded = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_wire(cls, converter, wire_data, wire_schema):
+        """
+        Create an instance which deserializes ``wire_data`` on first access.
+
+        In contrast to instances created with an arbitrary ``decode``
+        callable, the wire representation of these instances is available
+        via :obj:`wire` until they are decoded.
+
+        Args:
+            converter (rsb.converter.Converter):
+                The converter used to deserialize ``wire_data``.
+            wire_data:
+                The serialized payload.
+            wire_schema (str):
+                The wire schema of ``wire_data``.
+
+        Returns:
+            LazyData:
+                The new instance.
+        """
+        result = cls(partial(converter.deserialize, wire_data, wire_schema))
+        result._wire = (converter, wire_data, wire_schema)
         return result
 
+    @property
+    def wire(self):
+        """
+        Return the wire representation of the value if it is available.
+
+        Returns:
+            tuple or None:
+                A tuple of converter, wire data and wire schema or ``None``
+                if the value has been decoded or has not been created by
+                :obj:`from_wire`.
+        """
+        return self._wire
+
+    @property
+    def decoded(self):
+        """
+        Indicate whether the value has already been decoded.
+
+        Returns:
+            bool:
+                ``True`` if the value has been decoded.
+        """
+        return self._decoded
+
+    @property
+    def value(self):
+        """
+        Return the decoded value, decoding it if necessary.
+
+        Returns:
+            The decoded value.
+        """
+        if not self._decoded:
+            with self._lock:
+                if not self._decoded:
+                    self._value = self._decode()
+                    self._decode = None
+                    self._wire = None
+                    self._decoded = True
+        return self._value
+
+    def __repr__(self):
+        if self._decoded:
+            return '{}({!r})'.format(type(self).__name__, self._value)
+        return '<{} (not decoded) at 0x{:x}>'.format(type(self).__name__,
+                                                     id(self))
+
 
 class Event:
     """
@@ -1181,6 +1418,9 @@ class Event:
     .. codeauthor:: jwienke
     """
 
+    __slots__ = ('_id', '_scope', '_method', '_data', '_type', '_meta_data',
+                 '_causes', '__weakref__')
+
     def __init__(self,
                  event_id=None,
                  scope=Scope("/"),
@@ -1318,11 +1558,16 @@ class Event:
         """
         Return the user data of this event.
 
+        :obj:`LazyData` is decoded on first access.
+
         Returns:
             user data
         """
 
-        return self._data
+        data = self._data
+        if isinstance(data, LazyData):
+            return data.value
+        return data
 
     @data.setter
     def data(self, data):
@@ -1468,7 +1713,7 @@ class Event:
             return (self._id == other._id) and \
                 (self._scope == other._scope) and \
                 (self._type == other._type) and \
-                (self._data == other._data) and \
+                (self.data == other.data) and \
                 (self._meta_data == other._meta_data) and \
                 (self._causes == other._causes)
         except (TypeError, AttributeError):
@@ -1622,7 +1867,7 @@ class Informer(Participant):
     """
 
     def __init__(self, scope, config, data_type,
-                 configurator=None):
+                 configurator=None, sending_strategy=None):
         """
         Construct a new :obj:`Informer`.
 
@@ -1641,6 +1886,11 @@ class Informer(Participant):
             configurator:
                 Out route configurator to manage sending of events through out
                 connectors.
+            sending_strategy (rsb.eventprocessing.EventSendingStrategy):
+                The strategy according to which events are passed to the out
+                connectors if no ``configurator`` is supplied. An
+                :obj:`rsb.eventprocessing.AsyncEventSendingStrategy` makes
+                publishing asynchronous.
 
         .. todo::
 
@@ -1672,7 +1922,7 @@ class Informer(Participant):
                 connector.quality_of_service_spec = \
                     config.quality_of_service_spec
             self._configurator = rsb.eventprocessing.OutRouteConfigurator(
-                connectors=connectors)
+                connectors=connectors, sending_strategy=sending_strategy)
         self._configurator.quality_of_service_spec = \
             config.quality_of_service_spec
         self._configurator.scope = self.scope
@@ -1698,15 +1948,15 @@ class Informer(Participant):
         """
         return self._type
 
-    def publish_data(self, data, user_infos=None, user_times=None):
-        # TODO check activation
+    def publish_data(self, data, user_infos=None, user_times=None,
+                     future=False):
         self._logger.debug("Publishing data '%s'", data)
         event = Event(scope=self.scope,
                       data=data, data_type=type(data),
                       user_infos=user_infos, user_times=user_times)
-        return self.publish_event(event)
+        return self.publish_event(event, future=future)
 
-    def publish_event(self, event):
+    def publish_event(self, event, future=False):
         """
         Publish a predefined event.
 
@@ -1716,9 +1966,90 @@ class Informer(Participant):
         Args:
             event (Event):
                 the event to send
+            future (bool):
+                If ``True``, return a future which provides the event once
+                it has been sent. This is mainly useful with an asynchronous
+                sending strategy.
+
+        Returns:
+            Event or rsb.patterns.future.Future:
+                ``event`` or a future for it.
+
+        Raises:
+            RuntimeError:
+                If this informer has been deactivated.
+        """
+        self._check_active()
+        self._check_event(event)
+
+        with self._mutex:
+            event.event_id = EventId(self.participant_id,
+                                     self._sequence_number)
+            self._sequence_number += 1
+        self._logger.debug("Publishing event '%s'", event)
+        if future:
+            return self._configurator.submit(event)
+        self._configurator.handle(event)
+        return event
+
+    def publish_many(self, items):
         """
-        # TODO check activation
+        Publish multiple data items or predefined events in one batch.
+
+        Sequence numbers for all events are reserved at once and the
+        events are handed to the connectors together, which allows
+        transports to serialize them in a tight loop and to send them with
+        a single write. Items which are not :obj:`Event` instances are
+        treated like the data of :obj:`publish_data`.
+
+        Args:
+            items (iterable):
+                The data items and/or events to send, in sending order.
+
+        Returns:
+            list of Event:
+                The sent events.
+
+        Raises:
+            ValueError:
+                If the scope or payload of any event does not match this
+                informer. No event is sent in this case.
+            RuntimeError:
+                If this informer has been deactivated.
+        """
+        self._check_active()
+        scope = self.scope
+        data_type = self.data_type
+        events = []
+        for item in items:
+            if isinstance(item, Event):
+                self._check_event(item)
+                events.append(item)
+            elif isinstance(item, data_type):
+                events.append(Event(scope=scope, data=item,
+                                    data_type=type(item)))
+            else:
+                raise ValueError("The payload {} does not match this "
+                                 "informer's type {}.".format(
+                                     item, data_type))
+        if not events:
+            return events
 
+        with self._mutex:
+            first = self._sequence_number
+            self._sequence_number += len(events)
+        participant_id = self.participant_id
+        for (offset, event) in enumerate(events):
+            event.event_id = EventId(participant_id, first + offset)
+        self._logger.debug("Publishing %d events", len(events))
+        self._configurator.handle_many(events)
+        return events
+
+    def _check_active(self):
+        if not self._active:
+            raise RuntimeError("Trying to publish via inactive informer")
+
+    def _check_event(self, event):
         if not event.scope == self.scope \
                 and not event.scope.is_sub_scope_of(self.scope):
             raise ValueError("Scope {} of event {} is not a sub-scope of "
@@ -1729,14 +2060,6 @@ class Informer(Participant):
                              "this informer's type {}.".format(
                                  event.data, event, self.data_type))
 
-        with self._mutex:
-            event.event_id = EventId(self.participant_id,
-                                     self._sequence_number)
-            self._sequence_number += 1
-        self._logger.debug("Publishing event '%s'", event)
-        self._configurator.handle(event)
-        return event
-
     def _activate(self):
         with self._mutex:
             if self._active:
@@ -1776,7 +2099,9 @@ class Listener(Participant):
 
     def __init__(self, scope, config,
                  configurator=None,
-                 receiving_strategy=None):
+                 receiving_strategy=None,
+                 queue_size=None,
+                 overflow=None):
         """
         Create a new :obj:`Listener` for ``scope``.
 
@@ -1789,6 +2114,19 @@ class Listener(Participant):
             configurator:
                 An in route configurator to manage the receiving of events from
                 in connectors and their filtering and dispatching.
+            receiving_strategy:
+                The strategy used to dispatch events to handlers. By default,
+                a :obj:`rsb.eventprocessing.ParallelEventReceivingStrategy`
+                is used.
+            queue_size (int or None):
+                The maximum number of events queued per handler for the
+                default receiving strategy. Overrides the
+                ``receive_queue_size`` of ``config``.
+            overflow (str or None):
+                The overflow policy (``'block'``, ``'drop-oldest'`` or
+                ``'drop-newest'``) for full handler queues of the default
+                receiving strategy. Overrides the ``receive_overflow`` of
+                ``config``.
 
         See Also:
             :obj:`create_listener`
@@ -1799,6 +2137,9 @@ class Listener(Participant):
 
         self._filters = []
         self._handlers = []
+        # Maps handlers added by add_batch_handler to their
+        # BatchingHandler objects.
+        self._batch_handlers = {}
         self._configurator = None
         self._active = False
         self._mutex = threading.Lock()
@@ -1810,6 +2151,14 @@ class Listener(Participant):
             for connector in connectors:
                 connector.quality_of_service_spec = \
                     config.quality_of_service_spec
+            if receiving_strategy is None:
+                if queue_size is None:
+                    queue_size = config.receive_queue_size
+                if overflow is None:
+                    overflow = config.receive_overflow
+                receiving_strategy = \
+                    rsb.eventprocessing.ParallelEventReceivingStrategy(
+                        queue_size=queue_size, overflow=overflow)
             self._configurator = rsb.eventprocessing.InRouteConfigurator(
                 connectors=connectors,
                 receiving_strategy=receiving_strategy)
@@ -1825,6 +2174,28 @@ class Listener(Participant):
     def transport_urls(self):
         return self._configurator.transport_urls
 
+    @property
+    def dropped_events(self):
+        """
+        Return the number of events discarded because of full queues.
+
+        Returns:
+            int:
+                The number of discarded events, counted once per handler.
+        """
+        return self._configurator.receiving_strategy.dropped_events
+
+    @property
+    def max_queue_depth(self):
+        """
+        Return the largest number of events queued for a handler.
+
+        Returns:
+            int:
+                The high-water mark of the handler queues.
+        """
+        return self._configurator.receiving_strategy.max_queue_depth
+
     def _activate(self):
         # TODO commonality with Informer... refactor
         with self._mutex:
@@ -1850,6 +2221,10 @@ class Listener(Participant):
 
             self._configurator.deactivate()
 
+            # Deliver events still waiting in incomplete batches.
+            for batching in self._batch_handlers.values():
+                batching.close()
+
             self._active = False
 
         super().deactivate()
@@ -1896,13 +2271,53 @@ class Listener(Participant):
                 self._handlers.append(handler)
                 self._configurator.handler_added(handler, wait)
 
+    def add_batch_handler(self, handler, max_batch=100, max_latency=0.1,
+                          wait=True):
+        """
+        Add ``handler`` to be invoked with lists of new events.
+
+        Events which match the filters of this listener are collected and
+        ``handler`` is called with a list of at most ``max_batch`` events,
+        in the order in which they were received, once the list is full or
+        the oldest event in it has waited for ``max_latency`` seconds.
+        Incomplete batches are delivered when the handler is removed or the
+        listener is deactivated.
+
+        Args:
+            handler:
+                Handler to add. callable with one argument, the list of
+                events.
+            max_batch (int):
+                The maximum number of events per call of ``handler``.
+            max_latency (float or None):
+                The maximum delay in seconds between receiving an event and
+                passing it to ``handler`` or ``None`` to deliver only full
+                batches.
+            wait:
+                If set to ``True``, this method will return only after the
+                handler has completely been installed and will receive the next
+                available message. Otherwise it may return earlier.
+
+        See Also:
+            :obj:`rsb.eventprocessing.BatchingHandler`
+        """
+
+        with self._mutex:
+            if handler not in self._batch_handlers:
+                batching = rsb.eventprocessing.BatchingHandler(
+                    handler, max_batch=max_batch, max_latency=max_latency)
+                self._batch_handlers[handler] = batching
+                self._handlers.append(batching)
+                self._configurator.handler_added(batching, wait)
+
     def remove_handler(self, handler, wait=True):
         """
         Remove ``handler`` from the list of handlers this listener invokes.
 
         Args:
             handler:
-                Handler to remove.
+                Handler to remove. Can be a handler added with
+                :meth:`add_handler` or :meth:`add_batch_handler`.
             wait:
                 If set to ``True``, this method will return only after the
                 handler has been completely removed from the event processing
@@ -1910,9 +2325,14 @@ class Listener(Participant):
         """
 
         with self._mutex:
+            batching = self._batch_handlers.pop(handler, None)
+            if batching is not None:
+                handler = batching
             if handler in self._handlers:
-                self._configurator.handlerRemoved(handler, wait)
+                self._configurator.handler_removed(handler, wait)
                 self._handlers.remove(handler)
+            if batching is not None:
+                batching.close()
 
     def get_handlers(self):
         """
@@ -2145,7 +2565,8 @@ def _load_plugins():
             return
         _plugins_loaded = True
 
-        default_plugins = ['rsb.transport.local', 'rsb.transport.socket']
+        default_plugins = ['rsb.transport.local', 'rsb.transport.socket',
+                           'rsb.transport.shm']
 
         configured_plugins = _default_configuration_options.get(
             'plugins.python.load', '').split(':')
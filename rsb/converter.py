@@ -468,7 +468,7 @@ class StringConverter(Converter):
         return bytes(inp.encode(self._encoding)), self.wire_schema
 
     def deserialize(self, inp, wire_schema):
-        return inp.decode(self._encoding)
+        return str(inp, self._encoding)
 
 
 class ByteArrayConverter(Converter):
@@ -565,7 +565,7 @@ class ScopeConverter(Converter):
     def deserialize(self, inp, wire_schema):
         assert wire_schema == self.wire_schema
 
-        return Scope(inp.decode('ascii'))
+        return Scope(str(inp, 'ascii'))
 
 
 class EventsByScopeMapConverter(Converter):
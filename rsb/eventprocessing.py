@@ -27,14 +27,152 @@ Contains code mediating between the user interface and the transport layer.
 """
 
 import abc
+import collections
 import copy
+import functools
+import multiprocessing
+import os
+import pickle
 import queue
 import threading
+import time
+import traceback
 
 import rsb.filter
 import rsb.util
 
 
+class ScopeTrie:
+    """
+    Maps :ref:`Scopes <scope>` to values in a tree keyed by scope components.
+
+    Finding the values associated to a scope and all of its super-scopes
+    visits each component of the scope once, independent of the number of
+    stored scopes.
+    """
+
+    class _Node:
+
+        __slots__ = ('values', 'children')
+
+        def __init__(self):
+            self.values = []
+            self.children = {}
+
+    def __init__(self):
+        self._root = self._Node()
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def add(self, scope, value):
+        """
+        Associate ``value`` to ``scope``.
+
+        Args:
+            scope (Scope):
+                The scope to which ``value`` should be associated.
+            value (object):
+                An arbitrary object.
+        """
+        node = self._root
+        for component in scope.components:
+            child = node.children.get(component)
+            if child is None:
+                child = self._Node()
+                node.children[component] = child
+            node = child
+        node.values.append(value)
+        self._size += 1
+
+    def remove(self, scope, value):
+        """
+        Disassociate ``value`` from ``scope``.
+
+        Args:
+            scope (Scope):
+                The scope from which ``value`` should be disassociated.
+            value (object):
+                An object previously associated to ``scope``.
+
+        Raises:
+            ValueError:
+                If ``value`` is not associated to ``scope``.
+        """
+        path = [self._root]
+        for component in scope.components:
+            child = path[-1].children.get(component)
+            if child is None:
+                raise ValueError('{!r} is not associated to {}'.format(
+                    value, scope))
+            path.append(child)
+        path[-1].values.remove(value)
+        self._size -= 1
+
+        # Remove nodes which no longer lead to any values.
+        for (parent, child, component) in zip(reversed(path[:-1]),
+                                              reversed(path[1:]),
+                                              reversed(scope.components)):
+            if child.values or child.children:
+                break
+            del parent.children[component]
+
+    @property
+    def values(self):
+        """
+        Return a generator yielding all values.
+
+        Yields:
+            values:
+                All values in an unspecified order.
+        """
+        nodes = [self._root]
+        while nodes:
+            node = nodes.pop()
+            yield from node.values
+            nodes.extend(node.children.values())
+
+    def matching(self, scope):
+        """
+        Return a generator yielding values matching ``scope``.
+
+        A value matches ``scope`` if it was associated to ``scope`` or one
+        of its super-scopes.
+
+        Yields:
+            values:
+                Matching values, values of super-scopes first.
+        """
+        return self.matching_components(scope.components)
+
+    def matching_components(self, components):
+        """
+        Return a generator yielding values matching a scope.
+
+        Like :obj:`matching` but accepts the components of the scope
+        instead of a :obj:`rsb.Scope` object.
+
+        Args:
+            components (iterable of str):
+                The components of the scope.
+
+        Yields:
+            values:
+                Matching values, values of super-scopes first.
+        """
+        node = self._root
+        yield from node.values
+        for component in components:
+            node = node.children.get(component)
+            if node is None:
+                return
+            yield from node.values
+
+
 class ScopeDispatcher:
     """
     Maintains a map of :ref:`Scopes <scope>` to sink objects.
@@ -43,13 +181,13 @@ class ScopeDispatcher:
     """
 
     def __init__(self):
-        self._map = {}
+        self._trie = ScopeTrie()
 
     def __len__(self):
-        return len(self._map)
+        return len(self._trie)
 
     def __bool__(self):
-        return bool(self._map)
+        return bool(self._trie)
 
     def add_sink(self, scope, sink):
         """
@@ -61,13 +199,7 @@ class ScopeDispatcher:
             sink (object):
                 The arbitrary object that should be associated to `scope`.
         """
-        if scope in self._map:
-            sinks = self._map[scope]
-        else:
-            sinks = []
-            self._map[scope] = sinks
-
-        sinks.append(sink)
+        self._trie.add(scope, sink)
 
     def remove_sink(self, scope, sink):
         """
@@ -80,10 +212,7 @@ class ScopeDispatcher:
                 The arbitrary object that should be disassociated from
                 `scope`.
         """
-        sinks = self._map.get(scope)
-        sinks.remove(sink)
-        if not sinks:
-            del self._map[scope]
+        self._trie.remove(scope, sink)
 
     @property
     def sinks(self):
@@ -95,9 +224,7 @@ class ScopeDispatcher:
                 A generator yielding all known sinks in an unspecified
                 order.
         """
-        for sinks in list(self._map.values()):
-            for sink in sinks:
-                yield sink
+        return self._trie.values
 
     def matching_sinks(self, scope):
         """
@@ -111,11 +238,7 @@ class ScopeDispatcher:
                 A generator yielding all matching sinks in an
                 unspecified order.
         """
-        for sink in self._map.get(scope, []):
-            yield sink
-        for scope in scope.super_scopes():
-            for sink in self._map.get(scope, []):
-                yield sink
+        return self._trie.matching(scope)
 
 
 class BroadcastProcessor:
@@ -186,6 +309,135 @@ class EventReceivingStrategy(metaclass=abc.ABCMeta):
     def handle(self, event):
         pass
 
+    @property
+    def dropped_events(self):
+        """
+        Return the number of events discarded because of full queues.
+
+        Returns:
+            int:
+                The number of discarded events. Always 0 for strategies
+                without bounded queues.
+        """
+        return 0
+
+    @property
+    def max_queue_depth(self):
+        """
+        Return the largest number of events queued at any time.
+
+        Returns:
+            int:
+                The high-water mark of the queues of the strategy. Always 0
+                for strategies without queues.
+        """
+        return 0
+
+
+class _CopyOnWriteEventReceivingStrategy(EventReceivingStrategy):
+    """
+    Superclass for strategies which dispatch events without copying handlers.
+
+    Handlers and filters are stored in tuples which are replaced instead of
+    modified. Events can therefore be dispatched to the handlers and
+    filters registered at the time of their arrival without copying them
+    and without holding ``_mutex``. ``_mutex`` is a condition such that
+    subclasses can wait for deliveries to handlers which have been removed.
+    """
+
+    def __init__(self):
+        self._handlers = ()
+        self._filters = ()
+        self._mutex = threading.Condition()
+
+    def _snapshot(self):
+        # Return the current handlers and filters as a consistent pair.
+        with self._mutex:
+            return self._handlers, self._filters
+
+    def add_handler(self, handler, wait):
+        with self._mutex:
+            self._handlers = self._handlers + (handler,)
+
+    def remove_handler(self, handler, wait):
+        with self._mutex:
+            handlers = list(self._handlers)
+            handlers.remove(handler)
+            self._handlers = tuple(handlers)
+
+    def add_filter(self, the_filter):
+        with self._mutex:
+            self._filters = self._filters + (the_filter,)
+
+    def remove_filter(self, the_filter):
+        with self._mutex:
+            self._filters = tuple(f for f in self._filters
+                                  if f != the_filter)
+
+
+class _BoundedQueue:
+    """
+    Mixin for strategies which queue entries for their threads.
+
+    Provides a bounded ``_queue`` guarded by ``_condition`` and applies the
+    overflow policy when an entry is added to the full queue. Classes using
+    this mixin call :meth:`_init_queue` in their constructor and set
+    ``_stopping`` to stop waiting for room in the queue.
+    """
+
+    OVERFLOW_POLICIES = ('block', 'drop-oldest', 'drop-newest')
+
+    def _init_queue(self, queue_size, overflow):
+        if queue_size < 1:
+            raise ValueError('Queue size has to be at least 1, not {}'
+                             .format(queue_size))
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError('Overflow policy has to be one of {}, not {}'
+                             .format(', '.join(self.OVERFLOW_POLICIES),
+                                     overflow))
+        self._queue_size = queue_size
+        self._overflow = overflow
+
+        self._queue = collections.deque()
+        self._condition = threading.Condition()
+        self._dropped_events = 0
+        self._max_queue_depth = 0
+        self._stopping = False
+
+    def _make_room(self):
+        """
+        Apply the overflow policy if the queue is full.
+
+        Must be called with ``_condition`` held.
+
+        Returns:
+            tuple:
+                Whether the new entry should be queued and the oldest entry
+                if it has been discarded to make room, otherwise ``None``.
+                The new entry is not queued if it has been discarded or if
+                the queue has been stopped while waiting for room.
+        """
+        queue = self._queue
+        if len(queue) < self._queue_size:
+            return True, None
+        if self._overflow == 'block':
+            while len(queue) >= self._queue_size and not self._stopping:
+                # Wake up threads which remove entries from the queue.
+                self._condition.notify_all()
+                self._condition.wait()
+            return not self._stopping, None
+        self._dropped_events += 1
+        if self._overflow == 'drop-oldest':
+            return True, queue.popleft()
+        return False, None
+
+    def _append(self, entry):
+        # Must be called with _condition held.
+        queue = self._queue
+        queue.append(entry)
+        if len(queue) > self._max_queue_depth:
+            self._max_queue_depth = len(queue)
+
 
 class ParallelEventReceivingStrategy(EventReceivingStrategy):
     """
@@ -195,17 +447,62 @@ class ParallelEventReceivingStrategy(EventReceivingStrategy):
     handlers in individual threads in parallel. Each handler is called only
     sequentially but potentially from different threads.
 
+    Events waiting for a handler are queued per handler. These queues are
+    unbounded by default. With a ``queue_size``, the ``overflow`` policy
+    decides whether :meth:`handle` blocks the calling transport until the
+    slowest handler catches up or events are discarded for handlers with
+    full queues. With the ``'block'`` policy, handlers must not publish
+    events which are delivered to the same listener synchronously (e.g. via
+    the inprocess transport) since that could block the handler on its own
+    full queue.
+
     .. codeauthor:: jwienke
     """
 
-    def __init__(self, num_threads=5):
+    def __init__(self, num_threads=5, queue_size=None, overflow='block'):
+        """
+        Create a new strategy.
+
+        Args:
+            num_threads (int):
+                The number of threads dispatching events to handlers.
+            queue_size (int or None):
+                The maximum number of events queued per handler or ``None``
+                for unbounded queues.
+            overflow (str):
+                What to do when an event is handled while the queue of a
+                handler is full: ``'block'`` waits for the handler, whereas
+                ``'drop-oldest'`` and ``'drop-newest'`` discard the oldest
+                queued or the new event respectively.
+
+        Raises:
+            ValueError:
+                If an option has an invalid value.
+        """
         self._logger = rsb.util.get_logger_by_class(self.__class__)
+        # Assigned first since __del__ uses it if creating the pool fails.
+        self._pool = None
         self._pool = rsb.util.OrderedQueueDispatcherPool(
             thread_pool_size=num_threads, del_func=self._deliver,
-            filter_func=self._filter)
+            filter_func=self._filter, queue_size=queue_size,
+            overflow=overflow)
         self._pool.start()
         self._filters = []
         self._filtersMutex = threading.RLock()
+        self._dropped_events = 0
+        self._max_queue_depth = 0
+
+    @property
+    def dropped_events(self):
+        if self._pool:
+            return self._pool.dropped_messages
+        return self._dropped_events
+
+    @property
+    def max_queue_depth(self):
+        if self._pool:
+            return self._pool.max_queue_depth
+        return self._max_queue_depth
 
     def __del__(self):
         self._logger.debug("Destructing ParallelEventReceivingStrategy")
@@ -215,6 +512,9 @@ class ParallelEventReceivingStrategy(EventReceivingStrategy):
         self._logger.debug("Deactivating ParallelEventReceivingStrategy")
         if self._pool:
             self._pool.stop()
+            # Keep the statistics of the pool.
+            self._dropped_events = self._pool.dropped_messages
+            self._max_queue_depth = self._pool.max_queue_depth
             self._pool = None
 
     def _deliver(self, action, event):
@@ -260,7 +560,8 @@ class ParallelEventReceivingStrategy(EventReceivingStrategy):
             self._filters = [f for f in self._filters if f != the_filter]
 
 
-class FullyParallelEventReceivingStrategy(EventReceivingStrategy):
+class FullyParallelEventReceivingStrategy(_BoundedQueue,
+                                          _CopyOnWriteEventReceivingStrategy):
     """
     Dispatches events to multiple handlers that can be called in parallel.
 
@@ -268,33 +569,104 @@ class FullyParallelEventReceivingStrategy(EventReceivingStrategy):
     handlers in individual threads in parallel. Each handler can be called
     in parallel for different requests.
 
+    Handler calls are executed by a pool of at most ``max_workers`` threads
+    which are started on demand and reused for subsequent events. Calls
+    which cannot be started immediately wait in a bounded queue. When this
+    queue is full, the ``overflow`` policy decides whether :meth:`handle`
+    blocks until a worker becomes available or an event is discarded.
+
     .. codeauthor:: jwienke
     """
 
-    def __init__(self):
+    def __init__(self, max_workers=10, queue_size=1000, overflow='block'):
+        """
+        Create a new strategy.
+
+        Args:
+            max_workers (int):
+                The maximum number of handler calls executing in parallel.
+            queue_size (int):
+                The maximum number of handler calls waiting for a worker.
+            overflow (str):
+                What to do when an event is handled while the queue is
+                full: ``'block'`` waits for a worker, whereas
+                ``'drop-oldest'`` and ``'drop-newest'`` discard the oldest
+                queued or the new calls respectively.
+
+        Raises:
+            ValueError:
+                If an option has an invalid value.
+        """
+        super().__init__()
+
         self._logger = rsb.util.get_logger_by_class(self.__class__)
-        self._filters = []
-        self._mutex = threading.RLock()
-        self._handlers = []
 
-    def deactivate(self):
-        pass
+        if max_workers < 1:
+            raise ValueError('Maximum number of workers has to be at least '
+                             '1, not {}'.format(max_workers))
+        self._max_workers = max_workers
 
-    class Worker(threading.Thread):
+        # Entries are (handler, event) tuples.
+        self._init_queue(queue_size, overflow)
+        self._workers = []
+        self._idle_workers = 0
 
-        def __init__(self, handler, event, filters):
-            super().__init__(name='DispatcherThread')
-            self.handler = handler
-            self.event = event
-            self.filters = filters
+    @property
+    def dropped_events(self):
+        """
+        Return the number of handler calls discarded by the overflow policy.
 
-        def run(self):
+        Returns:
+            int:
+                The number of discarded handler calls.
+        """
+        return self._dropped_events
 
-            for f in self.filters:
-                if not f.match(self.event):
-                    return
+    @property
+    def max_queue_depth(self):
+        """
+        Return the largest number of handler calls waiting at any time.
+
+        Returns:
+            int:
+                The high-water mark of the queue.
+        """
+        return self._max_queue_depth
 
-            self.handler(self.event)
+    def deactivate(self):
+        with self._condition:
+            self._stopping = True
+            if self._queue:
+                self._logger.debug('Discarding %d pending handler calls',
+                                   len(self._queue))
+                self._queue.clear()
+            self._condition.notify_all()
+            workers = self._workers
+            self._workers = []
+        current = threading.current_thread()
+        for worker in workers:
+            if worker is not current:
+                worker.join()
+
+    def _work(self):
+        condition = self._condition
+        queue = self._queue
+        while True:
+            with condition:
+                while not queue and not self._stopping:
+                    self._idle_workers += 1
+                    condition.wait()
+                    self._idle_workers -= 1
+                if self._stopping:
+                    return
+                handler, event = queue.popleft()
+                # Wake up callers blocked on a full queue.
+                condition.notify_all()
+            try:
+                handler(event)
+            except Exception:
+                self._logger.exception('Handler %s failed for event %s',
+                                       handler, event)
 
     def handle(self, event):
         """
@@ -306,31 +678,550 @@ class FullyParallelEventReceivingStrategy(EventReceivingStrategy):
         """
         self._logger.debug("Processing event %s", event)
         event.meta_data.set_deliver_time()
-        workers = []
-        with self._mutex:
-            for h in self._handlers:
-                workers.append(self.Worker(h, event, list(self._filters)))
-        for w in workers:
-            w.start()
 
-    def add_handler(self, handler, wait):
-        # We can ignore wait since the pool implements the desired
-        # behavior.
+        handlers, filters = self._snapshot()
+        for f in filters:
+            if not f.match(event):
+                return
+
+        with self._condition:
+            if self._stopping:
+                return
+            queue = self._queue
+            for handler in handlers:
+                queued, _ = self._make_room()
+                if not queued:
+                    if self._stopping:
+                        return
+                    continue
+                self._append((handler, event))
+                # Start another worker unless enough workers are idle.
+                if self._idle_workers >= len(queue):
+                    self._condition.notify()
+                elif len(self._workers) < self._max_workers:
+                    worker = threading.Thread(target=self._work,
+                                              name='DispatcherThread',
+                                              daemon=True)
+                    self._workers.append(worker)
+                    worker.start()
+
+
+class PartitionedEventReceivingStrategy(_CopyOnWriteEventReceivingStrategy):
+    """
+    Dispatches events in parallel while keeping the order per key.
+
+    An :obj:`EventReceivingStrategy` that maps each event to one of a fixed
+    number of lanes by hashing a key of the event, by default its scope.
+    Events of one lane are dispatched sequentially and in order to all
+    handlers, whereas different lanes are served in parallel by a pool of
+    threads. Events with equal keys, e.g. the data of one sensor, are thus
+    processed in order while events with different keys are processed
+    concurrently as long as they hash to different lanes.
+    """
+
+    class _Lane:
+
+        __slots__ = ('index', 'handlers')
+
+        def __init__(self, index):
+            self.index = index
+            # Handlers used by the current delivery, if any.
+            self.handlers = None
+
+        def __str__(self):
+            return 'Lane{}'.format(self.index)
+
+    def __init__(self, num_lanes=16, num_threads=5, key=None,
+                 queue_size=None, overflow='block'):
+        """
+        Create a new strategy.
+
+        Args:
+            num_lanes (int):
+                The number of lanes events are distributed to.
+            num_threads (int):
+                The number of threads serving the lanes.
+            key (str or callable or None):
+                Determines the key of an event. ``None`` uses the scope of
+                the event, a string uses the value of the user info entry
+                with that name and a callable is called with the event and
+                has to return a hashable key.
+            queue_size (int or None):
+                The maximum number of events queued per lane or ``None``
+                for unbounded queues.
+            overflow (str):
+                What to do when an event is handled while the queue of its
+                lane is full: ``'block'`` waits for the lane, whereas
+                ``'drop-oldest'`` and ``'drop-newest'`` discard the oldest
+                queued or the new event respectively.
+
+        Raises:
+            ValueError:
+                If an option has an invalid value.
+        """
+        super().__init__()
+
+        self._logger = rsb.util.get_logger_by_class(self.__class__)
+
+        if num_lanes < 1:
+            raise ValueError('Number of lanes has to be at least 1, not {}'
+                             .format(num_lanes))
+        if key is None:
+            key = self._scope_key
+        elif isinstance(key, str):
+            key = functools.partial(self._user_info_key, key)
+        elif not callable(key):
+            raise ValueError('Key has to be None, a string or a callable, '
+                             'not {}'.format(key))
+        self._key = key
+
+        self._pool = rsb.util.OrderedQueueDispatcherPool(
+            thread_pool_size=num_threads, del_func=self._deliver,
+            queue_size=queue_size, overflow=overflow)
+        self._lanes = [self._Lane(i) for i in range(num_lanes)]
+        for lane in self._lanes:
+            self._pool.register_receiver(lane)
+        self._pool.start()
+
+        self._dropped_events = 0
+        self._max_queue_depth = 0
+
+    @staticmethod
+    def _scope_key(event):
+        return event.scope
+
+    @staticmethod
+    def _user_info_key(name, event):
+        return event.meta_data.user_infos.get(name)
+
+    @property
+    def dropped_events(self):
+        if self._pool:
+            return self._pool.dropped_messages
+        return self._dropped_events
+
+    @property
+    def max_queue_depth(self):
+        if self._pool:
+            return self._pool.max_queue_depth
+        return self._max_queue_depth
+
+    def deactivate(self):
+        if self._pool:
+            self._pool.stop()
+            # Keep the statistics of the pool.
+            self._dropped_events = self._pool.dropped_messages
+            self._max_queue_depth = self._pool.max_queue_depth
+            self._pool = None
+
+    def _deliver(self, lane, event):
+        for flt in self._filters:
+            if not flt.match(event):
+                return
+
         with self._mutex:
-            self._handlers.append(handler)
+            lane.handlers = handlers = self._handlers
+        try:
+            for handler in handlers:
+                handler(event)
+        finally:
+            with self._mutex:
+                lane.handlers = None
+                self._mutex.notify_all()
+
+    def handle(self, event):
+        """
+        Dispatch the event to the lane selected by its key.
+
+        Args:
+            event:
+                event to dispatch
+        """
+        self._logger.debug("Processing event %s", event)
+        event.meta_data.set_deliver_time()
+        lanes = self._lanes
+        self._pool.push_to(lanes[hash(self._key(event)) % len(lanes)], event)
 
     def remove_handler(self, handler, wait):
-        # TODO anything required to implement wait functionality?
         with self._mutex:
-            self._handlers.remove(handler)
+            super().remove_handler(handler, wait)
+            # Wait for deliveries which started before the removal.
+            while wait and any(handler in (lane.handlers or ())
+                               for lane in self._lanes):
+                self._mutex.wait()
 
-    def add_filter(self, f):
-        with self._mutex:
-            self._filters.append(f)
 
-    def remove_filter(self, the_filter):
-        with self._mutex:
-            self._filters = [f for f in self._filters if f != the_filter]
+def _run_handlers_in_process(worker, tasks, results):
+    """
+    Process events received from ``tasks`` until ``None`` is received.
+
+    Main function of the worker processes of
+    :obj:`ProcessPoolEventReceivingStrategy`. Each task is a tuple of the
+    pickled handlers, or ``None`` if the handlers of the previous task
+    apply, and the pickled tuple of the event and either ``None`` or the
+    converter, wire data and wire schema of the payload of the event. For
+    each task, a tuple of ``worker``, the processing time and ``None`` or a
+    description of the error raised by a handler is put into ``results``.
+    """
+    handlers = ()
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        start = time.perf_counter()
+        pickled_handlers, payload = task
+        error = None
+        try:
+            if pickled_handlers is not None:
+                handlers = pickle.loads(pickled_handlers)
+            event, wire = pickle.loads(payload)
+            if wire is not None:
+                converter, wire_data, wire_schema = wire
+                event.data = converter.deserialize(wire_data, wire_schema)
+            for handler in handlers:
+                handler(event)
+        except Exception:
+            error = traceback.format_exc()
+        results.put((worker, time.perf_counter() - start, error))
+
+
+class ProcessPoolEventReceivingStrategy(_CopyOnWriteEventReceivingStrategy):
+    """
+    Dispatches events to handlers running in worker processes.
+
+    An :obj:`EventReceivingStrategy` that sends events to a fixed number of
+    worker processes which call the handlers. Since the handlers do not
+    share an interpreter, CPU-bound handlers run in parallel. Handlers have
+    to be picklable, e.g. module-level functions, and their side effects
+    happen in the worker processes.
+
+    Events whose payload has not been decoded yet (see the ``lazydata``
+    option of the socket and shm transports and :obj:`rsb.LazyData`) are
+    sent as wire data and wire schema and deserialized in the worker
+    processes. Other payloads are pickled.
+
+    In unordered mode, each event is sent to the worker process with the
+    fewest pending events. In ordered mode, events are sent to a worker
+    process selected by hashing a key of the event, by default its scope,
+    so that events with equal keys are processed in order. At most
+    ``max_in_flight`` events are pending at any time; :meth:`handle` blocks
+    while this window is full. Filters are applied before events are sent
+    to the worker processes. Handlers are only sent to a worker process
+    when they have changed since its previous event.
+
+    A worker process which terminates, e.g. because a handler exits the
+    process or because it is killed, is replaced by a new worker process.
+    Its pending events are counted as failed.
+
+    By default, worker processes are started with the ``forkserver``
+    start method or, where it is unavailable, with ``spawn``. Forking
+    the process which runs the transport threads could leave locks held by
+    these threads, e.g. of the logging module or the scope cache, locked
+    forever in the worker processes.
+    """
+
+    _WORKER_CHECK_INTERVAL = 0.1
+
+    def __init__(self, num_processes=None, ordered=False, key=None,
+                 max_in_flight=100, context=None):
+        """
+        Create a new strategy and start its worker processes.
+
+        Args:
+            num_processes (int or None):
+                The number of worker processes or ``None`` for the number
+                of CPUs.
+            ordered (bool):
+                Whether events with equal keys are processed in order.
+            key (str or callable or None):
+                Determines the key of an event in ordered mode. ``None``
+                uses the scope of the event, a string uses the value of the
+                user info entry with that name and a callable is called
+                with the event and has to return a hashable key.
+            max_in_flight (int):
+                The maximum number of events sent to worker processes and
+                not yet processed.
+            context (str or None):
+                The :mod:`multiprocessing` start method for the worker
+                processes or ``None`` for ``forkserver`` or, where it is
+                unavailable, ``spawn``. ``fork`` is only safe if no other
+                threads are running when worker processes are started,
+                including when terminated worker processes are replaced.
+
+        Raises:
+            ValueError:
+                If an option has an invalid value.
+        """
+        super().__init__()
+
+        self._logger = rsb.util.get_logger_by_class(self.__class__)
+
+        if num_processes is None:
+            num_processes = os.cpu_count() or 1
+        if num_processes < 1:
+            raise ValueError('Number of processes has to be at least 1, '
+                             'not {}'.format(num_processes))
+        if max_in_flight < 1:
+            raise ValueError('Maximum number of events in flight has to be '
+                             'at least 1, not {}'.format(max_in_flight))
+        if key is None:
+            key = PartitionedEventReceivingStrategy._scope_key
+        elif isinstance(key, str):
+            key = functools.partial(
+                PartitionedEventReceivingStrategy._user_info_key, key)
+        elif not callable(key):
+            raise ValueError('Key has to be None, a string or a callable, '
+                             'not {}'.format(key))
+        self._ordered = ordered
+        self._key = key
+        self._max_in_flight = max_in_flight
+
+        self._condition = threading.Condition()
+        self._in_flight = [0] * num_processes
+        self._total_in_flight = 0
+        self._busy_times = [0.0] * num_processes
+        self._processed_events = 0
+        self._failed_events = 0
+        self._stopping = False
+        # The pickled handlers which have been sent last.
+        self._pickled_handlers = ((), None)
+
+        # Each worker process has its own task queue. Results of
+        # replaced worker processes are recognized by their generation.
+        if context is None:
+            context = ('forkserver'
+                       if 'forkserver' in
+                       multiprocessing.get_all_start_methods()
+                       else 'spawn')
+        self._context = multiprocessing.get_context(context)
+        self._tasks = [None] * num_processes
+        self._processes = [None] * num_processes
+        self._generations = [0] * num_processes
+        self._sent_handlers = [None] * num_processes
+        self._results = self._context.SimpleQueue()
+        for index in range(num_processes):
+            self._start_worker(index)
+        self._start_time = time.monotonic()
+
+        self._thread = threading.Thread(target=self._collect_results,
+                                        name='EventHandlerResults',
+                                        daemon=True)
+        self._thread.start()
+
+    @property
+    def in_flight(self):
+        """
+        Return the number of events sent to but not processed by workers.
+
+        Returns:
+            int:
+                The number of pending events.
+        """
+        return self._total_in_flight
+
+    @property
+    def processed_events(self):
+        """
+        Return the number of events processed by the worker processes.
+
+        Returns:
+            int:
+                The number of processed events, including failed ones.
+        """
+        return self._processed_events
+
+    @property
+    def failed_events(self):
+        """
+        Return the number of events which could not be processed.
+
+        Returns:
+            int:
+                The number of events for which a handler raised an error or
+                whose worker process terminated before processing them.
+        """
+        return self._failed_events
+
+    @property
+    def worker_utilization(self):
+        """
+        Return the fraction of time each worker process spent processing.
+
+        Returns:
+            list of float:
+                For each worker process, the time spent deserializing
+                events and calling handlers divided by the time since the
+                worker processes have been started.
+        """
+        elapsed = max(time.monotonic() - self._start_time, 1e-9)
+        with self._condition:
+            return [busy / elapsed for busy in self._busy_times]
+
+    def _start_worker(self, index):
+        # Must be called with self._condition held unless called from
+        # the constructor. Tasks are queued via a feeder thread such
+        # that handle() does not block if the worker process dies with
+        # a full pipe.
+        self._generations[index] += 1
+        self._tasks[index] = self._context.Queue()
+        self._sent_handlers[index] = None
+        process = self._context.Process(
+            target=_run_handlers_in_process,
+            args=((index, self._generations[index]), self._tasks[index],
+                  self._results),
+            name='EventHandlerProcess-{}'.format(index),
+            daemon=True)
+        process.start()
+        self._processes[index] = process
+
+    def _check_workers(self):
+        # Must be called with self._condition held. Discards the pending
+        # events of terminated worker processes and replaces them unless
+        # stopping.
+        for (index, process) in enumerate(self._processes):
+            if process.is_alive() or \
+                    (self._stopping and not self._in_flight[index]):
+                continue
+            pending = self._in_flight[index]
+            self._logger.error('Worker process %d terminated with exit code '
+                               '%s; discarding %d pending event(s)',
+                               index, process.exitcode, pending)
+            self._in_flight[index] = 0
+            self._total_in_flight -= pending
+            self._failed_events += pending
+            # The remaining tasks cannot be delivered.
+            self._tasks[index].cancel_join_thread()
+            if self._stopping:
+                self._generations[index] += 1
+            else:
+                self._start_worker(index)
+            self._condition.notify_all()
+
+    def _collect_results(self):
+        while True:
+            result = self._results.get()
+            if result is None:
+                break
+            (index, generation), busy, error = result
+            with self._condition:
+                # The events of replaced worker processes have already
+                # been discarded.
+                if generation != self._generations[index]:
+                    continue
+                self._in_flight[index] -= 1
+                self._total_in_flight -= 1
+                self._busy_times[index] += busy
+                self._processed_events += 1
+                if error is not None:
+                    self._failed_events += 1
+                self._condition.notify_all()
+            if error is not None:
+                self._logger.error('Handler failed in worker process %d: %s',
+                                   index, error)
+
+    def _wait(self):
+        # Must be called with self._condition held. Waits for a change
+        # of the pending events but notices terminated worker processes
+        # which never report their pending events.
+        self._condition.wait(self._WORKER_CHECK_INTERVAL)
+        self._check_workers()
+
+    def _wait_until_idle(self):
+        while self._total_in_flight:
+            self._wait()
+
+    def deactivate(self):
+        """Wait for pending events to be processed and stop the workers."""
+        with self._condition:
+            if self._stopping:
+                return
+            self._stopping = True
+            self._condition.notify_all()
+            self._wait_until_idle()
+        for tasks in self._tasks:
+            tasks.put(None)
+        for process in self._processes:
+            process.join()
+        self._results.put(None)
+        self._thread.join()
+
+    def handle(self, event):
+        """
+        Send the event to a worker process.
+
+        Args:
+            event:
+                event to dispatch
+        """
+        self._logger.debug("Processing event %s", event)
+        event.meta_data.set_deliver_time()
+
+        handlers, filters = self._snapshot()
+        for f in filters:
+            if not f.match(event):
+                return
+        if not handlers:
+            return
+
+        # Send undecoded payloads in their wire representation. Wire
+        # data may be a memoryview, e.g. into a shared memory segment,
+        # which cannot be pickled.
+        shipped = copy.copy(event)
+        data = event._data
+        wire = data.wire if isinstance(data, rsb.LazyData) else None
+        if wire is not None:
+            converter, wire_data, wire_schema = wire
+            if not isinstance(wire_data, bytes):
+                wire = (converter, bytes(wire_data), wire_schema)
+        shipped.data = None if wire is not None else event.data
+        # Pickling here lets events which cannot be sent fail before
+        # they are counted as pending.
+        payload = pickle.dumps((shipped, wire), pickle.HIGHEST_PROTOCOL)
+
+        with self._condition:
+            while self._total_in_flight >= self._max_in_flight \
+                    and not self._stopping:
+                self._wait()
+            if self._stopping:
+                return
+            in_flight = self._in_flight
+            if self._ordered:
+                index = hash(self._key(event)) % len(in_flight)
+            else:
+                index = in_flight.index(min(in_flight))
+            in_flight[index] += 1
+            self._total_in_flight += 1
+            # Queueing does not block and keeps the order in which the
+            # handlers are sent to the worker process.
+            if self._sent_handlers[index] is handlers:
+                pickled_handlers = None
+            else:
+                pickled_handlers = self._pickle_handlers(handlers)
+                self._sent_handlers[index] = handlers
+            self._tasks[index].put((pickled_handlers, payload))
+
+    def _pickle_handlers(self, handlers):
+        # Must be called with self._condition held.
+        sent, pickled = self._pickled_handlers
+        if sent is not handlers:
+            pickled = pickle.dumps(handlers, pickle.HIGHEST_PROTOCOL)
+            self._pickled_handlers = (handlers, pickled)
+        return pickled
+
+    def add_handler(self, handler, wait):
+        try:
+            pickle.dumps(handler)
+        except Exception as e:
+            raise ValueError('Handlers of {} have to be picklable, {} is not: '
+                             '{}'.format(type(self).__name__, handler, e))
+        super().add_handler(handler, wait)
+
+    def remove_handler(self, handler, wait):
+        super().remove_handler(handler, wait)
+        if wait:
+            # Pending events may still be processed by the handler.
+            with self._condition:
+                self._wait_until_idle()
 
 
 class NonQueuingParallelEventReceivingStrategy(EventReceivingStrategy):
@@ -403,6 +1294,212 @@ class NonQueuingParallelEventReceivingStrategy(EventReceivingStrategy):
             self._filters = [f for f in self._filters if f != the_filter]
 
 
+class InlineEventReceivingStrategy(_CopyOnWriteEventReceivingStrategy):
+    """
+    Dispatches events to handlers in the thread which handles them.
+
+    An :obj:`EventReceivingStrategy` that applies filters and calls handlers
+    directly in :meth:`handle`, i.e. in the receiving thread of the
+    transport or, for the inprocess transport, in the thread publishing the
+    event. Since there are no queues and no thread hand-offs, this
+    strategy has the lowest latency.
+
+    Contract for handlers: handlers must not block and should return
+    quickly. While a handler runs, the transport cannot receive further
+    events, which delays all other listeners sharing the transport
+    connection and, for the inprocess transport, the publisher. Handlers
+    are called sequentially and in order, but calls for events received by
+    different connectors may happen concurrently. Errors raised by
+    handlers are logged and do not affect other handlers. When a handler
+    is removed, a call which is already in progress may still complete
+    after :meth:`remove_handler` returned.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._logger = rsb.util.get_logger_by_class(self.__class__)
+
+    def deactivate(self):
+        pass
+
+    def handle(self, event):
+        """
+        Dispatch the event to all registered handlers in the calling thread.
+
+        Args:
+            event:
+                event to dispatch
+        """
+        event.meta_data.set_deliver_time()
+        for f in self._filters:
+            if not f.match(event):
+                return
+        for handler in self._handlers:
+            try:
+                handler(event)
+            except Exception:
+                self._logger.exception('Handler %s failed for event %s',
+                                       handler, event)
+
+
+class BatchingHandler:
+    """
+    Passes events to a handler in lists instead of one at a time.
+
+    Instances are used as handlers of receiving strategies (see
+    :meth:`rsb.Listener.add_batch_handler`). Events which passed the filters
+    of the strategy are collected and the wrapped handler is called with a
+    list of events once ``max_batch`` events have been collected or the
+    oldest collected event has waited for ``max_latency`` seconds. Calls of
+    the wrapped handler are serialized and batches contain events in the
+    order in which they were dispatched by the strategy.
+    """
+
+    def __init__(self, handler, max_batch=100, max_latency=0.1):
+        """
+        Create a new batching handler for ``handler``.
+
+        Args:
+            handler:
+                Callable with one argument, the list of events.
+            max_batch (int):
+                The maximum number of events per batch.
+            max_latency (float or None):
+                The maximum time in seconds an event waits for its batch to
+                be delivered or ``None`` to deliver only full batches.
+
+        Raises:
+            ValueError:
+                If an option has an invalid value.
+        """
+        self._logger = rsb.util.get_logger_by_class(self.__class__)
+
+        if max_batch < 1:
+            raise ValueError('Maximum batch size has to be at least 1, '
+                             'not {}'.format(max_batch))
+        if max_latency is not None and max_latency <= 0:
+            raise ValueError('Maximum latency has to be positive, not {}'
+                             .format(max_latency))
+        self._handler = handler
+        self._max_batch = max_batch
+        self._max_latency = max_latency
+
+        # Batches are moved from BATCH to READY while the lock is held
+        # and passed to the handler by one DELIVERER thread at a time
+        # without holding the lock.
+        self._batch = []
+        self._ready = collections.deque()
+        self._deadline = None
+        self._condition = threading.Condition()
+        self._deliverer = None
+        self._closed = False
+        self._thread = None
+
+    @property
+    def handler(self):
+        return self._handler
+
+    def __call__(self, event):
+        with self._condition:
+            if self._closed:
+                return
+            batch = self._batch
+            batch.append(event)
+            if len(batch) < self._max_batch:
+                if len(batch) == 1 and self._max_latency is not None:
+                    self._deadline = time.monotonic() + self._max_latency
+                    if self._thread is None:
+                        self._thread = threading.Thread(
+                            target=self._expire, name='BatchingHandler',
+                            daemon=True)
+                        self._thread.start()
+                    self._condition.notify()
+                return
+            self._take_batch()
+        self._deliver()
+
+    def _take_batch(self):
+        # Must be called with self._condition held.
+        if self._batch:
+            self._ready.append(self._batch)
+            self._batch = []
+        self._deadline = None
+
+    def _deliver(self):
+        # Pass ready batches to the handler in order. Other threads
+        # wait for the current deliverer, which also delivers their
+        # batches, so that handler calls are serialized.
+        current = threading.current_thread()
+        with self._condition:
+            if self._deliverer is current:
+                return
+            while self._deliverer is not None:
+                self._condition.wait()
+            if not self._ready:
+                return
+            self._deliverer = current
+        error = None
+        try:
+            while True:
+                with self._condition:
+                    if not self._ready:
+                        break
+                    batch = self._ready.popleft()
+                try:
+                    self._handler(batch)
+                except Exception as e:
+                    if error is None:
+                        error = e
+        finally:
+            with self._condition:
+                self._deliverer = None
+                self._condition.notify_all()
+        if error is not None:
+            raise error
+
+    def _expire(self):
+        while True:
+            with self._condition:
+                if self._closed:
+                    return
+                if self._deadline is None:
+                    self._condition.wait()
+                    continue
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+                self._take_batch()
+            try:
+                self._deliver()
+            except Exception:
+                self._logger.exception('Batch handler %s failed',
+                                       self._handler)
+
+    def close(self):
+        """Deliver the pending events, if any, and stop accepting events."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._take_batch()
+            self._condition.notify_all()
+            thread = self._thread
+        # Errors are only logged since closing is part of removing the
+        # handler or deactivating the listener.
+        try:
+            self._deliver()
+        except Exception:
+            self._logger.exception('Batch handler %s failed while closing',
+                                   self._handler)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def __str__(self):
+        return '<{} for {} at 0x{:x}>'.format(
+            type(self).__name__, self._handler, id(self))
+
+
 class EventSendingStrategy(metaclass=abc.ABCMeta):
 
     @property
@@ -422,6 +1519,36 @@ class EventSendingStrategy(metaclass=abc.ABCMeta):
     def handle(self, event):
         pass
 
+    def handle_many(self, events):
+        for event in events:
+            self.handle(event)
+
+    def submit(self, event):
+        """
+        Send ``event`` and return a future for the completion of the send.
+
+        Args:
+            event (rsb.Event):
+                The event to send.
+
+        Returns:
+            rsb.patterns.future.Future:
+                A future which provides ``event`` once it has been handed to
+                all connectors or an error if sending failed.
+        """
+        from rsb.patterns.future import Future
+        future = Future()
+        try:
+            self.handle(event)
+        except Exception as e:
+            future.set_error(str(e))
+        else:
+            future.set_result(event)
+        return future
+
+    def deactivate(self):
+        pass
+
 
 class DirectEventSendingStrategy(EventSendingStrategy):
 
@@ -442,6 +1569,293 @@ class DirectEventSendingStrategy(EventSendingStrategy):
         for connector in self._connectors:
             connector.handle(event)
 
+    def handle_many(self, events):
+        for connector in self._connectors:
+            connector.handle_many(events)
+
+
+class AsyncEventSendingStrategy(_BoundedQueue, DirectEventSendingStrategy):
+    """
+    Sends events from a background thread.
+
+    Handling an event only appends it to a bounded queue. A sender thread
+    removes all queued events (up to ``max_batch_size``) at once and hands
+    them to the connectors as a batch. The caller therefore does not pay
+    for serialization and transport I/O, at the price of a delay between
+    publishing and sending an event.
+
+    With conflation, at most one event per key (by default the scope of
+    the event) is queued: a queued event is replaced by a newer event
+    with the same key. Consumers which only care about the latest value
+    thus receive fewer events when the connectors cannot keep up instead
+    of an increasing backlog.
+    """
+
+    def __init__(self, queue_size=1000, overflow='block',
+                 max_batch_size=None, conflate=False):
+        """
+        Create a new strategy and start its sender thread.
+
+        Args:
+            queue_size (int):
+                The maximum number of events waiting to be sent.
+            overflow (str):
+                What to do when an event is handled while the queue is
+                full: ``'block'`` waits for the sender thread, whereas
+                ``'drop-oldest'`` and ``'drop-newest'`` discard the oldest
+                queued or the new event respectively.
+            max_batch_size (int or None):
+                The maximum number of events handed to the connectors at
+                once or ``None`` for no limit.
+            conflate (bool or callable):
+                ``True`` to conflate events with identical scopes or a
+                callable which returns the conflation key for a given event.
+                Events for which the callable returns ``None`` are not
+                conflated.
+
+        Raises:
+            ValueError:
+                If an option has an invalid value.
+        """
+        super().__init__()
+
+        self._logger = rsb.util.get_logger_by_class(self.__class__)
+
+        if max_batch_size is not None and max_batch_size < 1:
+            raise ValueError('Maximum batch size has to be at least 1, '
+                             'not {}'.format(max_batch_size))
+        if conflate is True:
+            conflate = self._scope_key
+        elif conflate is False or conflate is None:
+            conflate = None
+        elif not callable(conflate):
+            raise ValueError('Conflate has to be a boolean or a callable, '
+                             'not {}'.format(conflate))
+        self._max_batch_size = max_batch_size
+        self._key = conflate
+
+        # Entries are [event, enqueue time, future or None, key] lists.
+        # PENDING maps conflation keys to queued entries.
+        self._init_queue(queue_size, overflow)
+        self._pending = {}
+        self._sending = False
+
+        self._conflated_events = 0
+        self._sent_events = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+
+        self._thread = threading.Thread(target=self._send_queued,
+                                        name='AsyncEventSender',
+                                        daemon=True)
+        self._thread.start()
+
+    @property
+    def queue_depth(self):
+        """
+        Return the number of events waiting to be sent.
+
+        Returns:
+            int:
+                The current number of queued events.
+        """
+        return len(self._queue)
+
+    @property
+    def max_queue_depth(self):
+        """
+        Return the largest number of events queued at any time.
+
+        Returns:
+            int:
+                The high-water mark of the queue.
+        """
+        return self._max_queue_depth
+
+    @property
+    def dropped_events(self):
+        """
+        Return the number of events discarded by the overflow policy.
+
+        Returns:
+            int:
+                The number of dropped events.
+        """
+        return self._dropped_events
+
+    @property
+    def conflated_events(self):
+        """
+        Return the number of queued events replaced by newer ones.
+
+        Returns:
+            int:
+                The number of events which have not been sent due to
+                conflation.
+        """
+        return self._conflated_events
+
+    @property
+    def sent_events(self):
+        """
+        Return the number of events handed to the connectors.
+
+        Returns:
+            int:
+                The number of sent events.
+        """
+        return self._sent_events
+
+    @property
+    def mean_latency(self):
+        """
+        Return the mean time between queuing and sending of events.
+
+        An event counts as sent when all connectors have handled the batch
+        containing it.
+
+        Returns:
+            float:
+                The mean latency in seconds or 0 if no event has been sent.
+        """
+        with self._condition:
+            if not self._sent_events:
+                return 0.0
+            return self._total_latency / self._sent_events
+
+    @property
+    def max_latency(self):
+        """
+        Return the largest time between queuing and sending of an event.
+
+        Returns:
+            float:
+                The maximum latency in seconds.
+        """
+        return self._max_latency
+
+    def handle(self, event):
+        self._enqueue([(event, None)])
+
+    def handle_many(self, events):
+        self._enqueue([(event, None) for event in events])
+
+    def submit(self, event):
+        from rsb.patterns.future import Future
+        future = Future()
+        self._enqueue([(event, future)])
+        return future
+
+    def flush(self):
+        """Block until all queued events have been sent."""
+        with self._condition:
+            while self._queue or self._sending:
+                self._condition.wait()
+
+    def deactivate(self):
+        """Send the remaining queued events and stop the sender thread."""
+        with self._condition:
+            if self._stopping:
+                return
+            self._stopping = True
+            self._condition.notify_all()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+
+    @staticmethod
+    def _scope_key(event):
+        return event.scope
+
+    def _enqueue(self, entries):
+        now = time.monotonic()
+        dropped = []
+        replaced = []
+        with self._condition:
+            if self._stopping:
+                raise RuntimeError('Trying to send events through a '
+                                   'deactivated sending strategy')
+            for (event, future) in entries:
+                key = None if self._key is None else self._key(event)
+                if key is not None:
+                    pending = self._pending.get(key)
+                    if pending is not None:
+                        replaced.append(pending[2])
+                        pending[0:3] = (event, now, future)
+                        self._conflated_events += 1
+                        continue
+                entry = [event, now, future, key]
+                queued, oldest = self._make_room()
+                if oldest is not None:
+                    self._forget_pending(oldest)
+                    dropped.append(oldest)
+                if not queued:
+                    dropped.append(entry)
+                    continue
+                self._append(entry)
+                if key is not None:
+                    self._pending[key] = entry
+            self._condition.notify_all()
+        for (event, _, future, _) in dropped:
+            self._logger.debug('Dropping event %s due to queue overflow',
+                               event)
+            if future is not None:
+                future.set_error('Event dropped due to queue overflow')
+        for future in replaced:
+            if future is not None:
+                future.set_error('Event replaced by a newer event')
+
+    def _forget_pending(self, entry):
+        # Must be called with self._condition held.
+        key = entry[3]
+        if key is not None and self._pending.get(key) is entry:
+            del self._pending[key]
+
+    def _send_queued(self):
+        while True:
+            with self._condition:
+                self._sending = False
+                self._condition.notify_all()
+                while not self._queue and not self._stopping:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                if self._max_batch_size is None:
+                    batch = list(self._queue)
+                    self._queue.clear()
+                    self._pending.clear()
+                else:
+                    batch = [self._queue.popleft()
+                             for _ in range(min(self._max_batch_size,
+                                                len(self._queue)))]
+                    for entry in batch:
+                        self._forget_pending(entry)
+                self._sending = True
+                self._condition.notify_all()
+
+            error = None
+            try:
+                super().handle_many([entry[0] for entry in batch])
+            except Exception as e:
+                self._logger.error('Failed to send %d events: %s',
+                                   len(batch), e, exc_info=True)
+                error = e
+
+            now = time.monotonic()
+            with self._condition:
+                self._sent_events += len(batch)
+                for entry in batch:
+                    latency = now - entry[1]
+                    self._total_latency += latency
+                    if latency > self._max_latency:
+                        self._max_latency = latency
+            for (event, _, future, _) in batch:
+                if future is None:
+                    continue
+                if error is None:
+                    future.set_result(event)
+                else:
+                    future.set_error(str(error))
+
 
 class Configurator:
     """
@@ -568,6 +1982,10 @@ class InRouteConfigurator(Configurator):
         for connector in self.connectors:
             connector.set_observer_action(self._receiving_strategy.handle)
 
+    @property
+    def receiving_strategy(self):
+        return self._receiving_strategy
+
     def deactivate(self):
         super().deactivate()
 
@@ -622,3 +2040,43 @@ class OutRouteConfigurator(Configurator):
 
         self._logger.debug("Publishing event: %s", event)
         self._sending_strategy.handle(event)
+
+    def handle_many(self, events):
+        """
+        Publish all of ``events`` in order through the sending strategy.
+
+        Args:
+            events (list of Event):
+                The events to publish.
+        """
+        if not self.active:
+            raise RuntimeError("Trying to publish events on Configurator "
+                               "which is not active.")
+
+        self._logger.debug("Publishing %d events", len(events))
+        self._sending_strategy.handle_many(events)
+
+    def submit(self, event):
+        """
+        Publish ``event`` and return a future for the completion of the send.
+
+        Args:
+            event (Event):
+                The event to publish.
+
+        Returns:
+            rsb.patterns.future.Future:
+                A future which provides ``event`` once it has been sent.
+        """
+        if not self.active:
+            raise RuntimeError("Trying to publish event on Configurator "
+                               "which is not active.")
+
+        self._logger.debug("Publishing event: %s", event)
+        return self._sending_strategy.submit(event)
+
+    def deactivate(self):
+        # Send queued events before deactivating the connectors.
+        if self.active:
+            self._sending_strategy.deactivate()
+        super().deactivate()
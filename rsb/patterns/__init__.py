@@ -248,18 +248,25 @@ class LocalMethod(Method):
 
     def __init__(self, scope, config,
                  server, name, func, request_type, reply_type,
-                 allow_parallel_execution):
+                 allow_parallel_execution,
+                 max_workers=10, queue_size=1000, overflow='block'):
         super().__init__(
             scope, config, server, name, request_type, reply_type)
 
         self._allow_parallel_execution = allow_parallel_execution
+        self._max_workers = max_workers
+        self._queue_size = queue_size
+        self._overflow = overflow
         self._func = func
         self.listener  # force listener creation
 
     def make_listener(self):
         receiving_strategy = None
         if self._allow_parallel_execution:
-            receiving_strategy = FullyParallelEventReceivingStrategy()
+            receiving_strategy = FullyParallelEventReceivingStrategy(
+                max_workers=self._max_workers,
+                queue_size=self._queue_size,
+                overflow=self._overflow)
         listener = rsb.create_listener(self.scope, self.config,
                                        parent=self,
                                        receiving_strategy=receiving_strategy)
@@ -351,7 +358,8 @@ class LocalServer(Server):
         super().__init__(scope, config)
 
     def add_method(self, name, func, request_type=object, reply_type=object,
-                   allow_parallel_execution=False):
+                   allow_parallel_execution=False,
+                   max_workers=10, queue_size=1000, overflow='block'):
         """
         Add a method named ``name`` that is implemented by ``func``.
 
@@ -369,11 +377,28 @@ class LocalServer(Server):
             allow_parallel_execution(bool):
                 if set to True, the method will be called fully asynchronously
                 and even multiple calls may enter the method in parallel. Also,
-                no ordering is guaranteed anymore.
+                no ordering is guaranteed anymore. Calls are executed by a
+                bounded pool of worker threads (see
+                :obj:`rsb.eventprocessing.FullyParallelEventReceivingStrategy`).
+            max_workers (int):
+                The maximum number of calls executing in parallel if
+                ``allow_parallel_execution`` is set.
+            queue_size (int):
+                The maximum number of calls waiting for a worker if
+                ``allow_parallel_execution`` is set.
+            overflow (str):
+                What to do with requests arriving while the queue is full if
+                ``allow_parallel_execution`` is set: ``'block'``,
+                ``'drop-oldest'`` or ``'drop-newest'``.
 
         Returns:
             LocalMethod:
                 The newly created method.
+
+        Raises:
+            ValueError:
+                If ``allow_parallel_execution`` is set and one of the
+                options of the worker pool has an invalid value.
         """
         scope = self.scope.concat(rsb.Scope('/' + name))
         method = rsb.create_participant(
@@ -384,7 +409,10 @@ class LocalServer(Server):
             func=func,
             request_type=request_type,
             reply_type=reply_type,
-            allow_parallel_execution=allow_parallel_execution)
+            allow_parallel_execution=allow_parallel_execution,
+            max_workers=max_workers,
+            queue_size=queue_size,
+            overflow=overflow)
         super().add_method(method)
         return method
 
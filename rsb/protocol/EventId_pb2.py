@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: rsb/protocol/EventId.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1arsb/protocol/EventId.proto\x12\x0crsb.protocol\"5\n\x07\x45ventId\x12\x11\n\tsender_id\x18\x01 \x02(\x0c\x12\x17\n\x0fsequence_number\x18\x02 \x02(\rB\rB\x0b\x45ventIdType')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'rsb.protocol.EventId_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  DESCRIPTOR._serialized_options = b'B\013EventIdType'
+  _EVENTID._serialized_start=44
+  _EVENTID._serialized_end=97
+# @@protoc_insertion_point(module_scope)
@@ -146,6 +146,21 @@ class OutConnector(Connector):
         """
         pass
 
+    def handle_many(self, events):
+        """
+        Send all of ``events`` in order.
+
+        Connectors for which sending events in one batch is cheaper than
+        sending them individually should override this method. The default
+        implementation calls :obj:`handle` for each event.
+
+        Args:
+            events (list of Event):
+                events to send
+        """
+        for event in events:
+            self.handle(event)
+
 
 class ConverterSelectingConnector:
     """
@@ -25,24 +25,36 @@ Contains methods to convert :obj:`rsb.Event` instances to protobuf and back.
 .. codeauthor:: jwienke
 """
 
+import copy
 import itertools
 import uuid
 
 import rsb
+import rsb.filter
 from rsb.protocol.FragmentedNotification_pb2 import FragmentedNotification
 from rsb.util import time_to_unix_microseconds, unix_microseconds_to_time
 
 
-def notification_to_event(notification, wire_data, wire_schema, converter):
-    """Build an event from a notification."""
+def notification_to_event(notification, wire_data, wire_schema, converter,
+                          lazy=False):
+    """
+    Build an event from a notification.
+
+    If ``lazy`` is ``True``, the payload is not deserialized here. Instead,
+    the data of the event is a :obj:`rsb.LazyData` which deserializes
+    ``wire_data`` on first access.
+    """
     event = rsb.Event(
         rsb.EventId(uuid.UUID(bytes=notification.event_id.sender_id),
                     notification.event_id.sequence_number))
-    event.scope = rsb.Scope(notification.scope.decode('ASCII'))
+    event.scope = rsb.Scope(notification.scope)
     if notification.HasField("method"):
         event.method = notification.method.decode('ASCII')
     event.data_type = converter.data_type
-    event.data = converter.deserialize(wire_data, wire_schema)
+    if lazy:
+        event.data = rsb.LazyData.from_wire(converter, wire_data, wire_schema)
+    else:
+        event.data = converter.deserialize(wire_data, wire_schema)
 
     # Meta data
     event.meta_data.create_time = unix_microseconds_to_time(
@@ -67,11 +79,104 @@ def notification_to_event(notification, wire_data, wire_schema, converter):
     return event
 
 
+def copy_event(event):
+    """
+    Return a copy of ``event`` which shares the payload with ``event``.
+
+    Meta-data and causes of the copy can be modified independently of
+    ``event``. This allows delivering an event which has been decoded once
+    to multiple receivers.
+
+    Args:
+        event (rsb.Event):
+            The event to copy.
+
+    Returns:
+        rsb.Event:
+            The copied event.
+    """
+    # A shallow copy does not decode lazily decoded data.
+    result = copy.copy(event)
+    result.meta_data = copy.copy(event.meta_data)
+    result.causes = list(event.causes)
+    return result
+
+
+def notification_predicate(the_filter):
+    """
+    Translate ``the_filter`` into a predicate on raw notifications.
+
+    The returned predicate only inspects fields of the notification which
+    are available before decoding it into an event. This allows connectors
+    to discard notifications which cannot pass ``the_filter`` without
+    deserializing their payload or meta-data.
+
+    Args:
+        the_filter (rsb.filter.AbstractFilter):
+            The filter to translate.
+
+    Returns:
+        callable or None:
+            A callable which accepts a :obj:`Notification` and returns
+            ``True`` if the corresponding event would match ``the_filter``
+            or ``None`` if ``the_filter`` cannot be evaluated on
+            notifications.
+    """
+    filter_type = type(the_filter)
+    if filter_type is rsb.filter.ScopeFilter:
+        prefix = rsb.Scope.ensure_scope(the_filter.scope).to_bytes()
+
+        def predicate(notification):
+            scope = notification.scope
+            if not scope.endswith(b'/'):
+                scope += b'/'
+            return scope.startswith(prefix)
+        # Scope filters cannot be inverted.
+        return predicate
+    elif filter_type is rsb.filter.OriginFilter:
+        try:
+            sender_id = the_filter.origin.bytes
+        except AttributeError:
+            return None
+
+        def predicate(notification):
+            return notification.event_id.sender_id == sender_id
+    elif filter_type is rsb.filter.CauseFilter:
+        try:
+            sender_id = the_filter.cause.participant_id.bytes
+            sequence_number = the_filter.cause.sequence_number
+        except AttributeError:
+            return None
+
+        def predicate(notification):
+            return any(cause.sequence_number == sequence_number and
+                       cause.sender_id == sender_id
+                       for cause in notification.causes)
+    elif filter_type is rsb.filter.MethodFilter:
+        if the_filter.method is None:
+            def predicate(notification):
+                return not notification.HasField('method')
+        else:
+            method = the_filter.method.encode('ASCII')
+
+            def predicate(notification):
+                return notification.HasField('method') and \
+                    notification.method == method
+    else:
+        return None
+
+    if the_filter.invert:
+        return lambda notification: not predicate(notification)
+    return predicate
+
+
 def event_to_notification(
         notification, event, wire_schema, data, meta_data=True):
     # Identification information
-    notification.event_id.sender_id = event.event_id.participant_id.bytes
-    notification.event_id.sequence_number = event.event_id.sequence_number
+    event_id = event.event_id
+    notification_id = notification.event_id
+    notification_id.sender_id = event_id.participant_id.bytes
+    notification_id.sequence_number = event_id.sequence_number
 
     # Payload [fragment]
     notification.data = data
@@ -83,17 +188,24 @@ def event_to_notification(
             notification.method = event.method.encode('ASCII')
         notification.wire_schema = wire_schema.encode('ASCII')
 
+        event_meta_data = event.meta_data
         md = notification.meta_data
-        md.create_time = time_to_unix_microseconds(event.meta_data.create_time)
-        md.send_time = time_to_unix_microseconds(event.meta_data.send_time)
-        for (k, v) in list(event.meta_data.user_infos.items()):
-            info = md.user_infos.add()
-            info.key = k.encode('ASCII')
-            info.value = v.encode('ASCII')
-        for (k, v) in list(event.meta_data.user_times.items()):
-            time = md.user_times.add()
-            time.key = k.encode('ASCII')
-            time.timestamp = time_to_unix_microseconds(v)
+        md.create_time = time_to_unix_microseconds(
+            event_meta_data.create_time)
+        md.send_time = time_to_unix_microseconds(event_meta_data.send_time)
+        # Do not create the (usually unused) user dictionaries.
+        user_infos = event_meta_data._user_infos
+        if user_infos:
+            for (k, v) in list(user_infos.items()):
+                info = md.user_infos.add()
+                info.key = k.encode('ASCII')
+                info.value = v.encode('ASCII')
+        user_times = event_meta_data._user_times
+        if user_times:
+            for (k, v) in list(user_times.items()):
+                time = md.user_times.add()
+                time.key = k.encode('ASCII')
+                time.timestamp = time_to_unix_microseconds(v)
         # Add causes
         for cause in event.causes:
             cause_id = notification.causes.add()
@@ -148,3 +260,62 @@ def event_and_wire_data_to_notifications(event, wire_data, wire_schema,
             fragment.num_data_parts = len(fragments)
 
     return fragments
+
+
+def notification_to_fragments(notification, max_fragment_size):
+    """
+    Split a notification into fragments of a maximum size.
+
+    The first fragment contains all fields of ``notification``, subsequent
+    fragments only the event id and their part of the data.
+
+    Args:
+        notification (Notification):
+            The notification to split.
+        max_fragment_size (int):
+            The maximum size of each serialized fragment in bytes.
+
+    Returns:
+        list of FragmentedNotification:
+            The fragments in order.
+    """
+    data = notification.data
+    remaining, offset, fragments = len(data), 0, []
+    for i in itertools.count():
+        fragment = FragmentedNotification()
+        fragment.num_data_parts = 1
+        fragment.data_part = i
+        fragments.append(fragment)
+
+        # Copy everything but the data, which would be copied in its
+        # entirety otherwise.
+        part = fragment.notification
+        part.event_id.CopyFrom(notification.event_id)
+        if i == 0:
+            for field in ('scope', 'method', 'wire_schema'):
+                if notification.HasField(field):
+                    setattr(part, field, getattr(notification, field))
+            part.causes.extend(notification.causes)
+            if notification.HasField('meta_data'):
+                part.meta_data.CopyFrom(notification.meta_data)
+
+        # Reserve room for the headers of the data field and the nested
+        # notification and for the final number of parts.
+        room = max_fragment_size - fragment.ByteSize() - 16
+        if room < 1:
+            raise ValueError('The notification cannot be fragmented because '
+                             'its meta-data would not fit into a single '
+                             'fragment')
+        fragment_size = min(room, remaining)
+        part.data = data[offset:offset + fragment_size]
+        offset += fragment_size
+        remaining -= fragment_size
+
+        if remaining == 0:
+            break
+
+    if len(fragments) > 1:
+        for fragment in fragments:
+            fragment.num_data_parts = len(fragments)
+
+    return fragments
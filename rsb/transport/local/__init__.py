@@ -31,7 +31,8 @@ import os
 import platform
 from threading import RLock
 
-from rsb import transport
+from rsb import filter as rsb_filter, transport
+from rsb.eventprocessing import ScopeTrie
 
 
 class Bus:
@@ -43,7 +44,7 @@ class Bus:
 
     def __init__(self):
         self._mutex = RLock()
-        self._sinks_by_scope = {}
+        self._sinks = ScopeTrie()
 
     def add_sink(self, sink):
         """
@@ -54,10 +55,7 @@ class Bus:
                 the sink to add
         """
         with self._mutex:
-            # ensure that there is a list of sinks for the given scope
-            if sink.scope not in self._sinks_by_scope:
-                self._sinks_by_scope[sink.scope] = []
-            self._sinks_by_scope[sink.scope].append(sink)
+            self._sinks.add(sink.scope, sink)
 
     def remove_sink(self, sink):
         """
@@ -68,10 +66,10 @@ class Bus:
                 sink to remove
         """
         with self._mutex:
-            # return immediately if there is no such scope known for sinks
-            if sink.scope not in self._sinks_by_scope:
-                return
-            self._sinks_by_scope[sink.scope].remove(sink)
+            try:
+                self._sinks.remove(sink.scope, sink)
+            except ValueError:
+                pass
 
     def handle(self, event):
         """
@@ -83,12 +81,9 @@ class Bus:
         """
 
         with self._mutex:
-
-            for scope, sink_list in list(self._sinks_by_scope.items()):
-                if scope == event.scope or scope.is_super_scope_of(
-                        event.scope):
-                    for sink in sink_list:
-                        sink.handle(event)
+            # Sinks may add or remove sinks while handling the event.
+            for sink in list(self._sinks.matching(event.scope)):
+                sink.handle(event)
 
     def get_transport_url(self):
         hostname = platform.node().split('.')[0]
@@ -132,17 +127,35 @@ class InConnector(transport.InConnector):
     """
     InConnector for the local transport.
 
+    Pushed-down scope, origin, cause and method filters are applied
+    before events are passed to the observer action such that
+    non-matching events are not queued by the receiving strategy.
+
     .. codeauthor:: jwienke
     """
 
+    PUSHDOWN_FILTER_TYPES = (rsb_filter.ScopeFilter,
+                             rsb_filter.OriginFilter,
+                             rsb_filter.CauseFilter,
+                             rsb_filter.MethodFilter)
+
     def __init__(
             self, bus=global_bus, converters=None, options=None, **kwargs):
         super().__init__(wire_type=object, **kwargs)
         self._bus = bus
         self._observer_action = None
+        self._filters = ()
+        self._filters_lock = RLock()
 
     def filter_notify(self, filter_, action):
-        pass
+        if type(filter_) not in self.PUSHDOWN_FILTER_TYPES:
+            return
+        with self._filters_lock:
+            if action == rsb_filter.FilterAction.ADD:
+                self._filters = self._filters + (filter_,)
+            elif action == rsb_filter.FilterAction.REMOVE:
+                self._filters = tuple(f for f in self._filters
+                                      if f is not filter_)
 
     def set_observer_action(self, action):
         self._observer_action = action
@@ -158,6 +171,9 @@ class InConnector(transport.InConnector):
         pass
 
     def handle(self, event):
+        for filter_ in self._filters:
+            if not filter_.match(event):
+                return
         # get reference which will survive parallel changes to the action
         event.meta_data.set_receive_time()
         action = self._observer_action
@@ -0,0 +1,540 @@
+# ============================================================
+#
+# Copyright (C) 2018 Jan Moringen
+#
+# This file may be licensed under the terms of the
+# GNU Lesser General Public License Version 3 (the ``LGPL''),
+# or (at your option) any later version.
+#
+# Software distributed under the License is distributed
+# on an ``AS IS'' basis, WITHOUT WARRANTY OF ANY KIND, either
+# express or implied. See the LGPL for the specific language
+# governing rights and limitations.
+#
+# You should have received a copy of the LGPL along with this
+# program. If not, go to http://www.gnu.org/licenses/lgpl.html
+# or write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ============================================================
+
+"""
+Contains a transport which passes event payloads through shared memory.
+
+The transport is intended for large payloads exchanged between processes
+on one host. Each out-direction connector owns a segment, a file in
+``/dev/shm`` (or the ``directory`` option) which is memory-mapped and
+used as a ring buffer of slots. Payloads are copied into a slot once and
+only a small descriptor of the slot is sent over a socket transport bus
+(see :obj:`rsb.transport.socket`) which acts as the control channel.
+Receivers map the segment and obtain a read-only :obj:`memoryview` of
+the slot as wire data.
+
+Slots are reference-counted: a receiver pins the slot of each event it
+dispatches and releases it when the event is garbage-collected. The
+owner of the segment reclaims slots in ring order once they are
+unpinned and older than the ``retention`` time. Descriptors which arrive
+after their slot has been reclaimed are detected and the events are
+dropped. Small payloads and payloads which do not fit into the ring are
+sent inline.
+
+Options (in addition to the options of the socket transport which
+configure the control channel, for which the default port is 55556):
+
+``segmentsize``
+    Size of the segment of each out-direction connector in bytes.
+``retention``
+    Minimum time in milliseconds for which unpinned slots are kept.
+``inlinesize``
+    Payloads smaller than this many bytes are sent inline.
+``directory``
+    Directory in which segments are created.
+"""
+
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+import uuid
+import weakref
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from rsb.protocol.Notification_pb2 import Notification
+import rsb.transport
+import rsb.transport.conversion as conversion
+import rsb.transport.socket
+import rsb.util
+
+DEFAULT_PORT = 55556
+
+if os.path.isdir('/dev/shm'):
+    DEFAULT_DIRECTORY = '/dev/shm'
+else:
+    DEFAULT_DIRECTORY = tempfile.gettempdir()
+
+_SEGMENT_PREFIX = 'rsb-shm-'
+
+# The data of notifications sent over the control channel starts with a
+# tag which is followed either by the payload or by a descriptor of the
+# slot containing the payload and the name of the segment.
+_INLINE = 0
+_SHARED = 1
+_DESCRIPTOR = struct.Struct('<BQQQ')
+
+# Each slot starts with a header consisting of the reference count and
+# the generation of the slot. A generation of zero marks a free slot.
+# Headers are only accessed while holding _header_lock and a lockf lock
+# on the header. The former excludes threads of the current process
+# since lockf locks are held per process.
+_HEADER = struct.Struct('<I4xQ')
+_SLOT_ALIGNMENT = 64
+
+_header_lock = threading.Lock()
+
+
+class _LockedHeader:
+    # Context manager which locks the slot header at OFFSET.
+
+    def __init__(self, file_, offset):
+        self._file = file_
+        self._offset = offset
+
+    def __enter__(self):
+        _header_lock.acquire()
+        try:
+            fcntl.lockf(self._file, fcntl.LOCK_EX, _HEADER.size,
+                        self._offset)
+        except Exception:
+            _header_lock.release()
+            raise
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            fcntl.lockf(self._file, fcntl.LOCK_UN, _HEADER.size,
+                        self._offset)
+        finally:
+            _header_lock.release()
+
+
+class RingBuffer:
+    """
+    A shared memory segment owned by an out-direction connector.
+
+    Slots are allocated contiguously in ring order. The oldest slot is
+    reclaimed when it is not pinned by a receiver and was written at
+    least ``retention`` seconds ago.
+    """
+
+    def __init__(self, directory, size, retention):
+        """
+        Create and map a new segment.
+
+        Args:
+            directory (str):
+                The directory in which the segment file is created.
+            size (int):
+                The size of the segment in bytes.
+            retention (float):
+                Minimum number of seconds for which unpinned slots are kept.
+        """
+        if size < _SLOT_ALIGNMENT:
+            raise ValueError('Segment size must be at least {}, not {}'
+                             .format(_SLOT_ALIGNMENT, size))
+
+        self._logger = rsb.util.get_logger_by_class(self.__class__)
+
+        self._name = _SEGMENT_PREFIX + uuid.uuid4().hex
+        self._path = os.path.join(directory, self._name)
+        self._size = size - size % _SLOT_ALIGNMENT
+        self._retention = retention
+
+        descriptor = os.open(self._path, os.O_RDWR | os.O_CREAT | os.O_EXCL,
+                             0o600)
+        self._file = os.fdopen(descriptor, 'r+b')
+        try:
+            os.ftruncate(descriptor, self._size)
+            self._map = mmap.mmap(descriptor, self._size)
+        except Exception:
+            self._file.close()
+            os.unlink(self._path)
+            raise
+
+        self._lock = threading.Lock()
+        # Slots in ring order as (offset, generation, time) tuples.
+        self._slots = []
+        self._first = 0
+        self._head = 0
+        self._generation = 0
+
+    @property
+    def name(self):
+        """
+        Return the name of the segment file.
+
+        Returns:
+            str:
+                The name of the segment file within its directory.
+        """
+        return self._name
+
+    @property
+    def size(self):
+        """
+        Return the size of the segment.
+
+        Returns:
+            int:
+                The size of the segment in bytes.
+        """
+        return self._size
+
+    @property
+    def allocated_slots(self):
+        """
+        Return the number of slots which have not been reclaimed.
+
+        Returns:
+            int:
+                The number of allocated slots.
+        """
+        with self._lock:
+            return len(self._slots) - self._first
+
+    def write(self, data):
+        """
+        Copy ``data`` into a new slot.
+
+        Args:
+            data (bytes):
+                The payload.
+
+        Returns:
+            tuple or None:
+                ``(offset, length, generation)`` describing the slot or
+                ``None`` if there is not enough unpinned space.
+        """
+        length = len(data)
+        needed = _HEADER.size + length
+        needed += -needed % _SLOT_ALIGNMENT
+        with self._lock:
+            self._reclaim(time.monotonic())
+            offset = self._allocate(needed)
+            if offset is None:
+                return None
+            self._generation += 1
+            generation = self._generation
+            start = offset + _HEADER.size
+            self._map[start:start + length] = data
+            with _LockedHeader(self._file, offset):
+                _HEADER.pack_into(self._map, offset, 0, generation)
+            self._slots.append((offset, generation, time.monotonic()))
+            self._head = offset + needed
+        return offset, length, generation
+
+    def _allocate(self, needed):
+        if needed > self._size:
+            return None
+        if self._first == len(self._slots):
+            self._head = 0
+            return 0
+        tail = self._slots[self._first][0]
+        if self._head > tail:
+            if self._head + needed <= self._size:
+                return self._head
+            if needed <= tail:
+                return 0
+            return None
+        if self._head + needed <= tail:
+            return self._head
+        return None
+
+    def _reclaim(self, now):
+        while self._first < len(self._slots):
+            offset, _, time_ = self._slots[self._first]
+            if now - time_ < self._retention:
+                break
+            with _LockedHeader(self._file, offset):
+                references, _ = _HEADER.unpack_from(self._map, offset)
+                if references:
+                    break
+                _HEADER.pack_into(self._map, offset, 0, 0)
+            self._first += 1
+        # Compact the slot list occasionally instead of popping from
+        # its front.
+        if self._first > 1024 and self._first * 2 > len(self._slots):
+            del self._slots[:self._first]
+            self._first = 0
+
+    def close(self):
+        """Unmap and remove the segment."""
+        with self._lock:
+            try:
+                self._map.close()
+            except BufferError:
+                pass
+            self._file.close()
+            try:
+                os.unlink(self._path)
+            except FileNotFoundError:
+                pass
+
+
+class SegmentMap:
+    """
+    A shared memory segment mapped by a receiver.
+    """
+
+    def __init__(self, path):
+        """
+        Map the segment at ``path``.
+
+        Args:
+            path (str):
+                The path of the segment file.
+        """
+        self._file = open(path, 'r+b')
+        try:
+            # Slot headers are updated via the writable mapping whereas
+            # payloads are exposed via the read-only mapping.
+            # (memoryview.toreadonly is not available before Python 3.8.)
+            self._map = mmap.mmap(self._file.fileno(), 0)
+            self._read_only_map = mmap.mmap(self._file.fileno(), 0,
+                                            access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+    def pin(self, offset, length, generation):
+        """
+        Pin the designated slot and return a view of its payload.
+
+        Args:
+            offset (int):
+                The offset of the slot.
+            length (int):
+                The length of the payload.
+            generation (int):
+                The generation of the slot.
+
+        Returns:
+            memoryview or None:
+                A read-only view of the payload or ``None`` if the slot
+                does not exist (anymore).
+        """
+        start = offset + _HEADER.size
+        if offset % _SLOT_ALIGNMENT or start + length > len(self._map):
+            return None
+        with _LockedHeader(self._file, offset):
+            references, current = _HEADER.unpack_from(self._map, offset)
+            if current != generation:
+                return None
+            _HEADER.pack_into(self._map, offset, references + 1, generation)
+        return memoryview(self._read_only_map)[start:start + length]
+
+    def release(self, offset, generation):
+        """
+        Release a slot previously pinned via :obj:`pin`.
+
+        Args:
+            offset (int):
+                The offset of the slot.
+            generation (int):
+                The generation of the slot.
+        """
+        with _LockedHeader(self._file, offset):
+            references, current = _HEADER.unpack_from(self._map, offset)
+            if current == generation and references:
+                _HEADER.pack_into(self._map, offset, references - 1,
+                                  generation)
+
+
+def _with_default_port(options):
+    options = dict(options or {})
+    options.setdefault('port', str(DEFAULT_PORT))
+    return options
+
+
+class InConnector(rsb.transport.socket.InConnector):
+    """
+    Receives events with payloads in shared memory.
+
+    The wire data passed to converters is a read-only :obj:`memoryview`
+    of the slot. The slot is pinned until the dispatched event is
+    garbage-collected. Handlers which keep the wire data (e.g. data of
+    type :obj:`bytes` converted by :obj:`rsb.converter.BytesConverter`)
+    therefore have to keep the event as well.
+    """
+
+    def __init__(self, options=None, **kwargs):
+        options = _with_default_port(options)
+        super().__init__(options=options, **kwargs)
+
+        self._directory = options.get('directory', DEFAULT_DIRECTORY)
+        self._segments = {}
+        self._segments_lock = threading.Lock()
+
+    def _segment(self, name):
+        with self._segments_lock:
+            segment = self._segments.get(name)
+            if segment is None:
+                segment = SegmentMap(os.path.join(self._directory, name))
+                self._segments[name] = segment
+            return segment
+
+    def handle(self, notification, cache=None):
+        # Each connector pins the slot for its own event. Therefore,
+        # decoded events are not shared via CACHE.
+        if self._action is None or not self._accepts(notification):
+            return
+
+        data = memoryview(notification.data)
+        if not data:
+            self._logger.warning('Ignoring notification without data')
+            return
+        pinned = None
+        if data[0] == _INLINE:
+            wire_data = data[1:]
+        elif (data[0] == _SHARED and
+                len(data) > _DESCRIPTOR.size):
+            _, offset, length, generation = _DESCRIPTOR.unpack_from(data)
+            name = bytes(data[_DESCRIPTOR.size:]).decode('ASCII', 'replace')
+            if not name.startswith(_SEGMENT_PREFIX) or os.sep in name:
+                self._logger.warning('Ignoring invalid segment name "%s"',
+                                     name)
+                return
+            try:
+                segment = self._segment(name)
+            except OSError as e:
+                self._logger.warning('Failed to map segment "%s": %s',
+                                     name, e)
+                return
+            wire_data = segment.pin(offset, length, generation)
+            if wire_data is None:
+                self._logger.warning('Dropping event %s:%d since its slot '
+                                     'has been reclaimed', name, offset)
+                return
+            pinned = (segment, offset, generation)
+        else:
+            self._logger.warning('Ignoring notification with invalid data')
+            return
+
+        wire_schema = notification.wire_schema.decode('ASCII')
+        converter = self.get_converter_for_wire_schema(wire_schema)
+        event = conversion.notification_to_event(notification,
+                                                 wire_data=wire_data,
+                                                 wire_schema=wire_schema,
+                                                 converter=converter,
+                                                 lazy=self._lazy)
+        if pinned is not None:
+            segment, offset, generation = pinned
+            weakref.finalize(event, segment.release, offset, generation)
+        self._action(event)
+
+    def deactivate(self):
+        super().deactivate()
+        # Segments are unmapped when the last event which pins one of
+        # their slots has been garbage-collected.
+        with self._segments_lock:
+            self._segments.clear()
+
+    def get_transport_url(self):
+        return 'shm' + super().get_transport_url()[len('socket'):]
+
+
+class OutConnector(rsb.transport.socket.OutConnector):
+    """
+    Sends events with payloads in shared memory.
+    """
+
+    def __init__(self, options=None, **kwargs):
+        options = _with_default_port(options)
+        super().__init__(options=options, **kwargs)
+
+        self._directory = options.get('directory', DEFAULT_DIRECTORY)
+        self._segment_size = int(options.get('segmentsize',
+                                             str(64 * 1024 * 1024)))
+        if self._segment_size < _SLOT_ALIGNMENT:
+            raise TypeError('Segment size option has to be at least {}, '
+                            'not {}'.format(_SLOT_ALIGNMENT,
+                                            self._segment_size))
+        self._retention = int(options.get('retention', '1000')) / 1000.0
+        self._inline_size = int(options.get('inlinesize', '4096'))
+        self._ring = None
+
+    @property
+    def ring(self):
+        return self._ring
+
+    def activate(self):
+        super().activate()
+        try:
+            self._ring = RingBuffer(self._directory, self._segment_size,
+                                    self._retention)
+        except Exception:
+            super().deactivate()
+            raise
+
+    def deactivate(self):
+        super().deactivate()
+        self._ring.close()
+        self._ring = None
+
+    def _to_notification(self, event, converter):
+        wire_data, wire_schema = converter.serialize(event.data)
+
+        data = None
+        if len(wire_data) >= self._inline_size:
+            slot = self._ring.write(wire_data)
+            if slot is not None:
+                data = (_DESCRIPTOR.pack(_SHARED, *slot) +
+                        self._ring.name.encode('ASCII'))
+            else:
+                self._logger.debug('No space for %d bytes in segment; '
+                                   'sending inline', len(wire_data))
+        if data is None:
+            data = bytes((_INLINE,)) + wire_data
+
+        notification = Notification()
+        conversion.event_to_notification(notification, event,
+                                         wire_schema=wire_schema,
+                                         data=data)
+        return notification
+
+    def get_transport_url(self):
+        return 'shm' + super().get_transport_url()[len('socket'):]
+
+
+class TransportFactory(rsb.transport.TransportFactory):
+    """
+    :obj:`TransportFactory` implementation for the shared memory transport.
+    """
+
+    @property
+    def name(self):
+        return 'shm'
+
+    @property
+    def remote(self):
+        return True
+
+    def create_in_connector(self, converters, options):
+        return InConnector(converters=converters, options=options)
+
+    def create_out_connector(self, converters, options):
+        return OutConnector(converters=converters, options=options)
+
+
+def rsb_initialize():
+    # Slot headers are protected by lockf locks.
+    if fcntl is None:
+        return
+    try:
+        rsb.transport.register_transport(TransportFactory())
+    except ValueError:
+        pass
@@ -21,20 +21,357 @@
 """
 Contains a transport based on point-to-point socket connections.
 
+By default, connections use TCP. If the ``path`` option is given, local
+``AF_UNIX`` stream sockets bound to that filesystem path are used
+instead. A path starting with ``@`` denotes a name in the (Linux)
+abstract socket namespace.
+
 .. codeauthor:: jmoringe
 """
 
+import collections
 import copy
+import os
+import selectors
 import socket
+import stat
+import struct
 import threading
+import time
 
 import rsb.eventprocessing
+import rsb.filter
+from rsb.protocol.FragmentedNotification_pb2 import FragmentedNotification
 from rsb.protocol.Notification_pb2 import Notification
 import rsb.transport
 import rsb.transport.conversion as conversion
 import rsb.util
 
 
+_MSG_DONTWAIT = getattr(socket, 'MSG_DONTWAIT', 0)
+
+# Frames consist of a little-endian size header followed by the
+# serialized notification. The most significant bit of the size header
+# marks frames containing a FragmentedNotification. Such frames are only
+# sent to peers which announced the 'fragments' capability.
+_SIZE = struct.Struct('<I')
+_FRAGMENT_FLAG = 0x80000000
+_SIZE_MASK = 0x7fffffff
+
+_HAVE_SENDMSG = hasattr(socket.socket, 'sendmsg')
+
+try:
+    _IOV_MAX = os.sysconf('SC_IOV_MAX')
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = 1024
+
+# Control notifications are exchanged between bus server and bus
+# clients on a reserved scope and are neither dispatched to connectors
+# nor relayed. The handshake does not tell whether the peer knows them.
+# Bus servers which do not would dispatch and relay them like events and
+# clients which do not would deliver them to their listeners. Therefore,
+# the exchange is opt-in: a bus client created with the ``negotiate``
+# option sends HELLO with its capabilities after the handshake. The bus
+# server replies with HELLO and its own capabilities such that control
+# notifications are only ever sent to peers which announced that they
+# understand them. Clients which received the server's HELLO describe the
+# scopes of their in-direction connectors using SUBSCRIPTIONS (full list)
+# and SUBSCRIBE/UNSUBSCRIBE (changes). Subscription changes are
+# ACKNOWLEDGEd by the server once they are effective.
+_CONTROL_SCOPE = b'/__rsb/transport/socket/'
+_CONTROL_SENDER_ID = bytes(16)
+_HELLO = b'HELLO'
+_SUBSCRIPTIONS = b'SUBSCRIPTIONS'
+_SUBSCRIBE = b'SUBSCRIBE'
+_UNSUBSCRIBE = b'UNSUBSCRIBE'
+_ACKNOWLEDGE = b'ACKNOWLEDGE'
+
+_CAPABILITIES = frozenset([b'subscriptions', b'fragments'])
+
+_ACKNOWLEDGEMENT_TIMEOUT = 1.0
+
+
+def _make_control_notification(method, scopes=None, sequence_number=0,
+                               capabilities=None):
+    notification = Notification()
+    notification.event_id.sender_id = _CONTROL_SENDER_ID
+    notification.event_id.sequence_number = sequence_number
+    notification.scope = _CONTROL_SCOPE
+    notification.method = method
+    if scopes is None:
+        notification.wire_schema = b'void'
+    else:
+        notification.wire_schema = b'ascii-string'
+        notification.data = b' '.join(scopes)
+    now = rsb.util.time_to_unix_microseconds(time.time())
+    notification.meta_data.create_time = now
+    notification.meta_data.send_time = now
+    if capabilities is not None:
+        info = notification.meta_data.user_infos.add()
+        info.key = b'capabilities'
+        info.value = b' '.join(sorted(capabilities))
+    return notification
+
+
+def _control_capabilities(notification):
+    for info in notification.meta_data.user_infos:
+        if info.key == b'capabilities':
+            return frozenset(info.value.split())
+    return frozenset()
+
+
+def _notification_key(notification):
+    # Return the key by which queued copies of NOTIFICATION are
+    # conflated. Including the sender ensures that, e.g. at a relaying
+    # bus server, the latest sample of one participant never replaces a
+    # sample of another participant on the same scope.
+    return (notification.event_id.sender_id, notification.scope)
+
+
+def _senders(sender):
+    return None if sender is None else frozenset([sender])
+
+
+def _must_wait(message, waiting):
+    # Return whether MESSAGE has to stay behind queued messages of the
+    # senders in WAITING which contains None if a queued message has
+    # unknown senders.
+    if message.senders is None:
+        return bool(waiting)
+    return None in waiting or not waiting.isdisjoint(message.senders)
+
+
+def _add_senders(waiting, message):
+    if message.senders is None:
+        waiting.add(None)
+    else:
+        waiting.update(message.senders)
+
+
+def _scope_prefixes(scope):
+    # Return the serialized super-scopes of the serialized SCOPE,
+    # including SCOPE itself.
+    return [scope[:index + 1]
+            for (index, byte) in enumerate(scope) if byte == 0x2f]
+
+
+def _unix_address(path):
+    # Map a leading '@' to the abstract namespace.
+    if path.startswith('@'):
+        return '\0' + path[1:]
+    return path
+
+
+class AssemblyPool:
+    """
+    Reassembles notifications from received fragments.
+
+    Fragments of different notifications may arrive interleaved. Partial
+    notifications are discarded if they have not been completed within
+    the timeout or, oldest first, if keeping them would exceed the memory
+    limit. Timeouts are checked whenever a fragment is added.
+
+    Instances are not thread-safe.
+    """
+
+    class _Assembly:
+
+        def __init__(self, num_parts, time_):
+            self.notification = None
+            self.parts = [None] * num_parts
+            self.missing = num_parts
+            self.size = 0
+            self.time = time_
+
+    def __init__(self, max_bytes, timeout):
+        """
+        Create a new pool.
+
+        Args:
+            max_bytes (int):
+                Maximum number of payload bytes held by partial
+                notifications.
+            timeout (float):
+                Number of seconds after the first received fragment after
+                which a partial notification is discarded.
+        """
+        self._logger = rsb.util.get_logger_by_class(self.__class__)
+
+        self._max_bytes = max_bytes
+        self._timeout = timeout
+        self._assemblies = collections.OrderedDict()
+        self._size = 0
+        self._discarded_notifications = 0
+
+    @property
+    def pending_notifications(self):
+        """
+        Return the number of partially received notifications.
+
+        Returns:
+            int:
+                The number of incomplete notifications.
+        """
+        return len(self._assemblies)
+
+    @property
+    def size(self):
+        """
+        Return the number of payload bytes held by partial notifications.
+
+        Returns:
+            int:
+                The number of bytes.
+        """
+        return self._size
+
+    @property
+    def discarded_notifications(self):
+        """
+        Return the number of partial notifications which have been discarded.
+
+        Returns:
+            int:
+                Notifications discarded due to the timeout or the memory
+                limit.
+        """
+        return self._discarded_notifications
+
+    def add(self, fragment):
+        """
+        Add a fragment and return the notification if it is complete.
+
+        Args:
+            fragment (FragmentedNotification):
+                The received fragment.
+
+        Returns:
+            Notification or None:
+                The reassembled notification or ``None`` if fragments of it
+                are still missing.
+        """
+        now = time.monotonic()
+        self._discard_expired(now)
+
+        notification = fragment.notification
+        if fragment.num_data_parts == 1:
+            return notification
+
+        key = (notification.event_id.sender_id,
+               notification.event_id.sequence_number)
+        index = fragment.data_part
+        assembly = self._assemblies.get(key)
+        if assembly is None:
+            # Fragments arrive in order. Later fragments without an
+            # assembly belong to a discarded notification.
+            if index != 0:
+                return None
+            assembly = self._Assembly(fragment.num_data_parts, now)
+            self._assemblies[key] = assembly
+
+        if (index >= len(assembly.parts) or
+                assembly.parts[index] is not None):
+            self._logger.warning('Ignoring invalid or duplicate fragment %d '
+                                 'of %d', index, fragment.num_data_parts)
+            return None
+        if index == 0:
+            assembly.notification = notification
+        assembly.parts[index] = notification.data
+        assembly.missing -= 1
+        assembly.size += len(notification.data)
+        self._size += len(notification.data)
+
+        if not assembly.missing:
+            del self._assemblies[key]
+            self._size -= assembly.size
+            result = assembly.notification
+            result.data = b''.join(assembly.parts)
+            return result
+
+        self._discard_oldest(self._max_bytes)
+        return None
+
+    def _discard_expired(self, now):
+        while self._assemblies:
+            key, assembly = next(iter(self._assemblies.items()))
+            if now - assembly.time < self._timeout:
+                break
+            self._logger.warning('Discarding partial notification %s after '
+                                 'timeout', key)
+            self._discard(key)
+
+    def _discard_oldest(self, max_bytes):
+        while self._size > max_bytes:
+            key = next(iter(self._assemblies))
+            self._logger.warning('Discarding partial notification %s due to '
+                                 'memory limit', key)
+            self._discard(key)
+
+    def _discard(self, key):
+        assembly = self._assemblies.pop(key)
+        self._size -= assembly.size
+        self._discarded_notifications += 1
+
+
+class _QueuedMessage:
+    # A notification in the send queue of a BusConnection. It consists
+    # of one or more frames of which the first INDEX have been sent. A
+    # single frame can also contain COUNT complete notifications which
+    # have been joined into one buffer. Unless KEY is None, the message
+    # is replaced by a newer one with the same key if the connection
+    # conflates notifications. SENDERS is the set of senders of the
+    # contained notifications or None if unknown.
+
+    def __init__(self, frames, count=1, key=None, senders=None):
+        self.frames = frames
+        self.count = count
+        self.key = key
+        self.senders = senders
+        self.index = 0
+        self.size = sum(len(payload) for (_, payload) in frames)
+
+
+class _Encoding:
+    # Encodings of a single outgoing notification which are shared
+    # between the connections through which it is sent: the serialized
+    # notification and, per maximum fragment size, the serialized
+    # fragments.
+
+    __slots__ = ('notification', 'serialized', 'size', 'fragments')
+
+    def __init__(self, notification, serialized=None):
+        self.notification = notification
+        self.serialized = serialized
+        self.size = None
+        self.fragments = None
+
+    def for_connection(self, connection):
+        # Return the serialized notification or, for connections to
+        # peers which accept fragments, a list of serialized fragments
+        # if the notification is too large.
+        max_fragment_size = connection.max_fragment_size
+        if max_fragment_size:
+            if self.size is None:
+                self.size = (len(self.serialized)
+                             if self.serialized is not None
+                             else self.notification.ByteSize())
+            if self.size > max_fragment_size:
+                if self.fragments is None:
+                    self.fragments = {}
+                fragments = self.fragments.get(max_fragment_size)
+                if fragments is None:
+                    fragments = [
+                        fragment.SerializeToString()
+                        for fragment in conversion.notification_to_fragments(
+                            self.notification, max_fragment_size)]
+                    self.fragments[max_fragment_size] = fragments
+                return fragments
+        if self.serialized is None:
+            self.serialized = BusConnection.notification_to_buffer(
+                self.notification)
+        return self.serialized
+
+
 class BusConnection(rsb.eventprocessing.BroadcastProcessor):
     """
     Implements a connection to a socket-based bus.
@@ -43,6 +380,45 @@ class BusConnection(rsb.eventprocessing.BroadcastProcessor):
     calling :obj:`receive_notification` and submitting an event to the bus by
     calling :obj:`send_notification`.
 
+    Received notifications are dispatched to the handlers of this object
+    as tuples of the parsed notification and the serialized buffer it was
+    parsed from. The buffer can be relayed to other connections without
+    serializing the notification again. It is a view into the receive
+    buffer of the connection and only valid during the dispatch.
+
+    Data is received in large chunks into a reusable buffer from which
+    all complete notifications are dispatched, such that a single system
+    call usually suffices for many small notifications.
+
+    Outgoing notifications are put into a bounded send queue which is
+    drained by a writer thread of the connection or, for connections
+    served by a :obj:`SelectorLoop`, by the I/O thread of the loop whenever
+    the socket is writable. Senders, and in particular the :obj:`Bus` which
+    holds its lock while sending, therefore do not wait for the peer unless
+    the queue is full. What happens in that case is determined by the
+    overflow policy:
+
+    ``'block'``
+        Wait until the writer has made room in the queue. Senders running
+        in the I/O thread of the loop write the queued notifications
+        themselves instead.
+    ``'drop-oldest'``
+        Discard the oldest queued notification.
+    ``'drop-newest'``
+        Discard the notification that should be sent.
+    ``'disconnect'``
+        Discard all queued notifications and close the connection.
+
+    Optionally, the send queue conflates notifications: a queued
+    notification which has not been written yet is replaced by a newer
+    notification with the same key (usually its sender and scope) such
+    that a slow peer receives fewer, but current notifications instead of
+    a growing backlog.
+
+    When the connection is shut down, queued notifications are written for
+    at most ``drain_timeout`` seconds. Notifications which could not be
+    written by then, e.g. because the peer does not read, are discarded.
+
     In a process which act as a client for a particular bus, a single
     instance of this class is connected to the bus server and provides
     access to the bus for the process.
@@ -59,9 +435,17 @@ class BusConnection(rsb.eventprocessing.BroadcastProcessor):
 
     """
 
+    _RECEIVE_BUFFER_SIZE = 65536
+
+    OVERFLOW_POLICIES = ('block', 'drop-oldest', 'drop-newest', 'disconnect')
+
     def __init__(self,
-                 host=None, port=None, socket_=None,
-                 is_server=False, tcpnodelay=True):
+                 host=None, port=None, socket_=None, path=None,
+                 is_server=False, tcpnodelay=True, loop=None,
+                 send_queue_size=1000, overflow='block',
+                 coalesce_window=0.0, coalesce_bytes=65536,
+                 max_fragment_size=0, assembly_memory=256 * 1024 * 1024,
+                 assembly_timeout=10.0, conflate=False, drain_timeout=5.0):
         """
         Create a new instance.
 
@@ -73,31 +457,132 @@ class BusConnection(rsb.eventprocessing.BroadcastProcessor):
             socket_:
                 A socket object through which the new connection should access
                 the bus.
+            path (str or None):
+                Path of the ``AF_UNIX`` socket of the bus server. A leading
+                ``@`` denotes the abstract namespace.
             is_server (bool):
                 if True, the created object will perform the server part of the
                 handshake protocol.
             tcpnodelay (bool):
-                If True, the socket will be set to TCP_NODELAY.
+                If True, the socket will be set to TCP_NODELAY. Ignored for
+                ``AF_UNIX`` sockets.
+            loop (SelectorLoop or None):
+                If not ``None``, notifications are received by ``loop``
+                instead of a dedicated receiver thread.
+            send_queue_size (int):
+                Maximum number of notifications in the send queue. If zero,
+                notifications are written by the sending thread.
+            overflow (str):
+                Policy for a full send queue, one of
+                :obj:`OVERFLOW_POLICIES`.
+            coalesce_window (float):
+                If positive, the writer waits for at most this many seconds
+                after the first queued notification and writes it together
+                with notifications sent within that time. Requires a send
+                queue. Ignored if ``loop`` is not ``None`` since the loop
+                writes all notifications queued while the socket was not
+                writable together anyway.
+            coalesce_bytes (int):
+                When coalescing, queued notifications are written as soon as
+                they amount to at least this many bytes.
+            max_fragment_size (int):
+                If positive and the peer supports fragments, notifications
+                which are larger than this many bytes are sent as multiple
+                fragments. See :obj:`Bus`.
+            assembly_memory (int):
+                Maximum number of bytes held by partially received
+                fragmented notifications. See :obj:`AssemblyPool`.
+            assembly_timeout (float):
+                Number of seconds after which partially received fragmented
+                notifications are discarded.
+            conflate (bool):
+                If True, queued notifications are replaced by newer
+                notifications with the same key. Requires a send queue.
+            drain_timeout (float):
+                Maximum number of seconds :obj:`shutdown` waits for queued
+                notifications to be written.
 
         See Also:
             :obj:`get_bus_client_for`, :obj:`get_bus_server_for`.
         """
         super().__init__()
 
+        # Assigned before validating the options since __del__ uses them.
+        self._active = False
+        self._active_shutdown = False
+
+        if send_queue_size < 0:
+            raise ValueError('Send queue size must not be negative, not {}'
+                             .format(send_queue_size))
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError('Overflow policy has to be one of {}, not "{}"'
+                             .format(', '.join(self.OVERFLOW_POLICIES),
+                                     overflow))
+        if coalesce_window and not send_queue_size:
+            raise ValueError('Coalescing requires a send queue')
+        if conflate and not send_queue_size:
+            raise ValueError('Conflation requires a send queue')
+        if max_fragment_size < 0:
+            raise ValueError('Maximum fragment size must not be negative, '
+                             'not {}'.format(max_fragment_size))
+        if drain_timeout < 0:
+            raise ValueError('Drain timeout must not be negative, not {}'
+                             .format(drain_timeout))
+
         self._logger = rsb.util.get_logger_by_class(self.__class__)
 
         self._thread = None
+        self._loop = loop
+        self._receive_buffer = bytearray(self._RECEIVE_BUFFER_SIZE)
+        self._receive_start = 0
+        self._receive_end = 0
+        self._receive_finished = threading.Event()
+        self._assembly_pool = AssemblyPool(assembly_memory, assembly_timeout)
         self._socket = None
+        self._max_fragment_size = max_fragment_size
+        self._peer_capabilities = frozenset()
+
+        self._send_queue_size = send_queue_size
+        self._overflow = overflow
+        self._coalesce_window = coalesce_window
+        self._coalesce_bytes = coalesce_bytes
+        self._queue = collections.deque()
+        self._queue_bytes = 0
+        self._queue_condition = threading.Condition()
+        self._writer = None
+        # Without a writer thread, the loop writes the queued
+        # notifications. Frames taken from the queue which could not be
+        # written without blocking are kept in _unsent.
+        self._loop_writes = loop is not None and send_queue_size > 0
+        self._unsent = []
+        self._write_requested = False
+        self._drain_timeout = drain_timeout
+        self._writer_stopping = False
+        self._writing = False
+        self._closed = False
+        self._max_queue_depth = 0
+        self._dropped_notifications = 0
+        self._conflate = conflate
+        # Maps keys to queued messages which have not been started.
+        self._pending = {}
+        self._conflated_notifications = 0
 
         self._disconnect_hook = None
 
-        self._active = False
-        self._active_shutdown = False
-
         self._lock = threading.RLock()
 
         # Create a socket connection or store the provided connection.
-        if host is not None and port is not None:
+        if path is not None:
+            if socket_ is not None or host is not None or port is not None:
+                raise ValueError(
+                    'Specify either path, host and port or socket_')
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                self._socket.connect(_unix_address(path))
+            except Exception:
+                self._socket.close()
+                raise
+        elif host is not None and port is not None:
             if socket_ is None:
                 self._socket = socket.create_connection((host, port))
             else:
@@ -106,10 +591,9 @@ class BusConnection(rsb.eventprocessing.BroadcastProcessor):
             self._socket = socket_
         else:
             raise ValueError('Specify either host and port or socket_')
-        if tcpnodelay:
-            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
-        else:
-            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 0)
+        if self._socket.family in (socket.AF_INET, socket.AF_INET6):
+            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY,
+                                    1 if tcpnodelay else 0)
 
         # Perform the client or server part of the handshake.
         if is_server:
@@ -120,9 +604,49 @@ class BusConnection(rsb.eventprocessing.BroadcastProcessor):
                 raise RuntimeError('Incorrect handshake')
 
     def __del__(self):
-        if self._active:
+        if getattr(self, '_active', False):
             self.deactivate()
 
+    @property
+    def peer_capabilities(self):
+        """
+        Return the capabilities announced by the peer of this connection.
+
+        Returns:
+            frozenset of bytes:
+                The capabilities, empty for peers which did not announce any.
+        """
+        return self._peer_capabilities
+
+    @peer_capabilities.setter
+    def peer_capabilities(self, capabilities):
+        self._peer_capabilities = frozenset(capabilities)
+
+    @property
+    def max_fragment_size(self):
+        """
+        Return the size above which notifications are sent as fragments.
+
+        Returns:
+            int:
+                The maximum fragment size or 0 if notifications are not sent
+                as fragments via this connection.
+        """
+        if b'fragments' not in self._peer_capabilities:
+            return 0
+        return self._max_fragment_size
+
+    @property
+    def assembly_pool(self):
+        """
+        Return the pool reassembling fragments received by this connection.
+
+        Returns:
+            AssemblyPool:
+                The assembly pool.
+        """
+        return self._assembly_pool
+
     @property
     def disconnect_hook(self):
         return self._disconnect_hook
@@ -134,20 +658,90 @@ class BusConnection(rsb.eventprocessing.BroadcastProcessor):
     # receiving
 
     def receive_notification(self):
-        size = self._socket.recv(4)
-        if len(size) == 0:
+        """
+        Receive the next frame, blocking until it is complete.
+
+        Returns:
+            tuple:
+                A memoryview of the serialized notification or fragment and
+                a flag indicating whether the frame contains a fragment. The
+                view refers to the receive buffer of this connection and is
+                only valid until the next receive operation.
+        """
+        frame = self._next_frame()
+        while frame is None:
+            self._fill_receive_buffer()
+            frame = self._next_frame()
+        return frame
+
+    def _fill_receive_buffer(self, flags=0):
+        # Make room for at least the incomplete frame at the start of
+        # the buffer. Only in this case bytes are moved or copied.
+        buffer = self._receive_buffer
+        start, end = self._receive_start, self._receive_end
+        pending = end - start
+        required = self._RECEIVE_BUFFER_SIZE
+        if pending >= 4:
+            required = max(
+                required,
+                4 + (_SIZE.unpack_from(buffer, start)[0] & _SIZE_MASK))
+        if start + required > len(buffer):
+            if required > len(buffer):
+                # A new buffer is allocated instead of resizing the old one
+                # since views into it may still exist.
+                grown = bytearray(required)
+                grown[:pending] = buffer[start:end]
+                self._receive_buffer = buffer = grown
+            else:
+                buffer[:pending] = buffer[start:end]
+            self._receive_start, self._receive_end = 0, pending
+            end = pending
+
+        received = self._socket.recv_into(
+            memoryview(buffer)[end:], 0, flags)
+        if received == 0:
             self._logger.info("Received EOF")
             raise EOFError()
-        if not (len(size) == 4):
-            raise RuntimeError('Short read when receiving notification size '
-                               '(size: {})'.format(len(size)))
-        size = size[0] | size[1] << 8 | size[2] << 16 | size[3] << 24
-        self._logger.debug('Receiving notification of size %d', size)
-        notification = self._socket.recv(size, socket.MSG_WAITALL)
-        if not (len(notification) == size):
-            raise RuntimeError(
-                'Short read when receiving notification payload')
-        return notification
+        self._receive_end = end + received
+
+    def _next_frame(self):
+        start = self._receive_start
+        available = self._receive_end - start
+        if available < 4:
+            return None
+        header = _SIZE.unpack_from(self._receive_buffer, start)[0]
+        size = header & _SIZE_MASK
+        if available < 4 + size:
+            return None
+        self._receive_start = start + 4 + size
+        self._logger.debug('Received frame of size %d', size)
+        return (memoryview(self._receive_buffer)[start + 4:start + 4 + size],
+                bool(header & _FRAGMENT_FLAG))
+
+    def _dispatch_frame(self, frame, is_fragment):
+        # Dispatch the notification contained in FRAME or completed by
+        # the fragment contained in FRAME. Return True if a notification
+        # has been dispatched.
+        if not is_fragment:
+            self.dispatch((self.buffer_to_notification(frame), frame))
+            return True
+
+        fragment = FragmentedNotification()
+        fragment.ParseFromString(frame)
+        notification = self._assembly_pool.add(fragment)
+        if notification is None:
+            return False
+        # There is no serialized buffer for reassembled notifications.
+        self.dispatch((notification, None))
+        return True
+
+    def _dispatch_received(self):
+        frame = self._next_frame()
+        while frame is not None:
+            self._dispatch_frame(*frame)
+            frame = self._next_frame()
+        if self._receive_start == self._receive_end:
+            self._receive_start = self._receive_end = 0
 
     @staticmethod
     def buffer_to_notification(serialized):
@@ -156,41 +750,535 @@ class BusConnection(rsb.eventprocessing.BroadcastProcessor):
         return notification
 
     def do_one_notification(self):
-        serialized = self.receive_notification()
-        notification = self.buffer_to_notification(serialized)
-        self.dispatch(notification)
+        while not self._dispatch_frame(*self.receive_notification()):
+            pass
 
     def receive_notifications(self):
         while True:
             self._logger.debug('Receiving notifications')
             try:
-                self.do_one_notification()
+                self._fill_receive_buffer()
+                self._dispatch_received()
             except EOFError:
-                self._logger.info("Received EOF while reading")
-                if not self._active_shutdown:
-                    self.shutdown()
+                self._handle_eof()
                 break
             except Exception as e:
                 self._logger.warn('Receive error: %s', e, exc_info=True)
                 break
 
+        self._finish_receiving()
+
+    def receive_available(self):
+        """
+        Receive and dispatch notifications without blocking.
+
+        Called by a :obj:`SelectorLoop` when the socket of this connection
+        is readable. Reads the available data, dispatches all notifications
+        completed by it and keeps incomplete data for the next call.
+        """
+        try:
+            self._fill_receive_buffer(_MSG_DONTWAIT)
+            self._dispatch_received()
+        except (BlockingIOError, InterruptedError):
+            pass
+        except EOFError:
+            self._handle_eof()
+            self._finish_receiving()
+        except Exception as e:
+            self._logger.warning('Receive error: %s', e, exc_info=True)
+            self._finish_receiving()
+
+    def _handle_eof(self):
+        self._logger.info("Received EOF while reading")
+        if not self._active_shutdown:
+            try:
+                self.shutdown()
+            except Exception as e:
+                self._logger.warning('Failed to shutdown socket: %s', e,
+                                     exc_info=True)
+
+    def _finish_receiving(self):
+        if self._loop is not None:
+            self._loop.remove(self._socket)
+
         if self.disconnect_hook is not None:
             self.disconnect_hook()
 
-        return
+        self._receive_finished.set()
 
     # sending
 
-    def send_notification(self, notification):
+    @property
+    def queue_depth(self):
+        """
+        Return the number of notifications in the send queue.
+
+        Returns:
+            int:
+                The current number of queued notifications.
+        """
+        return len(self._queue)
+
+    @property
+    def max_queue_depth(self):
+        """
+        Return the largest number of notifications queued at any time.
+
+        Returns:
+            int:
+                The high-water mark of the send queue.
+        """
+        return self._max_queue_depth
+
+    @property
+    def dropped_notifications(self):
+        """
+        Return the number of notifications discarded without being sent.
+
+        Returns:
+            int:
+                Notifications dropped by the overflow policy or because the
+                connection has been closed.
+        """
+        return self._dropped_notifications
+
+    @property
+    def conflated_notifications(self):
+        """
+        Return the number of queued notifications replaced by newer ones.
+
+        Returns:
+            int:
+                Notifications which have not been sent because a newer
+                notification with the same key has been queued.
+        """
+        return self._conflated_notifications
+
+    def send_notification(self, notification, key=None, sender=None):
+        """
+        Send a single serialized notification.
+
+        Size header and payload are written with a single gather-write.
+        With a send queue, ``notification`` is only queued and has to remain
+        unchanged until the writer has sent it.
+
+        Args:
+            notification (bytes-like):
+                The serialized notification.
+            key (hashable or None):
+                If the connection conflates notifications, a queued
+                notification with this key is replaced by ``notification``.
+            sender (bytes or None):
+                The id of the participant which sent ``notification``. See
+                :obj:`send_fragments`.
+        """
         size = len(notification)
-        self._logger.info('Sending notification of size %d', size)
-        size = bytes([size & 0x000000ff,
-                      (size & 0x0000ff00) >> 8,
-                      (size & 0x00ff0000) >> 16,
-                      (size & 0xff000000) >> 24])
-        with self._lock:
-            self._socket.send(size)
-            self._socket.send(notification)
+        self._logger.debug('Sending notification of size %d', size)
+        self._send_messages([_QueuedMessage([(_SIZE.pack(size),
+                                              notification)],
+                                            key=self._conflation_key(key),
+                                            senders=_senders(sender))])
+
+    def send_notifications(self, notifications):
+        """
+        Send multiple serialized notifications with as few writes as possible.
+
+        Args:
+            notifications (list of bytes-like):
+                The serialized notifications in sending order.
+        """
+        self._send_messages([
+            _QueuedMessage([(_SIZE.pack(len(notification)), notification)])
+            for notification in notifications])
+
+    def send_fragments(self, fragments, key=None, sender=None):
+        """
+        Send the serialized fragments of a single notification.
+
+        The peer has to support the ``'fragments'`` capability. With a send
+        queue, the fragments are written alternately with the frames of
+        queued notifications of other senders such that these are not
+        delayed until all fragments have been written. Notifications of the
+        same sender, and notifications with unknown sender, are written in
+        the order in which they have been sent.
+
+        Args:
+            fragments (list of bytes-like):
+                The serialized :obj:`FragmentedNotification` s.
+            key (bytes or None):
+                See :obj:`send_notification`.
+            sender (bytes or None):
+                The id of the participant which sent the notification or
+                ``None`` if unknown.
+        """
+        self._logger.debug('Sending %d fragments', len(fragments))
+        self._send_messages([_QueuedMessage(
+            [(_SIZE.pack(len(fragment) | _FRAGMENT_FLAG), fragment)
+             for fragment in fragments],
+            key=self._conflation_key(key), senders=_senders(sender))])
+
+    def send_batch(self, items, keys=None, senders=None):
+        """
+        Send serialized notifications and fragmented notifications together.
+
+        All items are written with as few writes as possible. With a send
+        queue, consecutive serialized notifications are joined into a
+        single buffer which occupies one place in the queue and is dropped
+        as a whole by the overflow policy. Notifications with conflation
+        keys are queued individually.
+
+        Args:
+            items (list):
+                In sending order, serialized notifications (bytes-like) and
+                lists of serialized fragments as accepted by
+                :obj:`send_fragments`.
+            keys (list or None):
+                Conflation keys for ``items``. See :obj:`send_notification`.
+            senders (list or None):
+                Ids of the senders of ``items``. See :obj:`send_fragments`.
+        """
+        self._logger.debug('Sending batch of %d notifications', len(items))
+        if not self._conflate:
+            keys = None
+        messages = []
+        joined = []
+        joined_senders = []
+        for (index, item) in enumerate(items):
+            key = None if keys is None else keys[index]
+            sender = None if senders is None else senders[index]
+            if isinstance(item, list) or key is not None:
+                if joined:
+                    messages.append(self._join_frames(joined,
+                                                      joined_senders))
+                    joined = []
+                    joined_senders = []
+                if isinstance(item, list):
+                    frames = [(_SIZE.pack(len(fragment) | _FRAGMENT_FLAG),
+                               fragment)
+                              for fragment in item]
+                else:
+                    frames = [(_SIZE.pack(len(item)), item)]
+                messages.append(_QueuedMessage(frames, key=key,
+                                               senders=_senders(sender)))
+            else:
+                joined.append(item)
+                joined_senders.append(sender)
+        if joined:
+            messages.append(self._join_frames(joined, joined_senders))
+        self._send_messages(messages)
+
+    def _conflation_key(self, key):
+        return key if self._conflate else None
+
+    def _join_frames(self, notifications, senders):
+        senders = None if None in senders else frozenset(senders)
+        if not self._send_queue_size or len(notifications) == 1:
+            return _QueuedMessage([(_SIZE.pack(len(notification)),
+                                    notification)
+                                   for notification in notifications],
+                                  count=len(notifications), senders=senders)
+        buffer = bytearray()
+        for notification in notifications:
+            buffer += _SIZE.pack(len(notification))
+            buffer += notification
+        return _QueuedMessage([(b'', buffer)], count=len(notifications),
+                              senders=senders)
+
+    def _send_messages(self, messages):
+        if self._send_queue_size:
+            self._enqueue(messages)
+        else:
+            with self._lock:
+                self._send_buffers([buffer
+                                    for message in messages
+                                    for frame in message.frames
+                                    for buffer in frame])
+
+    def _send_buffers(self, buffers):
+        if not _HAVE_SENDMSG:
+            self._socket.sendall(b''.join(buffers))
+            return
+
+        buffers = [memoryview(buffer).cast('B') for buffer in buffers]
+        index = 0
+        while index < len(buffers):
+            sent = self._socket.sendmsg(buffers[index:index + _IOV_MAX])
+            # Skip completely written buffers and trim a partially
+            # written one.
+            while sent:
+                length = len(buffers[index])
+                if sent >= length:
+                    sent -= length
+                    index += 1
+                else:
+                    buffers[index] = buffers[index][sent:]
+                    sent = 0
+
+    def _enqueue(self, messages):
+        disconnect = False
+        with self._queue_condition:
+            for message in messages:
+                count = message.count
+                if message.key is not None:
+                    pending = self._pending.get(message.key)
+                    if pending is not None:
+                        # Replace the queued notification which has not
+                        # been started.
+                        self._queue_bytes += message.size - pending.size
+                        pending.frames = message.frames
+                        pending.size = message.size
+                        self._conflated_notifications += pending.count
+                        continue
+                while (len(self._queue) >= self._send_queue_size and
+                       not self._closed):
+                    if self._overflow == 'block':
+                        if self._loop_writes and self._loop.in_loop_thread():
+                            # The loop cannot write while this sender
+                            # blocks it.
+                            self._write_unsent_and_queued()
+                            continue
+                        # The writer may not have been notified about
+                        # the messages queued so far.
+                        self._request_write()
+                        self._queue_condition.notify_all()
+                        self._queue_condition.wait()
+                    elif self._overflow == 'drop-oldest':
+                        # Messages which have been sent partially cannot
+                        # be dropped.
+                        oldest = next((queued for queued in self._queue
+                                       if not queued.index), None)
+                        if oldest is None:
+                            message = None
+                            break
+                        self._queue.remove(oldest)
+                        self._forget_pending(oldest)
+                        self._queue_bytes -= oldest.size
+                        self._dropped_notifications += oldest.count
+                    elif self._overflow == 'drop-newest':
+                        message = None
+                        break
+                    else:
+                        disconnect = True
+                        break
+                if self._closed or disconnect or message is None:
+                    self._dropped_notifications += count
+                else:
+                    self._queue.append(message)
+                    if message.key is not None:
+                        self._pending[message.key] = message
+                    self._queue_bytes += message.size
+                    self._max_queue_depth = max(self._max_queue_depth,
+                                                len(self._queue))
+            self._request_write()
+            self._queue_condition.notify_all()
+        if disconnect:
+            self._logger.warning('Send queue of %s overflowed; '
+                                 'disconnecting slow consumer', self)
+            self._close_sending(shutdown=True)
+
+    def _close_sending(self, shutdown):
+        # Discards queued notifications and prevents further sending.
+        # Shutting down the socket wakes a blocked writer and causes the
+        # receiving side to notice the closed connection and to run the
+        # disconnect hook.
+        with self._queue_condition:
+            self._closed = True
+            self._dropped_notifications += sum(message.count
+                                               for message in self._queue)
+            self._queue.clear()
+            self._pending.clear()
+            self._queue_bytes = 0
+            self._unsent = []
+            self._queue_condition.notify_all()
+        if shutdown:
+            try:
+                self._socket.shutdown(socket.SHUT_RDWR)
+            except Exception:
+                pass
+
+    def _take_queued(self):
+        # Must be called with self._queue_condition held.
+        if self._coalesce_window and self._writer is not None and \
+                not self._writer_stopping:
+            deadline = time.monotonic() + self._coalesce_window
+            while (self._queue_bytes < self._coalesce_bytes and
+                   not self._writer_stopping and not self._closed):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._queue_condition.wait(remaining)
+        # Take one frame of each queued message. Messages with remaining
+        # frames stay queued in their order. Fragments of different
+        # notifications are not interleaved since the receiver identifies
+        # partial notifications by their event ids which are not
+        # necessarily unique. Messages only overtake messages which stay
+        # queued if their senders are known to differ.
+        buffers = []
+        remaining = []
+        fragmenting = False
+        waiting = set()
+        for message in self._queue:
+            if _must_wait(message, waiting) or \
+                    (len(message.frames) > 1 and fragmenting):
+                remaining.append(message)
+                _add_senders(waiting, message)
+                continue
+            if len(message.frames) > 1:
+                fragmenting = True
+            if not message.index:
+                self._forget_pending(message)
+            header, payload = message.frames[message.index]
+            # Joined notifications carry their headers in the payload.
+            if header:
+                buffers.append(header)
+            buffers.append(payload)
+            self._queue_bytes -= len(payload)
+            message.index += 1
+            if message.index < len(message.frames):
+                remaining.append(message)
+                _add_senders(waiting, message)
+        self._queue.clear()
+        self._queue.extend(remaining)
+        self._queue_condition.notify_all()
+        return buffers
+
+    def _forget_pending(self, message):
+        # Must be called with self._queue_condition held.
+        if message.key is not None and \
+                self._pending.get(message.key) is message:
+            del self._pending[message.key]
+
+    def _write_queued(self):
+        # Writes everything that has been queued since the previous
+        # write with a single gather-write until the writer is stopped
+        # and the queue has been drained.
+        while True:
+            with self._queue_condition:
+                self._writing = False
+                self._queue_condition.notify_all()
+                while (not self._queue and not self._writer_stopping and
+                       not self._closed):
+                    self._queue_condition.wait()
+                if self._closed or not self._queue:
+                    return
+                buffers = self._take_queued()
+                self._writing = True
+            try:
+                self._send_buffers(buffers)
+            except Exception as e:
+                if not self._closed:
+                    self._logger.warning('Failed to send queued '
+                                         'notifications: %s; closing '
+                                         'connection', e, exc_info=True)
+                self._close_sending(shutdown=True)
+                with self._queue_condition:
+                    self._writing = False
+                    self._queue_condition.notify_all()
+                return
+
+    def _request_write(self):
+        # Must be called with self._queue_condition held. Enables the
+        # write callback of the loop if there is something to write.
+        if self._loop_writes and not self._write_requested and \
+                self._queue and not self._closed:
+            self._write_requested = True
+            self._loop.set_writing(self._socket, True)
+
+    def _send_nonblocking(self, buffers):
+        # Write as much of BUFFERS as possible without blocking and
+        # return the buffers or parts thereof which remain unwritten.
+        index = 0
+        try:
+            while index < len(buffers):
+                if _HAVE_SENDMSG:
+                    sent = self._socket.sendmsg(
+                        buffers[index:index + _IOV_MAX], [], _MSG_DONTWAIT)
+                else:
+                    sent = self._socket.send(buffers[index], _MSG_DONTWAIT)
+                while sent:
+                    length = len(buffers[index])
+                    if sent >= length:
+                        sent -= length
+                        index += 1
+                    else:
+                        buffers[index] = buffers[index][sent:]
+                        sent = 0
+        except (BlockingIOError, InterruptedError):
+            pass
+        return buffers[index:]
+
+    def write_available(self):
+        """
+        Write queued notifications without blocking.
+
+        Called by a :obj:`SelectorLoop` when the socket of this connection
+        is writable. Frames which cannot be written without blocking are
+        kept for the next call. Writing is disabled once the queue has been
+        drained.
+        """
+        with self._queue_condition:
+            if self._closed:
+                return
+            if not self._unsent:
+                if not self._queue:
+                    self._write_requested = False
+                    self._loop.set_writing(self._socket, False)
+                    self._writing = False
+                    self._queue_condition.notify_all()
+                    return
+                self._unsent = [memoryview(buffer).cast('B')
+                                for buffer in self._take_queued()]
+            self._writing = True
+            unsent = self._unsent
+        try:
+            unsent = self._send_nonblocking(unsent)
+        except Exception as e:
+            if not self._closed:
+                self._logger.warning('Failed to send queued notifications: '
+                                     '%s; closing connection', e,
+                                     exc_info=True)
+            self._close_sending(shutdown=True)
+            with self._queue_condition:
+                self._writing = False
+                self._queue_condition.notify_all()
+            return
+        with self._queue_condition:
+            if not self._closed:
+                self._unsent = unsent
+            self._writing = bool(unsent)
+            self._queue_condition.notify_all()
+
+    def _write_unsent_and_queued(self):
+        # Must be called with self._queue_condition held. Writes the
+        # unsent frames and the queue, blocking if necessary. Used
+        # instead of waiting for the loop in its own thread.
+        buffers = self._unsent
+        self._unsent = []
+        while self._queue:
+            buffers.extend(self._take_queued())
+        if buffers:
+            with self._lock:
+                self._send_buffers(buffers)
+
+    def flush(self):
+        """Block until all queued notifications have been written."""
+        with self._queue_condition:
+            if self._loop_writes and not self._loop.in_loop_thread():
+                while (self._queue or self._writing) and not self._closed:
+                    self._queue_condition.wait()
+                return
+            elif self._writer is None:
+                buffers = self._unsent
+                self._unsent = []
+                while self._queue:
+                    buffers.extend(self._take_queued())
+            else:
+                while (self._queue or self._writing) and not self._closed:
+                    self._queue_condition.wait()
+                return
+        if buffers:
+            with self._lock:
+                self._send_buffers(buffers)
 
     @staticmethod
     def notification_to_buffer(notification):
@@ -208,18 +1296,81 @@ class BusConnection(rsb.eventprocessing.BroadcastProcessor):
 
         with self._lock:
 
-            self._thread = threading.Thread(target=self.receive_notifications)
-            self._thread.start()
+            if self._loop is None:
+                self._thread = threading.Thread(
+                    target=self.receive_notifications)
+                self._thread.start()
+            elif self._loop_writes:
+                self._loop.add(self._socket, self.receive_available,
+                               self.write_available)
+            else:
+                self._loop.add(self._socket, self.receive_available)
+
+            if self._send_queue_size and not self._loop_writes:
+                # The writer is stopped by shutdown or deactivate but
+                # must not keep the process alive if neither is called.
+                self._writer = threading.Thread(target=self._write_queued,
+                                                name='BusConnectionWriter',
+                                                daemon=True)
+                self._writer.start()
 
             self._active = True
 
     def shutdown(self):
+        drained = self._stop_writer()
         with self._lock:
             self._active_shutdown = True
-            self._socket.shutdown(socket.SHUT_WR)
+            # Otherwise, the socket has already been shut down.
+            if drained:
+                self._socket.shutdown(socket.SHUT_WR)
+
+    def _stop_writer(self):
+        # Lets the writer or the loop drain the send queue for at most
+        # the drain timeout and discards what could not be written by
+        # then. Returns whether the queue has been drained.
+        timeout = self._drain_timeout
+        with self._queue_condition:
+            writer, self._writer = self._writer, None
+            self._writer_stopping = True
+            self._queue_condition.notify_all()
+            if self._loop_writes:
+                if self._loop.in_loop_thread():
+                    # Waiting would prevent the loop from writing.
+                    timeout = 0
+                    self.write_available()
+                drained = self._queue_condition.wait_for(
+                    lambda: (self._closed or
+                             not (self._queue or self._writing)),
+                    timeout)
+            else:
+                drained = True
+        if writer is not None:
+            writer.join(timeout)
+            drained = not writer.is_alive()
+        if not drained:
+            self._logger.warning('Discarding notifications which could not '
+                                 'be sent within %s seconds',
+                                 self._drain_timeout)
+            # Shutting down the socket wakes up a blocked writer.
+            self._close_sending(shutdown=True)
+            if writer is not None:
+                writer.join()
+        self.flush()
+        with self._queue_condition:
+            self._closed = True
+        return drained
 
     def deactivate(self):
 
+        # Queued notifications are discarded. If the writer is blocked
+        # sending to an unresponsive peer, shutting down the socket
+        # wakes it up.
+        self._close_sending(shutdown=self._writing)
+        with self._queue_condition:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.join()
+
         with self._lock:
 
             if not self._active:
@@ -230,6 +1381,8 @@ class BusConnection(rsb.eventprocessing.BroadcastProcessor):
             # If necessary, close the socket, this will cause an exception
             # in the notification receiver thread (unless we run in the
             # context that thread).
+            if self._loop is not None:
+                self._loop.remove(self._socket)
             self._logger.info('Closing socket')
             try:
                 self._socket.close()
@@ -238,8 +1391,200 @@ class BusConnection(rsb.eventprocessing.BroadcastProcessor):
                                   exc_info=True)
 
     def wait_for_deactivation(self):
-        self._logger.info('Joining thread')
-        self._thread.join()
+        if self._thread is not None:
+            self._logger.info('Joining thread')
+            self._thread.join()
+        else:
+            self._logger.info('Waiting for receiving to finish')
+            self._receive_finished.wait()
+
+
+class SelectorLoop:
+    """
+    Multiplexes many sockets in a single I/O thread.
+
+    Sockets are registered together with a callback which is called in
+    the I/O thread whenever the socket becomes readable and, optionally,
+    a callback which is called whenever the socket becomes writable while
+    writing is enabled for it. This allows a :obj:`BusServer` to serve
+    many clients without receiver or writer threads per
+    :obj:`BusConnection`.
+
+    Registrations, removals and changes of the write interest may happen
+    from arbitrary threads. They are queued and applied by the I/O thread
+    between two calls of ``select``.
+    """
+
+    def __init__(self):
+        self._logger = rsb.util.get_logger_by_class(self.__class__)
+
+        self._selector = selectors.DefaultSelector()
+        self._lock = threading.Lock()
+        self._pending = []
+        self._registered = {}
+
+        self._wakeup_receive, self._wakeup_send = socket.socketpair()
+        self._wakeup_receive.setblocking(False)
+        self._wakeup_send.setblocking(False)
+        self._selector.register(self._wakeup_receive, selectors.EVENT_READ,
+                                (self._drain_wakeups, None))
+
+        self._thread = None
+        self._stopped = False
+
+    def add(self, socket_, callback, write_callback=None):
+        """
+        Call ``callback`` whenever ``socket_`` is readable.
+
+        Args:
+            socket_:
+                The socket which should be watched.
+            callback (callable):
+                Called without arguments in the I/O thread.
+            write_callback (callable or None):
+                Called without arguments in the I/O thread whenever
+                ``socket_`` is writable while writing is enabled via
+                :obj:`set_writing`.
+        """
+        self._enqueue(('add', socket_.fileno(), socket_,
+                       (callback, write_callback)))
+
+    def set_writing(self, socket_, writing):
+        """
+        Enable or disable calling the write callback of ``socket_``.
+
+        Changing the write interest of a socket that is not watched has no
+        effect.
+
+        Args:
+            socket_:
+                A socket which has been added with a write callback.
+            writing (bool):
+                Whether the write callback should be called when
+                ``socket_`` is writable.
+        """
+        self._enqueue(('modify', None, socket_, writing))
+
+    def in_loop_thread(self):
+        """
+        Return whether the calling thread is the I/O thread of this loop.
+
+        Returns:
+            bool:
+                ``True`` if called from a callback of this loop.
+        """
+        return threading.current_thread() is self._thread
+
+    def remove(self, socket_):
+        """
+        Stop watching ``socket_``.
+
+        Removing a socket that is not watched has no effect.
+
+        Args:
+            socket_:
+                The socket which should no longer be watched.
+        """
+        self._enqueue(('remove', None, socket_, None))
+
+    def _enqueue(self, operation):
+        with self._lock:
+            self._pending.append(operation)
+        self._wakeup()
+
+    def _wakeup(self):
+        try:
+            self._wakeup_send.send(b'\0')
+        except (BlockingIOError, InterruptedError):
+            pass
+
+    def _drain_wakeups(self):
+        try:
+            while self._wakeup_receive.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+
+    def _apply_pending(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+
+        # Changing the write interest of a socket which is removed in
+        # the same batch is pointless and fails if the socket has
+        # already been closed.
+        removed = {id(socket_)
+                   for (operation, _, socket_, _) in pending
+                   if operation == 'remove'}
+
+        for (operation, fd, socket_, argument) in pending:
+            # A failing operation must not terminate the I/O thread
+            # which serves all other sockets.
+            try:
+                self._apply_operation(operation, fd, socket_, argument,
+                                      removed)
+            except (OSError, KeyError, ValueError) as e:
+                self._logger.warning('Failed to apply %s operation for '
+                                     'socket %s: %s', operation, socket_, e)
+
+    def _apply_operation(self, operation, fd, socket_, argument, removed):
+        if operation == 'add':
+            self._selector.register(fd, selectors.EVENT_READ, argument)
+            self._registered[id(socket_)] = fd
+        elif operation == 'modify':
+            if id(socket_) in removed:
+                return
+            fd = self._registered.get(id(socket_))
+            if fd is not None:
+                key = self._selector.get_key(fd)
+                events = selectors.EVENT_READ
+                if argument:
+                    events |= selectors.EVENT_WRITE
+                self._selector.modify(fd, events, key.data)
+        else:
+            fd = self._registered.pop(id(socket_), None)
+            if fd is not None:
+                self._selector.unregister(fd)
+
+    def _run(self):
+        self._logger.info('Starting I/O loop')
+        while not self._stopped:
+            self._apply_pending()
+            for (key, events) in self._selector.select():
+                callback, write_callback = key.data
+                try:
+                    if events & selectors.EVENT_READ:
+                        callback()
+                    if events & selectors.EVENT_WRITE and write_callback:
+                        write_callback()
+                except Exception as e:
+                    self._logger.error('Error in I/O callback: %s', e,
+                                       exc_info=True)
+        self._logger.info('I/O loop terminated')
+
+    # State management
+
+    def start(self):
+        if self._thread is not None:
+            raise RuntimeError('Trying to start running loop')
+
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run,
+                                        name='SocketIOLoop')
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            raise RuntimeError('Trying to stop loop which is not running')
+
+        self._stopped = True
+        self._wakeup()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+        self._selector.close()
+        self._wakeup_receive.close()
+        self._wakeup_send.close()
 
 
 class Bus:
@@ -264,7 +1609,7 @@ class Bus:
 
         self._connections = []
         self._connectors = []
-        self._dispatcher = rsb.eventprocessing.ScopeDispatcher()
+        self._sinks = rsb.eventprocessing.ScopeTrie()
         self._lock = threading.RLock()
 
         self._active = False
@@ -304,8 +1649,10 @@ class Bus:
                 def __init__(_self):  # noqa: N805
                     _self.bus = self
 
-                def __call__(_self, notification):  # noqa: N805
-                    self.handle_incoming((connection, notification))
+                def __call__(_self, notification_and_buffer):  # noqa: N805
+                    notification, serialized = notification_and_buffer
+                    self.handle_incoming(
+                        (connection, notification, serialized))
             connection.add_handler(Handler())
 
             def remove_and_deactivate():
@@ -354,7 +1701,7 @@ class Bus:
         self._logger.info('Adding connector %s', connector)
         with self.lock:
             if isinstance(connector, InConnector):
-                self._dispatcher.add_sink(connector.scope, connector)
+                self._sinks.add(connector.scope, connector)
             self._connectors.append(connector)
 
     def remove_connector(self, connector):
@@ -368,7 +1715,7 @@ class Bus:
         self._logger.info('Removing connector %s', connector)
         with self.lock:
             if isinstance(connector, InConnector):
-                self._dispatcher.remove_sink(connector.scope, connector)
+                self._sinks.remove(connector.scope, connector)
             self._connectors.remove(connector)
             if not self._connectors:
                 self._logger.info(
@@ -377,7 +1724,19 @@ class Bus:
             return True
 
     def handle_incoming(self, connection_and_notification):
-        _, notification = connection_and_notification
+        """
+        Distribute a notification received via one of the connections.
+
+        Args:
+            connection_and_notification (tuple):
+                The receiving connection, the received notification and the
+                serialized buffer from which the notification was parsed.
+        """
+        connection, notification, _ = connection_and_notification
+        if notification.scope == _CONTROL_SCOPE:
+            self._handle_control(connection, notification)
+            return
+
         self._logger.debug('Trying to distribute notification to connectors')
         with self.lock:
             self._logger.debug(
@@ -412,6 +1771,33 @@ class Bus:
         # we can immediately call deactivate.
         list(map(BusConnection.deactivate, failing))
 
+    def handle_outgoing_many(self, notifications):
+        """
+        Distribute multiple outgoing notifications in order.
+
+        Each connection receives all notifications destined for it with a
+        single :obj:`BusConnection.send_batch` call.
+
+        Args:
+            notifications (list of Notification):
+                The notifications to send.
+        """
+        with self.lock:
+            self._logger.debug('Locked bus to distribute %d notifications '
+                               'to connections and connectors',
+                               len(notifications))
+            if not self._active:
+                self._logger.info('Cancelled distribution to connections '
+                                  'and connectors since bus is not active')
+                return
+
+            failing = self._to_connections_many(notifications)
+            # Notifications in a batch usually share their scope.
+            sinks = {}
+            for notification in notifications:
+                self._to_connectors(notification, sinks)
+        list(map(BusConnection.deactivate, failing))
+
     # State management
 
     @property
@@ -447,35 +1833,114 @@ class Bus:
                 self._logger.error('Failed to close connections: %s', e,
                                    exc_info=True)
 
+    # Control notifications
+
+    def _handle_control(self, connection, notification):
+        self._logger.debug('Ignoring control notification %s from %s',
+                           notification.method, connection)
+
+    def _send_control(self, connection, notification):
+        try:
+            connection.send_notification(
+                BusConnection.notification_to_buffer(notification))
+        except Exception as e:
+            self._logger.warning('Failed to send control notification to %s: '
+                                 '%s', connection, e, exc_info=True)
+
     # Low-level helpers
 
-    def _to_connections(self, notification, exclude=None):
+    def _recipients(self, notification, exclude):
+        return [connection for connection in self.connections
+                if connection is not exclude]
+
+    def _to_connections(self, notification, exclude=None, serialized=None):
+        # Encode NOTIFICATION at most once and send the same buffer
+        # through all connections. Relayed notifications come with the
+        # buffer from which they have been parsed. Connections to peers
+        # which accept fragments receive large notifications as
+        # fragments which are also encoded at most once.
         failing = []
-        for connection in self.connections:
-            if connection is not exclude:
-                try:
-                    connection.handle(notification)
-                except Exception as e:
-                    self._logger.warn(
-                        'Failed to send to %s: %s; '
-                        'will close connection later',
-                        connection, e, exc_info=True)
-                    failing.append(connection)
+        encoding = _Encoding(notification, serialized)
+        key = _notification_key(notification)
+        sender = notification.event_id.sender_id
+        for connection in self._recipients(notification, exclude):
+            try:
+                encoded = encoding.for_connection(connection)
+                if isinstance(encoded, list):
+                    connection.send_fragments(encoded, key=key,
+                                              sender=sender)
+                else:
+                    connection.send_notification(encoded, key=key,
+                                                 sender=sender)
+            except Exception as e:
+                self._logger.warning(
+                    'Failed to send to %s: %s; '
+                    'will close connection later',
+                    connection, e, exc_info=True)
+                failing.append(connection)
 
         # Removed connections for which sending the notification
         # failed.
         list(map(self.remove_connection, failing))
         return failing
 
-    def _to_connectors(self, notification):
+    def _to_connections_many(self, notifications):
+        # Like _to_connections but collect the encoded notifications
+        # for each connection and send them as one batch. Recipients
+        # only depend on the scope of a notification.
+        batches = {}
+        recipients = {}
+        for notification in notifications:
+            encoding = _Encoding(notification)
+            scope = notification.scope
+            connections = recipients.get(scope)
+            if connections is None:
+                connections = self._recipients(notification, None)
+                recipients[scope] = connections
+            for connection in connections:
+                batches.setdefault(connection, []).append(encoding)
+
+        failing = []
+        for (connection, encodings) in batches.items():
+            try:
+                connection.send_batch(
+                    [encoding.for_connection(connection)
+                     for encoding in encodings],
+                    keys=[_notification_key(encoding.notification)
+                          for encoding in encodings],
+                    senders=[encoding.notification.event_id.sender_id
+                             for encoding in encodings])
+            except Exception as e:
+                self._logger.warning(
+                    'Failed to send to %s: %s; '
+                    'will close connection later',
+                    connection, e, exc_info=True)
+                failing.append(connection)
+
+        list(map(self.remove_connection, failing))
+        return failing
+
+    def _to_connectors(self, notification, sinks_by_scope=None):
         # Deliver NOTIFICATION to connectors which fulfill two
         # criteria:
         # 1) Direction has to be "incoming events"
         # 2) The scope of the connector has to be a superscope of
         #    NOTIFICATION's scope
-        scope = rsb.Scope(notification.scope.decode('ASCII'))
-        for sink in self._dispatcher.matching_sinks(scope):
-            sink.handle(notification)
+        #
+        # Connectors which use the same converter share a single
+        # decoded event via CACHE. SINKS_BY_SCOPE optionally caches
+        # the matching connectors for multiple notifications.
+        if sinks_by_scope is None:
+            sinks = list(self._sinks.matching(rsb.Scope(notification.scope)))
+        else:
+            scope = notification.scope
+            sinks = sinks_by_scope.get(scope)
+            if sinks is None:
+                sinks = list(self._sinks.matching(rsb.Scope(scope)))
+                sinks_by_scope[scope] = sinks
+        cache = {} if len(sinks) > 1 else None
+        for sink in sinks:
+            sink.handle(notification, cache)
 
     def __repr__(self):
         return '<{} {} connection(s) {} connector(s) at 0x{:x}>'.format(
@@ -487,7 +1952,8 @@ _bus_clients = {}
 _bus_clients_lock = threading.Lock()
 
 
-def get_bus_client_for(host, port, tcpnodelay, connector):
+def get_bus_client_for(host, port, tcpnodelay, connector, path=None,
+                       negotiate=False, **connection_options):
     """
     Return a bus client for the given end point and attach a connector to it.
 
@@ -506,12 +1972,24 @@ def get_bus_client_for(host, port, tcpnodelay, connector):
             If True, the socket will be set to TCP_NODELAY.
         connector:
             A connector that should be attached to the bus client.
+        path (str or None):
+            If not ``None``, the path of the ``AF_UNIX`` socket on which the
+            bus server listens. ``host`` and ``port`` are ignored in that
+            case.
+        negotiate (bool):
+            Whether the bus client negotiates capabilities with the bus
+            server. See :obj:`BusClient`.
+        connection_options:
+            Additional keyword arguments for the :obj:`BusConnection` of the
+            bus client.
     """
-    key = (host, port, tcpnodelay)
+    key = (host, port, tcpnodelay, path, negotiate) \
+        + tuple(sorted(connection_options.items()))
     with _bus_clients_lock:
         bus = _bus_clients.get(key)
         if bus is None:
-            bus = BusClient(host, port, tcpnodelay)
+            bus = BusClient(host, port, tcpnodelay, path=path,
+                            negotiate=negotiate, **connection_options)
             _bus_clients[key] = bus
             bus.activate()
             bus.add_connector(connector)
@@ -524,10 +2002,23 @@ class BusClient(Bus):
     """
     Provides access to a bus by means of a client socket.
 
+    If created with ``negotiate``, the client announces its capabilities
+    to the bus server after connecting. If the bus server replies and
+    announces support for subscriptions, the client informs the server
+    about the scopes of its in-direction connectors such that the server
+    only forwards matching notifications. Adding an in-direction connector
+    for a new scope waits (briefly) until the server has acknowledged the
+    subscription. Otherwise, the server forwards all notifications.
+
+    Negotiating is only safe if the bus server understands control
+    notifications. Other bus servers dispatch the announcement to their
+    listeners and relay it to their other clients like an event.
+
     .. codeauthor:: jmoringe
     """
 
-    def __init__(self, host, port, tcpnodelay):
+    def __init__(self, host, port, tcpnodelay, path=None, negotiate=False,
+                 **connection_options):
         """
         Create a new client connection on the specified host and port.
 
@@ -539,17 +2030,108 @@ class BusClient(Bus):
                 The port on which the new bus server listens.
             tcpnodelay (bool):
                 If True, the socket will be set to TCP_NODELAY.
+            path (str or None):
+                If not ``None``, the path of the ``AF_UNIX`` socket on which
+                the bus server listens. Replaces ``host`` and ``port``.
+            negotiate (bool):
+                Whether to negotiate capabilities, e.g. subscriptions and
+                fragments, with the bus server.
+            connection_options:
+                Additional keyword arguments for the :obj:`BusConnection`.
         """
         super().__init__()
 
-        self.add_connection(BusConnection(host, port, tcpnodelay=tcpnodelay))
+        self._subscriptions = collections.Counter()
+        self._server_capabilities = None
+        self._receiving_thread = None
+        self._sequence_number = 0
+        self._acknowledged = 0
+        self._acknowledgement_condition = threading.Condition()
+
+        if path is None:
+            self._connection = BusConnection(host, port,
+                                             tcpnodelay=tcpnodelay,
+                                             **connection_options)
+        else:
+            self._connection = BusConnection(path=path,
+                                             **connection_options)
+        self.add_connection(self._connection)
+        if negotiate:
+            self._send_control(self._connection, _make_control_notification(
+                _HELLO, capabilities=_CAPABILITIES))
+
+    def add_connector(self, connector):
+        sequence_number = None
+        with self.lock:
+            super().add_connector(connector)
+            if isinstance(connector, InConnector):
+                scope = connector.scope.to_bytes()
+                self._subscriptions[scope] += 1
+                if (self._subscriptions[scope] == 1 and
+                        self._server_capabilities is not None):
+                    sequence_number = self._send_subscriptions(_SUBSCRIBE,
+                                                               [scope])
+        if sequence_number is not None:
+            self._wait_for_acknowledgement(sequence_number)
+
+    def remove_connector(self, connector):
+        with self.lock:
+            if isinstance(connector, InConnector):
+                scope = connector.scope.to_bytes()
+                self._subscriptions[scope] -= 1
+                if not self._subscriptions[scope]:
+                    del self._subscriptions[scope]
+                    if self._server_capabilities is not None:
+                        self._send_subscriptions(_UNSUBSCRIBE, [scope])
+            return super().remove_connector(connector)
+
+    def _handle_control(self, connection, notification):
+        if notification.method == _HELLO:
+            capabilities = _control_capabilities(notification)
+            self._logger.info('Bus server capabilities: %s',
+                              b', '.join(sorted(capabilities)))
+            with self.lock:
+                self._receiving_thread = threading.current_thread()
+                connection.peer_capabilities = capabilities
+                if b'subscriptions' in capabilities:
+                    self._server_capabilities = capabilities
+                    self._send_subscriptions(_SUBSCRIPTIONS,
+                                             list(self._subscriptions))
+        elif notification.method == _ACKNOWLEDGE:
+            with self._acknowledgement_condition:
+                self._acknowledged = max(
+                    self._acknowledged,
+                    notification.event_id.sequence_number)
+                self._acknowledgement_condition.notify_all()
+        else:
+            super()._handle_control(connection, notification)
+
+    def _send_subscriptions(self, method, scopes):
+        # Must be called with self.lock held.
+        self._sequence_number += 1
+        self._send_control(self._connection, _make_control_notification(
+            method, scopes=scopes, sequence_number=self._sequence_number))
+        return self._sequence_number
+
+    def _wait_for_acknowledgement(self, sequence_number):
+        # The acknowledgement is received by the receiving thread of
+        # the connection which therefore must not wait for it.
+        if threading.current_thread() is self._receiving_thread:
+            return
+        with self._acknowledgement_condition:
+            if not self._acknowledgement_condition.wait_for(
+                    lambda: self._acknowledged >= sequence_number,
+                    _ACKNOWLEDGEMENT_TIMEOUT):
+                self._logger.warning('Bus server did not acknowledge '
+                                     'subscription %d', sequence_number)
 
 
 _bus_servers = {}
 _bus_servers_lock = threading.Lock()
 
 
-def get_bus_server_for(host, port, tcpnodelay, connector):
+def get_bus_server_for(host, port, tcpnodelay, connector, io='threads',
+                       path=None, **connection_options):
     """
     Return a bus server for the given end point and attach a connector to it.
 
@@ -570,12 +2152,23 @@ def get_bus_server_for(host, port, tcpnodelay, connector):
             If True, the socket will be set to TCP_NODELAY.
         connector:
             A connector that should be attached to the bus server.
+        io (str):
+            The I/O model of the bus server. See :obj:`BusServer`.
+        path (str or None):
+            If not ``None``, the path to which the ``AF_UNIX`` listen socket
+            of the new bus server should be bound. ``host`` and ``port`` are
+            ignored in that case.
+        connection_options:
+            Additional keyword arguments for the :obj:`BusConnection` s of
+            the bus server.
     """
-    key = (host, port, tcpnodelay)
+    key = (host, port, tcpnodelay, io, path) \
+        + tuple(sorted(connection_options.items()))
     with _bus_servers_lock:
         bus = _bus_servers.get(key)
         if bus is None:
-            bus = BusServer(host, port, tcpnodelay)
+            bus = BusServer(host, port, tcpnodelay, io=io, path=path,
+                            **connection_options)
             bus.activate()
             _bus_servers[key] = bus
             bus.add_connector(connector)
@@ -595,10 +2188,29 @@ class BusServer(Bus):
     receive events submitted by remote clients and submit events which
     will be distributed to remote clients by the :obj:`BusServer`.
 
+    With the ``'threads'`` I/O model, an acceptor thread and one receiver
+    thread per client connection are used. With the ``'selector'`` I/O
+    model, a single :obj:`SelectorLoop` thread accepts clients and
+    receives notifications from all client connections.
+
+    Notifications are only forwarded to clients which subscribed to a
+    matching scope (see :obj:`BusClient`). Clients which did not negotiate
+    subscriptions receive all notifications. Control notifications are
+    only sent to clients which announced their capabilities first such
+    that clients which do not know them never receive them.
+
+    If a ``path`` is given, the bus server listens on an ``AF_UNIX`` socket
+    instead of a TCP port. A socket file left behind by a bus server which
+    no longer accepts connections is replaced and the socket file is
+    removed when the bus server is deactivated.
+
     .. codeauthor:: jmoringe
     """
 
-    def __init__(self, host, port, tcpnodelay, backlog=5):
+    IO_MODELS = ('threads', 'selector')
+
+    def __init__(self, host, port, tcpnodelay, backlog=5, io='threads',
+                 path=None, **connection_options):
         """
         Create a new instance on the given host and port.
 
@@ -613,19 +2225,42 @@ class BusServer(Bus):
                 If True, the socket will be set to TCP_NODELAY.
             backlog (int):
                 The maximum number of queued connection attempts.
+            io (str):
+                The I/O model, either ``'threads'`` or ``'selector'``.
+            path (str or None):
+                If not ``None``, the path to which the ``AF_UNIX`` listen
+                socket should be bound instead of ``host`` and ``port``. A
+                leading ``@`` denotes the abstract namespace.
+            connection_options:
+                Additional keyword arguments for the :obj:`BusConnection` s
+                of clients.
         """
         super().__init__()
 
         self._logger = rsb.util.get_logger_by_class(self.__class__)
 
+        if io not in self.IO_MODELS:
+            raise ValueError('I/O model has to be one of {}, not "{}"'.format(
+                ', '.join(self.IO_MODELS), io))
+
         self._host = host
         self._port = port
+        self._path = path
         self._tcpnodelay = tcpnodelay
+        self._connection_options = connection_options
         self._backlog = backlog
-        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        if path is None:
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        else:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
         self._acceptor_thread = None
+        self._loop = SelectorLoop() if io == 'selector' else None
         self._active_shutdown = False
 
+        # Maps connections of clients which negotiated subscriptions to
+        # sets of serialized scopes.
+        self._subscriptions = {}
+
     def __del__(self):
         if self.active:
             self.deactivate()
@@ -640,11 +2275,7 @@ class BusServer(Bus):
                 client_socket, addr = self._socket.accept()
                 if sys.platform == 'darwin':
                     client_socket.settimeout(None)
-                self._logger.info('Accepted client %s', addr)
-                self.add_connection(
-                    BusConnection(socket_=client_socket,
-                                  is_server=True,
-                                  tcpnodelay=self._tcpnodelay))
+                self._add_client(client_socket, addr)
             except socket.timeout as e:
                 if sys.platform != 'darwin':
                     self._logger.error(
@@ -657,29 +2288,164 @@ class BusServer(Bus):
                 else:
                     self._logger.info('Acceptor thread terminating')
 
+    def accept_client(self):
+        """
+        Accept a single pending client without blocking.
+
+        Called by the :obj:`SelectorLoop` when the listen socket is
+        readable.
+        """
+        try:
+            client_socket, addr = self._socket.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+        except Exception as e:
+            if not self._active_shutdown:
+                self._logger.error('Exception in accept_client: "%s"', e,
+                                   exc_info=True)
+            return
+        client_socket.setblocking(True)
+        try:
+            self._add_client(client_socket, addr)
+        except Exception as e:
+            self._logger.error('Failed to add client %s: "%s"', addr, e,
+                               exc_info=True)
+
+    def _add_client(self, client_socket, addr):
+        self._logger.info('Accepted client %s', addr)
+        connection = BusConnection(socket_=client_socket,
+                                   is_server=True,
+                                   tcpnodelay=self._tcpnodelay,
+                                   loop=self._loop,
+                                   **self._connection_options)
+        self.add_connection(connection)
+
+    def remove_connection(self, connection):
+        with self.lock:
+            self._subscriptions.pop(connection, None)
+            super().remove_connection(connection)
+
+    # Control notifications
+
+    def _handle_control(self, connection, notification):
+        method = notification.method
+        if method == _HELLO:
+            capabilities = _control_capabilities(notification)
+            self._logger.info('Client %s capabilities: %s', connection,
+                              b', '.join(sorted(capabilities)))
+            with self.lock:
+                if connection not in self.connections:
+                    return
+                connection.peer_capabilities = capabilities
+                self._send_control(connection, _make_control_notification(
+                    _HELLO, capabilities=_CAPABILITIES))
+            return
+        elif method not in (_SUBSCRIPTIONS, _SUBSCRIBE, _UNSUBSCRIBE):
+            super()._handle_control(connection, notification)
+            return
+
+        scopes = notification.data.split()
+        with self.lock:
+            if connection not in self.connections:
+                return
+            if method == _SUBSCRIPTIONS:
+                self._subscriptions[connection] = set(scopes)
+            elif connection in self._subscriptions:
+                if method == _SUBSCRIBE:
+                    self._subscriptions[connection].update(scopes)
+                else:
+                    self._subscriptions[connection].difference_update(scopes)
+            self._send_control(connection, _make_control_notification(
+                _ACKNOWLEDGE,
+                sequence_number=notification.event_id.sequence_number))
+
+    def _recipients(self, notification, exclude):
+        recipients = super()._recipients(notification, exclude)
+        if not self._subscriptions:
+            return recipients
+
+        prefixes = _scope_prefixes(notification.scope)
+        subscriptions = self._subscriptions
+        return [connection for connection in recipients
+                if connection not in subscriptions or
+                not subscriptions[connection].isdisjoint(prefixes)]
+
     # Receiving notifications
 
     def handle_incoming(self, connection_and_notification):
         super().handle_incoming(connection_and_notification)
+        if connection_and_notification[1].scope == _CONTROL_SCOPE:
+            return
 
         # Distribute the notification to all connections except the
-        # one that sent it.
-        (sending_connection, notification) = connection_and_notification
+        # one that sent it. The received buffer is forwarded as is but
+        # has to be copied since it may remain in send queues after the
+        # receive buffer has been reused. Reassembled notifications have
+        # no received buffer and are encoded again.
+        (sending_connection, notification, serialized) = \
+            connection_and_notification
         with self.lock:
-            self._to_connections(notification, exclude=sending_connection)
+            if serialized is not None and len(self.connections) > 1:
+                serialized = bytes(serialized)
+            self._to_connections(notification, exclude=sending_connection,
+                                 serialized=serialized)
 
     # State management
 
+    def _remove_stale_socket_file(self):
+        # Remove a socket file which was left behind by a bus server
+        # that terminated without deactivating. The file is kept if a
+        # bus server still accepts connections on it such that binding
+        # fails as it would for a TCP port in use.
+        if self._path.startswith('@'):
+            return
+        try:
+            if not stat.S_ISSOCK(os.stat(self._path).st_mode):
+                return
+        except FileNotFoundError:
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self._path)
+        except ConnectionRefusedError:
+            self._logger.info('Removing stale socket file %s', self._path)
+            os.unlink(self._path)
+        finally:
+            probe.close()
+
+    def _remove_socket_file(self):
+        if self._path is None or self._path.startswith('@'):
+            return
+        try:
+            os.unlink(self._path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self._logger.warning('Failed to remove socket file %s: %s',
+                                 self._path, e, exc_info=True)
+
     def activate(self):
         # Bind the socket and start listening
-        self._logger.info('Opening listen socket %s:%d',
-                          '0.0.0.0', self._port)
-        self._socket.bind(('0.0.0.0', self._port))
+        if self._path is None:
+            self._logger.info('Opening listen socket %s:%d',
+                              '0.0.0.0', self._port)
+            self._socket.bind(('0.0.0.0', self._port))
+        else:
+            self._logger.info('Opening listen socket %s', self._path)
+            self._remove_stale_socket_file()
+            self._socket.bind(_unix_address(self._path))
         self._socket.listen(self._backlog)
 
-        self._logger.info('Starting acceptor thread')
-        self._acceptor_thread = threading.Thread(target=self.accept_clients)
-        self._acceptor_thread.start()
+        if self._loop is None:
+            self._logger.info('Starting acceptor thread')
+            self._acceptor_thread = threading.Thread(
+                target=self.accept_clients)
+            self._acceptor_thread.start()
+        else:
+            self._logger.info('Starting I/O loop')
+            self._socket.setblocking(False)
+            self._loop.start()
+            self._loop.add(self._socket, self.accept_client)
 
         super().activate()
 
@@ -692,6 +2458,8 @@ class BusServer(Bus):
         # exception in the acceptor thread.
         self._logger.info('Closing listen socket')
         if self._socket is not None:
+            if self._loop is not None:
+                self._loop.remove(self._socket)
             try:
                 self._socket.shutdown(socket.SHUT_RDWR)
             except Exception as e:
@@ -703,6 +2471,7 @@ class BusServer(Bus):
                 self._logger.warn('Failed to close listen socket: %s', e,
                                   exc_info=True)
             self._socket = None
+            self._remove_socket_file()
 
         # The acceptor thread should encounter an exception and exit
         # eventually. We wait for that.
@@ -711,6 +2480,13 @@ class BusServer(Bus):
             self._acceptor_thread.join()
 
         super().deactivate()
+
+        # Connections are shut down via the I/O loop. Therefore, it can
+        # only be stopped after all connections have been closed.
+        if self._loop is not None:
+            self._logger.info('Stopping I/O loop')
+            self._loop.stop()
+
         self._active_shutdown = False
 
 
@@ -753,7 +2529,9 @@ class Connector(rsb.transport.Connector,
         self._bus = None
         self._host = options.get('host', 'localhost')
         self._port = int(options.get('port', '55555'))
+        self._path = options.get('path') or None
         self._tcpnodelay = options.get('nodelay', '1') in ['1', 'true']
+        self._negotiate = options.get('negotiate', '0') in ['1', 'true']
         server_string = options.get('server', 'auto')
         if server_string in ['1', 'true']:
             self._server = True
@@ -765,6 +2543,34 @@ class Connector(rsb.transport.Connector,
             raise TypeError(
                 'Server option has to be "1", "true", "0", "false" '
                 'or "auto", not "{}"'.format(server_string))
+        self._io = options.get('io', 'threads')
+        if self._io not in BusServer.IO_MODELS:
+            raise TypeError(
+                'IO option has to be one of {}, not "{}"'.format(
+                    ', '.join('"{}"'.format(model)
+                              for model in BusServer.IO_MODELS),
+                    self._io))
+        overflow = options.get('overflow', 'block')
+        if overflow not in BusConnection.OVERFLOW_POLICIES:
+            raise TypeError(
+                'Overflow option has to be one of {}, not "{}"'.format(
+                    ', '.join('"{}"'.format(policy)
+                              for policy in BusConnection.OVERFLOW_POLICIES),
+                    overflow))
+        self._connection_options = {
+            'send_queue_size': int(options.get('sendqueuesize', '1000')),
+            'overflow': overflow,
+            'coalesce_window':
+                int(options.get('coalescewindow', '0')) / 1000000.0,
+            'coalesce_bytes': int(options.get('coalescebytes', '65536')),
+            'max_fragment_size': int(options.get('maxfragmentsize', '0')),
+            'assembly_memory':
+                int(options.get('assemblymemory', str(256 * 1024 * 1024))),
+            'assembly_timeout':
+                int(options.get('assemblytimeout', '10000')) / 1000.0,
+            'conflate': options.get('conflate', '0') in ['1', 'true'],
+            'drain_timeout':
+                int(options.get('draintimeout', '5000')) / 1000.0}
 
     def __del__(self):
         if self._active:
@@ -773,25 +2579,39 @@ class Connector(rsb.transport.Connector,
     def _get_bus(self, host, port, tcpnodelay, server):
         self._logger.info('Requested server role: %s', server)
 
+        if self._path is None:
+            address = '{}:{}'.format(host, port)
+        else:
+            address = self._path
         if server is True:
-            self._logger.info('Getting bus server %s:%d', host, port)
-            self._bus = get_bus_server_for(host, port, tcpnodelay, self)
+            self._logger.info('Getting bus server %s', address)
+            self._bus = get_bus_server_for(host, port, tcpnodelay, self,
+                                           io=self._io, path=self._path,
+                                           **self._connection_options)
         elif server is False:
-            self._logger.info('Getting bus client %s:%d', host, port)
-            self._bus = get_bus_client_for(host, port, tcpnodelay, self)
+            self._logger.info('Getting bus client %s', address)
+            self._bus = get_bus_client_for(host, port, tcpnodelay, self,
+                                           path=self._path,
+                                           negotiate=self._negotiate,
+                                           **self._connection_options)
         elif server == 'auto':
             try:
                 self._logger.info(
-                    'Trying to get bus server %s:%d (in server = auto mode)',
-                    host, port)
-                self._bus = get_bus_server_for(host, port, tcpnodelay, self)
+                    'Trying to get bus server %s (in server = auto mode)',
+                    address)
+                self._bus = get_bus_server_for(host, port, tcpnodelay, self,
+                                               io=self._io, path=self._path,
+                                               **self._connection_options)
             except Exception as e:
                 self._logger.info('Failed to get bus server: %s', e,
                                   exc_info=True)
                 self._logger.info(
-                    'Trying to get bus client %s:%d (in server = auto mode)',
-                    host, port)
-                self._bus = get_bus_client_for(host, port, tcpnodelay, self)
+                    'Trying to get bus client %s (in server = auto mode)',
+                    address)
+                self._bus = get_bus_client_for(host, port, tcpnodelay, self,
+                                               path=self._path,
+                                               negotiate=self._negotiate,
+                                               **self._connection_options)
         else:
             raise TypeError(
                 'Server argument has to be True, False or '
@@ -831,6 +2651,8 @@ class Connector(rsb.transport.Connector,
 
     def get_transport_url(self):
         query = '?tcpnodelay=' + ('1' if self._tcpnodelay else '0')
+        if self._path is not None:
+            query += '&path=' + self._path
         return 'socket://' + self._host + ':' + str(self._port) + query
 
 
@@ -845,33 +2667,91 @@ class InConnector(Connector, rsb.transport.InConnector):
     instance has a :obj:`Bus` which pushes appropriate events into the
     instance. The connector deserializes event payloads and pushes the
     events into handlers (usually objects which implement some event
-    processing strategy).
+    processing strategy). With the ``lazydata`` option, payloads are
+    deserialized on first access instead (see :obj:`rsb.LazyData`).
+
+    Filters which are pushed down via :obj:`filter_notify` and which can
+    be evaluated on raw notifications (scope, origin, cause and method
+    filters) are applied before notifications are decoded. Notifications
+    which do not pass them are discarded without deserializing their
+    payload.
 
     .. codeauthor:: jmoringe
     """
 
-    def __init__(self, **kwargs):
+    def __init__(self, options=None, **kwargs):
         self._action = None
+        # Tuple of (filter, predicate) pairs, replaced on modification
+        # so that handle() can iterate without locking.
+        self._predicates = ()
+        self._predicates_lock = threading.Lock()
 
-        super().__init__(**kwargs)
+        super().__init__(options=options, **kwargs)
+
+        if options is None:
+            options = {}
+        self._lazy = options.get('lazydata', '0') in ['1', 'true']
 
     def filter_notify(self, the_filter, action):
-        pass
+        if action == rsb.filter.FilterAction.ADD:
+            predicate = conversion.notification_predicate(the_filter)
+            if predicate is None:
+                return
+            with self._predicates_lock:
+                self._predicates = \
+                    self._predicates + ((the_filter, predicate),)
+        elif action == rsb.filter.FilterAction.REMOVE:
+            with self._predicates_lock:
+                self._predicates = tuple(
+                    entry for entry in self._predicates
+                    if entry[0] is not the_filter)
+
+    def _accepts(self, notification):
+        for (_, predicate) in self._predicates:
+            if not predicate(notification):
+                return False
+        return True
 
     def set_observer_action(self, action):
         self._action = action
 
-    def handle(self, notification):
-        if self._action is None:
+    def handle(self, notification, cache=None):
+        """
+        Decode ``notification`` into an event and dispatch it.
+
+        Args:
+            notification (Notification):
+                The received notification.
+            cache (dict or None):
+                If not ``None``, a dictionary shared by all connectors which
+                receive ``notification``. It maps converters to events
+                decoded by them such that the payload is only deserialized
+                once per converter. Each connector dispatches a copy with
+                independent meta-data.
+
+        With the ``lazydata`` option, the payload is only deserialized when
+        a handler accesses the data of the event.
+        """
+        if self._action is None or not self._accepts(notification):
             return
 
-        converter = self.get_converter_for_wire_schema(
-            notification.wire_schema.decode('ASCII'))
-        event = conversion.notification_to_event(
-            notification,
-            wire_data=bytes(notification.data),
-            wire_schema=notification.wire_schema.decode('ASCII'),
-            converter=converter)
+        wire_schema = notification.wire_schema.decode('ASCII')
+        converter = self.get_converter_for_wire_schema(wire_schema)
+        if cache is None:
+            event = None
+        else:
+            event = cache.get(converter)
+        if event is None:
+            event = conversion.notification_to_event(
+                notification,
+                wire_data=bytes(notification.data),
+                wire_schema=wire_schema,
+                converter=converter,
+                lazy=self._lazy)
+            if cache is not None:
+                cache[converter] = event
+        if cache is not None:
+            event = conversion.copy_event(event)
         self._action(event)
 
 
@@ -890,16 +2770,35 @@ class OutConnector(Connector,
         super().__init__(**kwargs)
 
     def handle(self, event):
-        # Create a notification fragment for the event and send it
-        # over the bus.
+        # Create a notification for the event and send it over the
+        # bus.
         event.meta_data.send_time = None
         converter = self.get_converter_for_data_type(event.data_type)
+        self.bus.handle_outgoing(self._to_notification(event, converter))
+
+    def handle_many(self, events):
+        # Serialize all events, looking up the converter only once per
+        # data type, and send the notifications in one batch.
+        send_time = time.time()
+        converters = {}
+        notifications = []
+        for event in events:
+            event.meta_data.send_time = send_time
+            data_type = event.data_type
+            converter = converters.get(data_type)
+            if converter is None:
+                converter = self.get_converter_for_data_type(data_type)
+                converters[data_type] = converter
+            notifications.append(self._to_notification(event, converter))
+        self.bus.handle_outgoing_many(notifications)
+
+    def _to_notification(self, event, converter):
         wire_data, wire_schema = converter.serialize(event.data)
         notification = Notification()
         conversion.event_to_notification(notification, event,
                                          wire_schema=wire_schema,
                                          data=wire_data)
-        self.bus.handle_outgoing(notification)
+        return notification
 
 
 class TransportFactory(rsb.transport.TransportFactory):
@@ -82,7 +82,6 @@ class TransportCheck(metaclass=abc.ABCMeta):
         event.scope = Scope("/notGood")
         event.data = "x" * 600000
         event.data_type = str
-        event.meta_data.sender_id = uuid.uuid4()
         outconnector.handle(event)
 
         # and then a desired event
@@ -208,6 +207,47 @@ class TransportCheck(metaclass=abc.ABCMeta):
             listener.deactivate()
         informer.deactivate()
 
+    @pytest.mark.timeout(5)
+    def test_publish_many(self):
+        scope = Scope("/test/many")
+        in_connector = self._get_in_connector(scope, activate=False)
+        out_connector = self._get_out_connector(scope, activate=False)
+
+        in_configurator = rsb.eventprocessing.InRouteConfigurator(
+            connectors=[in_connector])
+        out_configurator = rsb.eventprocessing.OutRouteConfigurator(
+            connectors=[out_connector])
+
+        listener = create_listener(scope, configurator=in_configurator)
+        informer = create_informer(scope,
+                                   data_type=str,
+                                   configurator=out_configurator)
+
+        received = []
+        condition = threading.Condition()
+
+        def receive(event):
+            with condition:
+                received.append(event)
+                condition.notify_all()
+        listener.add_handler(receive)
+
+        data = ["sample {}".format(i) for i in range(20)]
+        # A large payload in the middle of the batch.
+        data[10] = "x" * 300000
+        sent = informer.publish_many(data)
+
+        with condition:
+            condition.wait_for(lambda: len(received) == len(data), 4)
+        assert [event.data for event in received] == data
+        assert [event.event_id for event in received] == \
+            [event.event_id for event in sent]
+        assert [event.event_id.sequence_number for event in sent] == \
+            list(range(len(data)))
+
+        informer.deactivate()
+        listener.deactivate()
+
     def test_send_time_adaption(self):
         scope = Scope("/notGood")
         connector = self._get_out_connector(scope)
@@ -218,7 +258,6 @@ class TransportCheck(metaclass=abc.ABCMeta):
             random.choice(string.ascii_uppercase + string.ascii_lowercase +
                           string.digits) for i in list(range(300502)))
         event.data_type = str
-        event.meta_data.sender_id = uuid.uuid4()
 
         before = time.time()
         connector.handle(event)
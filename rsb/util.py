@@ -24,8 +24,8 @@ Various helper classes and methods.
 .. codeauthor:: jwienke
 """
 
+from collections import deque
 import logging
-from queue import Queue
 from threading import Condition, Lock, Thread
 
 
@@ -51,6 +51,17 @@ class OrderedQueueDispatcherPool:
     The pool can be stopped and restarted at any time during the processing but
     these calls must be single-threaded.
 
+    Receivers which have pending messages and are not being processed by a
+    worker are kept in a ready queue. A receiver is appended to this queue
+    when it goes from idle to having work, so that workers obtain their next
+    job in constant time regardless of the number of registered receivers.
+
+    The queue of each receiver can be bounded. When a message is pushed while
+    the queue of a receiver is full, the overflow policy determines whether
+    the caller blocks until the receiver has processed a message, the oldest
+    queued message is discarded or the new message is discarded for that
+    receiver.
+
     Assumptions:
      - same subscriptions for multiple receivers unlikely, hence filtering done
        per receiver thread
@@ -60,17 +71,26 @@ class OrderedQueueDispatcherPool:
 
     class _Receiver:
 
+        __slots__ = ('receiver', 'queue', 'scheduled', 'processing',
+                     'removed', 'processing_condition')
+
         def __init__(self, receiver):
             self.receiver = receiver
-            self.queue = Queue()
+            self.queue = deque()
+            # True while the receiver is in the ready queue or being
+            # processed by a worker.
+            self.scheduled = False
             self.processing = False
-            self.processing_mutex = Lock()
+            self.removed = False
             self.processing_condition = Condition()
 
+    OVERFLOW_POLICIES = ('block', 'drop-oldest', 'drop-newest')
+
     def _true_filter(self, receiver, message):
         return True
 
-    def __init__(self, thread_pool_size, del_func, filter_func=None):
+    def __init__(self, thread_pool_size, del_func, filter_func=None,
+                 queue_size=None, overflow='block'):
         """
         Construct a new pool.
 
@@ -89,6 +109,15 @@ class OrderedQueueDispatcherPool:
                 First is the receiver of a message, second is the message to
                 filter. Must return a bool, true means to deliver the message,
                 false rejects it.
+            queue_size (int or None):
+                The maximum number of messages queued per receiver or
+                ``None`` for unbounded queues.
+            overflow (str):
+                What to do when a message is pushed while the queue of a
+                receiver is full: ``'block'`` waits until the receiver has
+                processed a message, whereas ``'drop-oldest'`` and
+                ``'drop-newest'`` discard the oldest queued or the new
+                message respectively.
         """
 
         self._logger = get_logger_by_class(self.__class__)
@@ -98,26 +127,78 @@ class OrderedQueueDispatcherPool:
                              "{} was given.".format(thread_pool_size))
         self._thread_pool_size = int(thread_pool_size)
 
+        if queue_size is not None and queue_size < 1:
+            raise ValueError("Queue size must be at least 1, "
+                             "{} was given.".format(queue_size))
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError("Overflow policy must be one of {}, "
+                             "{} was given.".format(
+                                 ", ".join(self.OVERFLOW_POLICIES), overflow))
+        self._queue_size = queue_size
+        self._overflow = overflow
+
         self._del_func = del_func
         if filter_func is not None:
             self._filter_func = filter_func
         else:
             self._filter_func = self._true_filter
 
-        self._condition = Condition()
+        lock = Lock()
+        self._condition = Condition(lock)
+        self._not_full = Condition(lock)
         self._receivers = []
+        # Maps ids of receiver objects to their registrations for push_to.
+        self._registrations = {}
+        self._ready = deque()
 
-        self._jobsAvailable = False
+        self._dropped_messages = 0
+        self._max_queue_depth = 0
 
         self._started = False
         self._interrupted = False
 
         self._threadPool = []
 
-        self._currentPosition = 0
-
     def __del__(self):
-        self.stop()
+        # The constructor may have failed before creating the condition.
+        if getattr(self, '_condition', None) is not None:
+            self.stop()
+
+    @property
+    def queue_depth(self):
+        """
+        Return the number of messages queued for all receivers.
+
+        Returns:
+            int:
+                The current number of queued messages.
+        """
+        with self._condition:
+            return sum(len(r.queue) for r in self._receivers)
+
+    @property
+    def max_queue_depth(self):
+        """
+        Return the largest number of messages queued for one receiver.
+
+        Returns:
+            int:
+                The high-water mark of the receiver queues.
+        """
+        return self._max_queue_depth
+
+    @property
+    def dropped_messages(self):
+        """
+        Return the number of messages discarded by the overflow policy.
+
+        Each receiver for which a message is discarded counts separately.
+
+        Returns:
+            int:
+                The number of discarded messages.
+        """
+        return self._dropped_messages
 
     def register_receiver(self, receiver):
         """
@@ -133,8 +214,12 @@ class OrderedQueueDispatcherPool:
                 new receiver
         """
 
+        registration = self._Receiver(receiver)
         with self._condition:
-            self._receivers.append(self._Receiver(receiver))
+            # Copy on write so that push can iterate without copying.
+            self._receivers = self._receivers + [registration]
+            self._registrations[id(receiver)] = \
+                self._registrations.get(id(receiver), ()) + (registration,)
 
         self._logger.info("Registered receiver %s", receiver)
 
@@ -150,22 +235,29 @@ class OrderedQueueDispatcherPool:
             True if one or more receivers were unregistered, else False
         """
 
-        removed = None
+        removed = []
         with self._condition:
             kept = []
             for r in self._receivers:
                 if r.receiver == receiver:
-                    removed = r
+                    # Pending messages are discarded. The receiver is
+                    # skipped if it is still in the ready queue.
+                    r.removed = True
+                    r.queue.clear()
+                    self._not_full.notify_all()
+                    removed.append(r)
                 else:
                     kept.append(r)
             self._receivers = kept
-        if removed:
-            with removed.processing_condition:
-                while removed.processing:
+            for r in removed:
+                self._registrations.pop(id(r.receiver), None)
+        for r in removed:
+            with r.processing_condition:
+                while r.processing:
                     self._logger.info("Waiting for receiver %s to finish",
                                       receiver)
-                    removed.processing_condition.wait()
-        return not (removed is None)
+                    r.processing_condition.wait()
+        return bool(removed)
 
     def push(self, message):
         """
@@ -177,10 +269,7 @@ class OrderedQueueDispatcherPool:
         """
 
         with self._condition:
-            for receiver in self._receivers:
-                receiver.queue.put(message)
-            self._jobsAvailable = True
-            self._condition.notify()
+            self._enqueue(self._receivers, message)
 
         # XXX: This is disabled because it can trigger this bug for protocol
         # buffers payloads:
@@ -188,6 +277,75 @@ class OrderedQueueDispatcherPool:
         # See also #1331
         # self._logger.debug("Got new message to dispatch: %s", message)
 
+    def push_to(self, receiver, message):
+        """
+        Push a new message to be dispatched to one receiver in this pool.
+
+        Messages pushed to one receiver this way and via :meth:`push` are
+        delivered in the order they were pushed.
+
+        Args:
+            receiver:
+                the receiver object as passed to :meth:`register_receiver`
+            message:
+                message to dispatch
+
+        Raises:
+            KeyError:
+                if ``receiver`` is not registered
+        """
+
+        with self._condition:
+            self._enqueue(self._registrations[id(receiver)], message)
+
+    def _enqueue(self, receivers, message):
+        """
+        Queue ``message`` for ``receivers`` and wake up workers.
+
+        Must be called with the pool lock held.
+        """
+        capacity = self._queue_size
+        ready = 0
+        for receiver in receivers:
+            queue = receiver.queue
+            if capacity is not None and len(queue) >= capacity:
+                if not self._make_room(receiver):
+                    continue
+            queue.append(message)
+            if len(queue) > self._max_queue_depth:
+                self._max_queue_depth = len(queue)
+            if not receiver.scheduled:
+                receiver.scheduled = True
+                self._ready.append(receiver)
+                ready += 1
+        if ready:
+            self._condition.notify(ready)
+
+    def _make_room(self, receiver):
+        """
+        Apply the overflow policy to the full queue of ``receiver``.
+
+        Must be called with the pool lock held.
+
+        Returns:
+            bool:
+                ``True`` if the new message should be queued for
+                ``receiver``, ``False`` if it has been discarded.
+        """
+        queue = receiver.queue
+        if self._overflow == 'block':
+            # Messages are queued beyond the capacity while the pool is
+            # stopped since no worker would make room.
+            while len(queue) >= self._queue_size and not receiver.removed \
+                    and self._started and not self._interrupted:
+                self._not_full.wait()
+            return not receiver.removed
+        self._dropped_messages += 1
+        if self._overflow == 'drop-oldest':
+            queue.popleft()
+            return True
+        return False
+
     def _next_job(self, worker_num):
         """
         Return the next job to process for worker threads.
@@ -199,55 +357,46 @@ class OrderedQueueDispatcherPool:
                 number of the worker requesting a new job
 
         Returns:
-            the receiver to work on
+            tuple of the receiver to work on and the message to deliver
         """
 
-        receiver = None
         with self._condition:
-
-            got_job = False
-            while not got_job:
-
-                while (not self._jobsAvailable) and (not self._interrupted):
+            while True:
+                while not self._ready and not self._interrupted:
                     self._logger.debug(
                         "Worker %d: no jobs available, waiting", worker_num)
                     self._condition.wait()
 
-                if (self._interrupted):
+                if self._interrupted:
                     raise _InterruptedError("Processing was interrupted")
 
-                # search the next job
-                for _ in range(len(self._receivers)):
-
-                    self._currentPosition = self._currentPosition + 1
-                    real_pos = self._currentPosition % len(self._receivers)
-
-                    if (not self._receivers[real_pos].processing) and \
-                            (not self._receivers[real_pos].queue.empty()):
-
-                        receiver = self._receivers[real_pos]
-                        receiver.processing = True
-                        got_job = True
-                        break
-
-                if not got_job:
-                    self._jobsAvailable = False
-
-            self._condition.notify()
-            return receiver
+                receiver = self._ready.popleft()
+                if receiver.removed:
+                    receiver.scheduled = False
+                    continue
+                receiver.processing = True
+                if self._queue_size is not None:
+                    self._not_full.notify_all()
+                return receiver, receiver.queue.popleft()
 
     def _finished_work(self, receiver, worker_num):
 
         with self._condition:
-
-            with receiver.processing_condition:
-                receiver.processing = False
-                receiver.processing_condition.notifyAll()
-            if not receiver.queue.empty():
-                self._jobsAvailable = True
+            receiver.processing = False
+            if receiver.queue:
+                # The receiver still has work and goes to the end of the
+                # ready queue so that other receivers are not starved.
+                self._ready.append(receiver)
                 self._logger.debug("Worker %d: new jobs available, "
                                    "notifying one", worker_num)
                 self._condition.notify()
+            else:
+                receiver.scheduled = False
+            removed = receiver.removed
+
+        if removed:
+            with receiver.processing_condition:
+                receiver.processing_condition.notify_all()
 
     def _worker(self, worker_num):
         """
@@ -262,8 +411,7 @@ class OrderedQueueDispatcherPool:
 
             while True:
 
-                receiver = self._next_job(worker_num)
-                message = receiver.queue.get(True, None)
+                receiver, message = self._next_job(worker_num)
                 self._logger.debug(
                     "Worker %d: got message %s for receiver %s",
                     worker_num, message, receiver.receiver)
@@ -316,6 +464,7 @@ class OrderedQueueDispatcherPool:
         with self._condition:
             self._interrupted = True
             self._condition.notifyAll()
+            self._not_full.notify_all()
 
         for worker in self._threadPool:
             self._logger.debug("Joining worker %s", worker)
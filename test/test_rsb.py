@@ -21,6 +21,8 @@
 
 import copy
 import os
+import pickle
+import threading
 from threading import Condition
 import time
 import uuid
@@ -33,6 +35,7 @@ from rsb import (Event,
                  EventId,
                  get_default_participant_config,
                  Informer,
+                 LazyData,
                  MetaData,
                  Participant,
                  ParticipantConfig,
@@ -119,6 +122,17 @@ class TestParticipantConfig:
             QualityOfServiceSpec.Reliability.RELIABLE
         assert not config.get_transport('spread').enabled
 
+    def test_receiving_options(self):
+        config = ParticipantConfig.from_dict({})
+        assert config.receive_queue_size is None
+        assert config.receive_overflow == 'block'
+
+        config = ParticipantConfig.from_dict(
+            {'receiving.queuesize': '10',
+             'receiving.overflow': 'drop-oldest'})
+        assert config.receive_queue_size == 10
+        assert config.receive_overflow == 'drop-oldest'
+
     def test_from_default_source(self):
         # TODO how to test this?
         pass
@@ -152,10 +166,10 @@ class TestQualityOfServiceSpec:
 class TestScope:
 
     @pytest.mark.parametrize('str_repr,components', [
-        ('/', []),
-        ('/test/', ['test']),
-        ('/this/is/a/dumb3/test/', ['this', 'is', 'a', 'dumb3', 'test']),
-        ('/this/is', ['this', 'is']),  # shortcut syntax without slash
+        ('/', ()),
+        ('/test/', ('test',)),
+        ('/this/is/a/dumb3/test/', ('this', 'is', 'a', 'dumb3', 'test')),
+        ('/this/is', ('this', 'is')),  # shortcut syntax without slash
     ])
     def test_parsing(self, str_repr, components):
         scope = rsb.Scope(str_repr)
@@ -240,6 +254,33 @@ class TestScope:
         assert hash(Scope("/")) != hash(Scope("/foo"))
         assert hash(Scope("/bla/foo")) == hash(Scope("/bla/foo/"))
 
+    def test_interning(self):
+        scope = Scope('/intern/me/')
+        assert Scope('/intern/me/') is scope
+        assert Scope('/intern/me') is scope
+        assert Scope(b'/intern/me/') is scope
+        assert Scope('/intern/').concat(Scope('/me')) is scope
+        assert scope.super_scopes(True)[-1] is scope
+
+    def test_bytes(self):
+        assert Scope(b'/foo/bar').to_string() == '/foo/bar/'
+        assert Scope('/foo/bar').to_bytes() == b'/foo/bar/'
+        with pytest.raises(ValueError):
+            Scope(b'/br\xc3\xb6tchen')
+        assert Scope(bytearray(b'/foo/bar')) is Scope('/foo/bar')
+        assert Scope(memoryview(b'/foo/bar')) is Scope('/foo/bar')
+        with pytest.raises(ValueError):
+            Scope(bytearray(b'foo'))
+        with pytest.raises(TypeError):
+            Scope(5)
+
+    def test_immutable(self):
+        scope = Scope('/foo')
+        with pytest.raises(AttributeError):
+            scope._components = ('bar',)
+        assert copy.copy(scope) is scope
+        assert pickle.loads(pickle.dumps(scope)) == scope
+
     @pytest.mark.parametrize('scope,supers', [
         (rsb.Scope('/'),
          [rsb.Scope('/')]),
@@ -281,9 +322,36 @@ class TestEventId:
         assert id1.get_as_uuid() != id4.get_as_uuid()
         assert id3.get_as_uuid() != id4.get_as_uuid()
 
+    def test_hash_invalidation(self):
+
+        event_id = EventId(uuid.uuid4(), 23)
+        hash(event_id)
+        event_id.sequence_number = 24
+        assert hash(event_id) == hash(EventId(event_id.participant_id, 24))
+        old_uuid = event_id.get_as_uuid()
+        event_id.participant_id = uuid.uuid4()
+        assert hash(event_id) == hash(EventId(event_id.participant_id, 24))
+        assert event_id.get_as_uuid() != old_uuid
+
 
 class TestEvent:
 
+    def test_slots(self):
+
+        event = Event(EventId(uuid.uuid4(), 0))
+        for obj in (event, event.event_id, event.meta_data):
+            assert not hasattr(obj, '__dict__')
+            with pytest.raises(AttributeError):
+                obj.no_such_attribute = 1
+
+    def test_copy(self):
+
+        event = Event(EventId(uuid.uuid4(), 0), data=1,
+                      user_infos={'foo': 'bar'}, causes=[])
+        result = copy.copy(event)
+        assert result == event
+        assert result.meta_data is event.meta_data
+
     def test_constructor(self):
         e = Event()
         assert e.data is None
@@ -321,6 +389,22 @@ class TestEvent:
         assert not e.is_cause(cause)
         assert len(e.causes) == 0
 
+    def test_lazy_data(self):
+        calls = []
+
+        def decode():
+            calls.append(None)
+            return 42
+
+        e = Event(data=LazyData(decode))
+        assert calls == []
+        assert e.data == 42
+        assert e.data == 42
+        assert len(calls) == 1
+
+        e.data = 'foo'
+        assert e.data == 'foo'
+
     def test_comparison(self):
 
         sid = uuid.uuid4()
@@ -447,6 +531,30 @@ class TestMetaData:
         meta2.set_user_info("foox", meta1.user_infos["foox"])
         assert meta1 == meta2
 
+    def test_lazy_user_dicts(self):
+
+        meta = MetaData()
+        assert meta._user_times is None
+        assert meta._user_infos is None
+        assert meta == MetaData(create_time=meta.create_time,
+                                user_times={}, user_infos={})
+
+        meta.user_infos['foo'] = 'bar'
+        assert meta.user_infos == {'foo': 'bar'}
+
+    def test_copy(self):
+
+        meta = MetaData()
+        meta.set_user_info('foo', 'bar')
+        result = copy.copy(meta)
+        assert result == meta
+        result.set_user_info('foo', 'baz')
+        assert meta.user_infos == {'foo': 'bar'}
+
+        result = copy.copy(MetaData())
+        assert result._user_infos is None
+        assert result._user_times is None
+
 
 class TestInformer:
 
@@ -492,6 +600,163 @@ class TestInformer:
         # OK
         self.informer.publish_data('bla')
 
+    def test_publish_many(self):
+        first = self.informer.publish_data('a').event_id.sequence_number
+
+        events = self.informer.publish_many(
+            ['b', Event(scope=self.default_scope.concat(Scope('/sub')),
+                        data='c', data_type=str)])
+        assert [event.data for event in events] == ['b', 'c']
+        assert [event.event_id.sequence_number for event in events] == \
+            [first + 1, first + 2]
+        assert events[0].scope == self.default_scope
+
+        # Nothing is sent if one of the items is invalid.
+        with pytest.raises(ValueError):
+            self.informer.publish_many(['d', 5])
+        assert self.informer.publish_data('e').event_id.sequence_number == \
+            first + 3
+
+        assert self.informer.publish_many([]) == []
+
+    def test_publish_inactive(self):
+        informer = Informer(self.default_scope,
+                            rsb.get_default_participant_config(),
+                            data_type=str)
+        informer.deactivate()
+        with pytest.raises(RuntimeError):
+            informer.publish_data('a')
+        with pytest.raises(RuntimeError):
+            informer.publish_many(['a'])
+
+
+class TestAsyncInformer:
+
+    @pytest.mark.timeout(10)
+    def test_publish(self):
+        scope = Scope('/async/informer')
+        config = rsb.get_default_participant_config()
+        strategy = rsb.eventprocessing.AsyncEventSendingStrategy()
+        received = []
+        condition = Condition()
+
+        def receive(event):
+            with condition:
+                received.append(event.data)
+                condition.notify_all()
+
+        with rsb.create_listener(scope, config) as listener, \
+                rsb.create_informer(scope, config, data_type=str,
+                                    sending_strategy=strategy) as informer:
+            listener.add_handler(receive)
+
+            assert informer.publish_data('a').data == 'a'
+            event = informer.publish_data('b', future=True).get(5)
+            assert event.data == 'b'
+            strategy.flush()
+            with condition:
+                condition.wait_for(lambda: len(received) == 2, 5)
+            assert received == ['a', 'b']
+            assert strategy.sent_events == 2
+
+
+class TestBoundedListener:
+
+    @pytest.mark.timeout(10)
+    def test_drop_oldest(self):
+        scope = Scope('/bounded/listener')
+        config = rsb.get_default_participant_config()
+        gate = threading.Event()
+        entered = threading.Event()
+        received = []
+        condition = Condition()
+
+        def receive(event):
+            entered.set()
+            gate.wait()
+            with condition:
+                received.append(event.data)
+                condition.notify_all()
+
+        with rsb.create_listener(scope, config, queue_size=2,
+                                 overflow='drop-oldest') as listener, \
+                rsb.create_informer(scope, config,
+                                    data_type=int) as informer:
+            listener.add_handler(receive)
+
+            informer.publish_data(0)
+            entered.wait(5)
+            for i in range(1, 6):
+                informer.publish_data(i)
+            assert listener.dropped_events == 3
+            assert listener.max_queue_depth == 2
+
+            gate.set()
+            with condition:
+                condition.wait_for(lambda: len(received) == 3, 5)
+            assert received == [0, 4, 5]
+
+    def test_config(self):
+        config = rsb.get_default_participant_config()
+        config = copy.deepcopy(config)
+        config.receive_queue_size = 0
+        with pytest.raises(ValueError):
+            rsb.create_listener('/bounded/listener', config)
+
+
+class TestBatchListener:
+
+    @pytest.mark.timeout(10)
+    def test_add_batch_handler(self):
+        scope = Scope('/batch/listener')
+        config = rsb.get_default_participant_config()
+        batches = []
+        condition = Condition()
+
+        def receive(batch):
+            with condition:
+                batches.append([event.data for event in batch])
+                condition.notify_all()
+
+        with rsb.create_listener(scope, config) as listener, \
+                rsb.create_informer(scope, config,
+                                    data_type=int) as informer:
+            listener.add_filter(rsb.filter.MethodFilter(method='KEEP'))
+            listener.add_batch_handler(receive, max_batch=3,
+                                       max_latency=None)
+            for i in range(7):
+                informer.publish_event(Event(
+                    scope=scope, data=i, data_type=int,
+                    method='KEEP' if i % 4 else 'SKIP'))
+            with condition:
+                condition.wait_for(lambda: batches, 5)
+            assert batches == [[1, 2, 3]]
+            # Wait for the remaining events to reach the batch.
+            time.sleep(0.1)
+
+            # Removing the handler delivers the incomplete batch.
+            listener.remove_handler(receive)
+            assert batches == [[1, 2, 3], [5, 6]]
+            assert listener.get_handlers() == []
+
+            informer.publish_data(8)
+        assert len(batches) == 2
+
+    @pytest.mark.timeout(10)
+    def test_deactivate_flushes(self):
+        scope = Scope('/batch/listener')
+        config = rsb.get_default_participant_config()
+        batches = []
+
+        with rsb.create_listener(scope, config) as listener, \
+                rsb.create_informer(scope, config,
+                                    data_type=int) as informer:
+            listener.add_batch_handler(batches.append, max_latency=None)
+            informer.publish_data(1)
+            time.sleep(0.1)
+        assert [[event.data for event in batch] for batch in batches] == \
+            [[1]]
+
 
 class TetsIntegration:
 
@@ -18,6 +18,11 @@
 #
 # ============================================================
 
+import collections
+import functools
+import os
+import random
+import threading
 from threading import Condition
 import time
 import uuid
@@ -25,10 +30,52 @@ import uuid
 import pytest
 
 import rsb
-from rsb import Event, EventId
+from rsb import Event, EventId, Scope
 import rsb.eventprocessing
 from rsb.eventprocessing import FullyParallelEventReceivingStrategy
+from rsb.eventprocessing import InlineEventReceivingStrategy
+from rsb.eventprocessing import PartitionedEventReceivingStrategy
+from rsb.eventprocessing import ProcessPoolEventReceivingStrategy
 from rsb.filter import RecordingFalseFilter, RecordingTrueFilter
+from rsb.patterns.future import FutureExecutionError
+
+
+class TestScopeTrie:
+
+    def test_matching(self):
+        trie = rsb.eventprocessing.ScopeTrie()
+        trie.add(rsb.Scope('/'), 0)
+        trie.add(rsb.Scope('/foo'), 1)
+        trie.add(rsb.Scope('/foo/bar'), 2)
+        trie.add(rsb.Scope('/baz'), 3)
+        assert len(trie) == 4
+        assert list(trie.matching(rsb.Scope('/'))) == [0]
+        assert list(trie.matching(rsb.Scope('/foo/bar/fez'))) == [0, 1, 2]
+        assert list(trie.matching(rsb.Scope('/foobar'))) == [0]
+        assert list(trie.matching_components(['baz'])) == [0, 3]
+        assert set(trie.values) == {0, 1, 2, 3}
+
+    def test_remove(self):
+        trie = rsb.eventprocessing.ScopeTrie()
+        trie.add(rsb.Scope('/foo/bar'), 1)
+        trie.add(rsb.Scope('/foo/bar'), 2)
+        trie.remove(rsb.Scope('/foo/bar'), 1)
+        assert list(trie.matching(rsb.Scope('/foo/bar'))) == [2]
+        trie.remove(rsb.Scope('/foo/bar'), 2)
+        assert not trie
+        assert not trie._root.children
+        with pytest.raises(ValueError):
+            trie.remove(rsb.Scope('/foo/bar'), 2)
+        with pytest.raises(ValueError):
+            trie.remove(rsb.Scope('/'), 2)
+
+    def test_many_scopes(self):
+        trie = rsb.eventprocessing.ScopeTrie()
+        for i in range(20000):
+            trie.add(rsb.Scope('/sensors/s{}/data'.format(i)), i)
+        assert list(trie.matching(
+            rsb.Scope('/sensors/s1234/data/left'))) == [1234]
+        assert list(trie.matching(rsb.Scope('/sensors/s1234'))) == []
 
 
 class TestScopeDispatcher:
@@ -276,6 +323,680 @@ class TestOutRouteConfigurator:
         assert RecordingOutConnector.last_event is None
 
 
+class GatedConnector(MockConnector):
+    # Records the batches it receives and blocks while the gate is
+    # closed.
+
+    def __init__(self, error=None):
+        self.batches = []
+        self.gate = threading.Event()
+        self.entered = threading.Event()
+        self.error = error
+
+    def handle_many(self, events):
+        self.entered.set()
+        self.gate.wait()
+        if self.error:
+            raise self.error
+        self.batches.append(list(events))
+
+
+class TestAsyncEventSendingStrategy:
+
+    @staticmethod
+    def _make(connector, **kwargs):
+        strategy = rsb.eventprocessing.AsyncEventSendingStrategy(**kwargs)
+        strategy.add_connector(connector)
+        return strategy
+
+    @pytest.mark.timeout(5)
+    def test_batches(self):
+        connector = GatedConnector()
+        strategy = self._make(connector)
+
+        # While the sender is busy with the first event, the others
+        # are queued and sent as one batch.
+        strategy.handle(0)
+        connector.entered.wait()
+        strategy.handle_many([1, 2, 3])
+        strategy.handle(4)
+        assert strategy.queue_depth == 4
+        connector.gate.set()
+        strategy.flush()
+
+        assert connector.batches == [[0], [1, 2, 3, 4]]
+        assert strategy.queue_depth == 0
+        assert strategy.max_queue_depth == 4
+        assert strategy.sent_events == 5
+        assert strategy.dropped_events == 0
+        assert 0 < strategy.mean_latency <= strategy.max_latency
+        strategy.deactivate()
+
+    @pytest.mark.timeout(5)
+    def test_max_batch_size(self):
+        connector = GatedConnector()
+        strategy = self._make(connector, max_batch_size=2)
+
+        strategy.handle(0)
+        connector.entered.wait()
+        strategy.handle_many([1, 2, 3])
+        connector.gate.set()
+        strategy.flush()
+
+        assert connector.batches == [[0], [1, 2], [3]]
+        strategy.deactivate()
+
+    @pytest.mark.parametrize('overflow,expected', [
+        ('drop-oldest', [[0], [2, 3]]),
+        ('drop-newest', [[0], [1, 2]]),
+    ])
+    @pytest.mark.timeout(5)
+    def test_overflow_drop(self, overflow, expected):
+        connector = GatedConnector()
+        strategy = self._make(connector, queue_size=2, overflow=overflow)
+
+        strategy.handle(0)
+        connector.entered.wait()
+        futures = [strategy.submit(i) for i in (1, 2, 3)]
+        assert strategy.dropped_events == 1
+        connector.gate.set()
+        strategy.flush()
+
+        assert connector.batches == expected
+        for (i, future) in enumerate(futures, 1):
+            if i in expected[1]:
+                assert future.get(1) == i
+            else:
+                with pytest.raises(FutureExecutionError):
+                    future.get(1)
+        strategy.deactivate()
+
+    @pytest.mark.timeout(5)
+    def test_overflow_block(self):
+        connector = GatedConnector()
+        strategy = self._make(connector, queue_size=1)
+
+        strategy.handle(0)
+        connector.entered.wait()
+        strategy.handle(1)
+        sender = threading.Thread(target=strategy.handle, args=(2,))
+        sender.start()
+        sender.join(0.1)
+        assert sender.is_alive()
+
+        connector.gate.set()
+        sender.join()
+        strategy.flush()
+        assert sum(connector.batches, []) == [0, 1, 2]
+        assert strategy.dropped_events == 0
+        strategy.deactivate()
+
+    @pytest.mark.timeout(5)
+    def test_submit_error(self):
+        connector = GatedConnector(error=RuntimeError('broken'))
+        connector.gate.set()
+        strategy = self._make(connector)
+
+        with pytest.raises(FutureExecutionError):
+            strategy.submit(0).get(1)
+        strategy.deactivate()
+
+    @pytest.mark.timeout(5)
+    def test_deactivate(self):
+        connector = GatedConnector()
+        strategy = self._make(connector)
+
+        strategy.handle(0)
+        connector.entered.wait()
+        strategy.handle(1)
+        connector.gate.set()
+
+        # Queued events are sent before the sender thread stops.
+        strategy.deactivate()
+        assert sum(connector.batches, []) == [0, 1]
+        with pytest.raises(RuntimeError):
+            strategy.handle(2)
+
+    @pytest.mark.timeout(5)
+    def test_deactivate_while_blocked(self):
+        connector = GatedConnector()
+        strategy = self._make(connector, queue_size=1)
+
+        strategy.handle(0)
+        connector.entered.wait()
+        strategy.handle(1)
+        futures = []
+        sender = threading.Thread(
+            target=lambda: futures.append(strategy.submit(2)))
+        sender.start()
+        sender.join(0.1)
+        assert sender.is_alive()
+
+        # Deactivating releases the blocked sender without sending its
+        # event.
+        deactivator = threading.Thread(target=strategy.deactivate)
+        deactivator.start()
+        sender.join()
+        with pytest.raises(FutureExecutionError):
+            futures[0].get(1)
+        connector.gate.set()
+        deactivator.join()
+        assert sum(connector.batches, []) == [0, 1]
+
+    @pytest.mark.timeout(5)
+    def test_conflation(self):
+        connector = GatedConnector()
+        strategy = self._make(connector, conflate=True)
+
+        def event(scope, data):
+            return Event(scope=scope, data=data)
+
+        strategy.handle(event('/a', 0))
+        connector.entered.wait()
+        futures = [strategy.submit(event(scope, data))
+                   for (scope, data) in [('/a', 1), ('/b', 1), ('/a', 2)]]
+        strategy.handle_many([event('/a', 3), event('/a/c', 1)])
+        assert strategy.queue_depth == 3
+        assert strategy.conflated_events == 2
+        connector.gate.set()
+        strategy.flush()
+
+        assert [[(e.scope.to_string(), e.data) for e in batch]
+                for batch in connector.batches] == \
+            [[('/a/', 0)], [('/a/', 3), ('/b/', 1), ('/a/c/', 1)]]
+        with pytest.raises(FutureExecutionError):
+            futures[0].get(1)
+        assert futures[1].get(1).data == 1
+        with pytest.raises(FutureExecutionError):
+            futures[2].get(1)
+        strategy.deactivate()
+
+    @pytest.mark.timeout(5)
+    def test_conflation_key(self):
+        connector = GatedConnector()
+        strategy = self._make(
+            connector, conflate=lambda event: event.data % 2 or None)
+
+        strategy.handle(Event(data=0))
+        connector.entered.wait()
+        strategy.handle_many([Event(data=i) for i in range(1, 7)])
+        connector.gate.set()
+        strategy.flush()
+
+        # Odd numbers are conflated, even ones are not.
+        assert [[e.data for e in batch] for batch in connector.batches] == \
+            [[0], [5, 2, 4, 6]]
+        assert strategy.conflated_events == 2
+        strategy.deactivate()
+
+    def test_invalid_options(self):
+        strategy_class = rsb.eventprocessing.AsyncEventSendingStrategy
+        with pytest.raises(ValueError):
+            strategy_class(queue_size=0)
+        with pytest.raises(ValueError):
+            strategy_class(overflow='disconnect')
+        with pytest.raises(ValueError):
+            strategy_class(max_batch_size=0)
+        with pytest.raises(ValueError):
+            strategy_class(conflate='scope')
+
+    @pytest.mark.timeout(5)
+    def test_configurator(self):
+        connector = GatedConnector()
+        connector.gate.set()
+        strategy = rsb.eventprocessing.AsyncEventSendingStrategy()
+        configurator = rsb.eventprocessing.OutRouteConfigurator(
+            connectors=[connector], sending_strategy=strategy)
+        configurator.activate()
+
+        assert configurator.submit(1).get(1) == 1
+        configurator.handle(2)
+        configurator.handle_many([3, 4])
+
+        # Deactivation sends the queued events.
+        configurator.deactivate()
+        assert sum(connector.batches, []) == [1, 2, 3, 4]
+
+
+class TestPartitionedEventReceivingStrategy:
+
+    @pytest.mark.timeout(10)
+    def test_order_per_key(self):
+        strategy = PartitionedEventReceivingStrategy(num_lanes=4)
+        received = collections.defaultdict(list)
+        lock = threading.Lock()
+        done = threading.Event()
+        scopes = [Scope('/sensor/{}'.format(i)) for i in range(4)]
+
+        def handler(event):
+            time.sleep(random.random() * 0.001)
+            with lock:
+                received[event.scope].append(event.data)
+                if sum(map(len, received.values())) == 200:
+                    done.set()
+
+        strategy.add_handler(handler, True)
+        for i in range(50):
+            for scope in scopes:
+                strategy.handle(Event(scope=scope, data=i))
+        assert done.wait(5)
+        strategy.deactivate()
+
+        for scope in scopes:
+            assert received[scope] == list(range(50))
+
+    @pytest.mark.timeout(10)
+    def test_parallel_keys(self):
+        strategy = PartitionedEventReceivingStrategy(
+            num_lanes=2, key=lambda event: event.data)
+        gate = threading.Event()
+        received = []
+
+        def handler(event):
+            if event.data == 0:
+                gate.wait()
+            received.append(event.data)
+
+        strategy.add_handler(handler, True)
+        # The lane of key 0 is blocked, the lane of key 1 is not.
+        strategy.handle(Event(data=0))
+        strategy.handle(Event(data=1))
+        while received != [1]:
+            time.sleep(0.01)
+        gate.set()
+        while len(received) < 2:
+            time.sleep(0.01)
+        assert received == [1, 0]
+        strategy.deactivate()
+
+    def test_user_info_key(self):
+        strategy = PartitionedEventReceivingStrategy(key='robot')
+        event = Event()
+        event.meta_data.set_user_info('robot', 'r2d2')
+        assert strategy._key(event) == 'r2d2'
+        assert strategy._key(Event()) is None
+        strategy.deactivate()
+
+    @pytest.mark.timeout(10)
+    def test_filtering_and_removal(self):
+        strategy = PartitionedEventReceivingStrategy()
+        received = []
+        handler = received.append
+        strategy.add_handler(handler, True)
+
+        false_filter = RecordingFalseFilter()
+        strategy.add_filter(false_filter)
+        strategy.handle(Event(data=1))
+        with false_filter.condition:
+            false_filter.condition.wait_for(lambda: false_filter.events, 5)
+        strategy.remove_filter(false_filter)
+
+        strategy.handle(Event(data=2))
+        while not received:
+            time.sleep(0.01)
+        strategy.remove_handler(handler, True)
+        strategy.handle(Event(data=3))
+        strategy.deactivate()
+        assert [event.data for event in received] == [2]
+
+    @pytest.mark.parametrize('options', [
+        {'num_lanes': 0},
+        {'num_threads': 0},
+        {'key': 42},
+        {'queue_size': 0},
+        {'overflow': 'reject'},
+    ])
+    def test_invalid_options(self, options):
+        with pytest.raises(ValueError):
+            PartitionedEventReceivingStrategy(**options)
+
+
+def _record_in_file(path, event):
+    # Runs in the worker processes of ProcessPoolEventReceivingStrategy.
+    if event.data == 'fail':
+        raise RuntimeError('intentional error')
+    if event.data == 'exit':
+        os._exit(1)
+    with open(path, 'a') as stream:
+        stream.write('{} {} {}\n'.format(os.getpid(), event.scope.to_string(),
+                                         event.data))
+
+
+class _CountingHandler:
+    # Counts how often handlers are pickled in the parent process.
+    pickles = 0
+
+    def __init__(self, path):
+        self.path = path
+
+    def __getstate__(self):
+        type(self).pickles += 1
+        return self.__dict__
+
+    def __call__(self, event):
+        _record_in_file(self.path, event)
+
+
+class TestProcessPoolEventReceivingStrategy:
+
+    def _records(self, path):
+        with open(path) as stream:
+            return [line.split() for line in stream]
+
+    @pytest.mark.timeout(20)
+    def test_unordered(self, tmp_path):
+        path = str(tmp_path / 'records')
+        strategy = ProcessPoolEventReceivingStrategy(num_processes=2)
+        strategy.add_handler(functools.partial(_record_in_file, path), True)
+        strategy.add_filter(rsb.filter.MethodFilter(method='KEEP'))
+        for i in range(20):
+            strategy.handle(Event(scope=Scope('/a'), data=i,
+                                  method='KEEP' if i % 2 else 'SKIP'))
+        strategy.deactivate()
+
+        records = self._records(path)
+        assert sorted(int(data) for (_, _, data) in records) == \
+            list(range(1, 20, 2))
+        assert os.getpid() not in {int(pid) for (pid, _, _) in records}
+        assert strategy.processed_events == 10
+        assert strategy.in_flight == 0
+        utilization = strategy.worker_utilization
+        assert len(utilization) == 2
+        assert all(0 <= u <= 1 for u in utilization)
+
+    @pytest.mark.timeout(20)
+    def test_ordered(self, tmp_path):
+        path = str(tmp_path / 'records')
+        strategy = ProcessPoolEventReceivingStrategy(
+            num_processes=3, ordered=True, max_in_flight=4)
+        strategy.add_handler(functools.partial(_record_in_file, path), True)
+        scopes = [Scope('/sensor/{}'.format(i)) for i in range(3)]
+        for i in range(30):
+            strategy.handle(Event(scope=scopes[i % 3], data=i))
+            assert strategy.in_flight <= 4
+        strategy.deactivate()
+
+        by_scope = collections.defaultdict(list)
+        pids = collections.defaultdict(set)
+        for (pid, scope, data) in self._records(path):
+            by_scope[scope].append(int(data))
+            pids[scope].add(pid)
+        for i, scope in enumerate(scopes):
+            assert by_scope[scope.to_string()] == list(range(i, 30, 3))
+            assert len(pids[scope.to_string()]) == 1
+
+    @pytest.mark.timeout(20)
+    def test_wire_data(self, tmp_path):
+        path = str(tmp_path / 'records')
+        converter = rsb.converter.get_global_converter_map(bytes) \
+            .get_converter_for_data_type(str)
+        wire_data, wire_schema = converter.serialize('decoded')
+        data = rsb.LazyData.from_wire(converter, wire_data, wire_schema)
+        event = Event(scope=Scope('/a'), data=data)
+
+        strategy = ProcessPoolEventReceivingStrategy(num_processes=1)
+        strategy.add_handler(functools.partial(_record_in_file, path), True)
+        strategy.handle(event)
+        strategy.deactivate()
+
+        assert self._records(path)[0][2] == 'decoded'
+        # The payload has only been decoded in the worker process.
+        assert not data.decoded
+
+    @pytest.mark.timeout(20)
+    def test_unpicklable_wire_data(self, tmp_path):
+        path = str(tmp_path / 'records')
+        converter = rsb.converter.get_global_converter_map(bytes) \
+            .get_converter_for_data_type(str)
+        strategy = ProcessPoolEventReceivingStrategy(num_processes=1,
+                                                     max_in_flight=2)
+        strategy.add_handler(functools.partial(_record_in_file, path), True)
+
+        # Memoryviews are sent as bytes.
+        for i in range(3):
+            wire_data, wire_schema = converter.serialize(str(i))
+            data = rsb.LazyData.from_wire(converter, memoryview(wire_data),
+                                          wire_schema)
+            strategy.handle(Event(scope=Scope('/a'), data=data))
+
+        # Events which cannot be sent do not remain in flight.
+        class LocalConverter:
+
+            def deserialize(self, wire_data, wire_schema):
+                return None
+
+        data = rsb.LazyData.from_wire(LocalConverter(), b'', 'unpicklable')
+        for _ in range(3):
+            with pytest.raises(Exception):
+                strategy.handle(Event(scope=Scope('/a'), data=data))
+            assert strategy.in_flight <= 2
+        strategy.deactivate()
+
+        assert strategy.in_flight == 0
+        assert strategy.processed_events == 3
+        assert [data for (_, _, data) in self._records(path)] == \
+            ['0', '1', '2']
+
+    @pytest.mark.timeout(20)
+    def test_handler_errors(self, tmp_path):
+        path = str(tmp_path / 'records')
+        strategy = ProcessPoolEventReceivingStrategy(num_processes=1)
+        strategy.add_handler(functools.partial(_record_in_file, path), True)
+        strategy.handle(Event(scope=Scope('/a'), data='fail'))
+        strategy.handle(Event(scope=Scope('/a'), data='ok'))
+        strategy.deactivate()
+
+        assert strategy.failed_events == 1
+        assert strategy.processed_events == 2
+        assert [data for (_, _, data) in self._records(path)] == ['ok']
+
+    @pytest.mark.timeout(20)
+    def test_worker_exit(self, tmp_path):
+        path = str(tmp_path / 'records')
+        strategy = ProcessPoolEventReceivingStrategy(num_processes=1,
+                                                     max_in_flight=1)
+        strategy.add_handler(functools.partial(_record_in_file, path), True)
+        strategy.handle(Event(scope=Scope('/a'), data='before'))
+        strategy.handle(Event(scope=Scope('/a'), data='exit'))
+        # Blocks until the terminated worker process has been replaced.
+        strategy.handle(Event(scope=Scope('/a'), data='after'))
+        strategy.deactivate()
+
+        assert strategy.in_flight == 0
+        assert strategy.failed_events == 1
+        records = self._records(path)
+        assert [data for (_, _, data) in records] == ['before', 'after']
+        assert records[0][0] != records[1][0]
+
+    @pytest.mark.timeout(20)
+    def test_locks_held_at_start(self, tmp_path):
+        path = str(tmp_path / 'records')
+        # Worker processes must not inherit locks held by other threads,
+        # here the lock which unpickling a new scope takes.
+        with Scope._interned_lock:
+            strategy = ProcessPoolEventReceivingStrategy(num_processes=1)
+        strategy.add_handler(functools.partial(_record_in_file, path), True)
+        strategy.handle(Event(scope=Scope('/not/seen/before'), data='ok'))
+        strategy.deactivate()
+
+        assert [data for (_, _, data) in self._records(path)] == ['ok']
+
+    @pytest.mark.timeout(20)
+    def test_handlers_sent_once(self, tmp_path):
+        path = str(tmp_path / 'records')
+        strategy = ProcessPoolEventReceivingStrategy(num_processes=2)
+        strategy.add_handler(_CountingHandler(path), True)
+        pickles = _CountingHandler.pickles
+        for i in range(20):
+            strategy.handle(Event(scope=Scope('/a'), data=i))
+        assert _CountingHandler.pickles == pickles + 1
+
+        # Changed handlers are sent again.
+        strategy.add_handler(functools.partial(_record_in_file, path), True)
+        pickles = _CountingHandler.pickles
+        for i in range(20, 30):
+            strategy.handle(Event(scope=Scope('/a'), data=i))
+        strategy.deactivate()
+
+        assert _CountingHandler.pickles == pickles + 1
+        records = self._records(path)
+        assert sorted(int(data) for (_, _, data) in records) == \
+            list(range(20)) + sorted(2 * list(range(20, 30)))
+
+    def test_unpicklable_handler(self):
+        strategy = ProcessPoolEventReceivingStrategy(num_processes=1)
+        with pytest.raises(ValueError):
+            strategy.add_handler(lambda event: None, True)
+        strategy.deactivate()
+
+    @pytest.mark.parametrize('options', [
+        {'num_processes': 0},
+        {'max_in_flight': 0},
+        {'key': 42},
+    ])
+    def test_invalid_options(self, options):
+        with pytest.raises(ValueError):
+            ProcessPoolEventReceivingStrategy(**options)
+
+
+class TestInlineEventReceivingStrategy:
+
+    def test_handle(self):
+        strategy = InlineEventReceivingStrategy()
+        threads = []
+        received = []
+
+        def failing(event):
+            raise RuntimeError('intentional error')
+
+        def handler(event):
+            threads.append(threading.current_thread())
+            received.append(event)
+
+        strategy.add_handler(failing, True)
+        strategy.add_handler(handler, True)
+        strategy.add_filter(rsb.filter.MethodFilter(method='KEEP'))
+
+        strategy.handle(Event(data=1, method='KEEP'))
+        strategy.handle(Event(data=2, method='SKIP'))
+        # Handlers have been called before handle returned.
+        assert [event.data for event in received] == [1]
+        assert received[0].meta_data.deliver_time is not None
+        assert threads == [threading.current_thread()]
+
+        strategy.remove_handler(handler, True)
+        strategy.handle(Event(data=3, method='KEEP'))
+        assert len(received) == 1
+        strategy.deactivate()
+
+    @pytest.mark.usefixtures('rsb_config_inprocess')
+    def test_listener(self):
+        scope = Scope('/inline/listener')
+        config = rsb.get_default_participant_config()
+        received = []
+        with rsb.create_listener(
+                scope, config,
+                receiving_strategy=InlineEventReceivingStrategy()) \
+                as listener, \
+                rsb.create_informer(scope, config,
+                                    data_type=int) as informer:
+            listener.add_handler(received.append)
+            informer.publish_data(1)
+            # Delivered in the publishing thread.
+            assert [event.data for event in received] == [1]
+
+
+class TestBatchingHandler:
+
+    def test_full_batches(self):
+        batches = []
+        handler = rsb.eventprocessing.BatchingHandler(
+            batches.append, max_batch=3, max_latency=None)
+        for i in range(7):
+            handler(Event(data=i))
+        assert [[e.data for e in batch] for batch in batches] == \
+            [[0, 1, 2], [3, 4, 5]]
+
+        handler.close()
+        assert [e.data for e in batches[-1]] == [6]
+        # Events after closing are ignored.
+        handler(Event(data=7))
+        assert len(batches) == 3
+
+    @pytest.mark.timeout(10)
+    def test_latency(self):
+        batches = []
+        condition = Condition()
+
+        def deliver(batch):
+            with condition:
+                batches.append((time.monotonic(), batch))
+                condition.notify_all()
+
+        handler = rsb.eventprocessing.BatchingHandler(
+            deliver, max_batch=100, max_latency=0.05)
+        start = time.monotonic()
+        handler(Event(data=0))
+        handler(Event(data=1))
+        with condition:
+            condition.wait_for(lambda: batches, 5)
+        delivered, batch = batches[0]
+        assert [e.data for e in batch] == [0, 1]
+        assert delivered - start >= 0.05
+
+        handler(Event(data=2))
+        with condition:
+            condition.wait_for(lambda: len(batches) == 2, 5)
+        assert [e.data for e in batches[1][1]] == [2]
+        handler.close()
+
+    @pytest.mark.timeout(10)
+    def test_handler_called_without_lock(self):
+        appended = threading.Event()
+        batches = []
+
+        def append():
+            handler(Event(data=2))
+            appended.set()
+
+        def deliver(batch):
+            # Events can be added while the handler runs.
+            if not batches:
+                threading.Thread(target=append).start()
+                assert appended.wait(5)
+            batches.append(batch)
+
+        handler = rsb.eventprocessing.BatchingHandler(
+            deliver, max_batch=2, max_latency=None)
+        handler(Event(data=0))
+        handler(Event(data=1))
+        handler.close()
+        assert [[e.data for e in batch] for batch in batches] == \
+            [[0, 1], [2]]
+
+    def test_close_logs_handler_errors(self, caplog):
+
+        def fail(batch):
+            raise RuntimeError('intentional')
+
+        handler = rsb.eventprocessing.BatchingHandler(
+            fail, max_batch=2, max_latency=None)
+        handler(Event(data=0))
+        with pytest.raises(RuntimeError):
+            handler(Event(data=1))
+        handler(Event(data=2))
+        handler.close()
+        assert 'intentional' in caplog.text
+
+    @pytest.mark.parametrize('options', [
+        {'max_batch': 0},
+        {'max_latency': 0},
+    ])
+    def test_invalid_options(self, options):
+        with pytest.raises(ValueError):
+            rsb.eventprocessing.BatchingHandler(len, **options)
+
+
 class TestInRouteConfigurator:
 
     def test_activation(self):
@@ -446,3 +1167,110 @@ class TestFullyParallelEventReceivingStrategy:
                 self.fail("Impossible to be called in parallel again")
             else:
                 assert max_parallel_calls.value == 3
+
+    @pytest.mark.timeout(10)
+    def test_bounded_workers(self):
+
+        gate = threading.Event()
+        lock = threading.Lock()
+        calls = []
+        running = [0, 0]  # current, maximum
+
+        def handler(event):
+            with lock:
+                running[0] += 1
+                running[1] = max(running[1], running[0])
+            gate.wait()
+            with lock:
+                running[0] -= 1
+                calls.append(event.event_id)
+
+        strategy = FullyParallelEventReceivingStrategy(max_workers=2)
+        strategy.add_handler(handler, True)
+        for i in range(6):
+            strategy.handle(Event(event_id=i))
+        time.sleep(0.2)
+        assert running[1] == 2
+        assert len(strategy._workers) == 2
+
+        gate.set()
+        while len(calls) < 6:
+            time.sleep(0.01)
+        assert sorted(calls) == list(range(6))
+        assert running[1] == 2
+        assert len(strategy._workers) == 2
+
+        strategy.deactivate()
+        assert strategy._workers == []
+
+    @pytest.mark.timeout(10)
+    @pytest.mark.parametrize('overflow,expected', [
+        ('drop-oldest', [0, 3, 4]),
+        ('drop-newest', [0, 1, 2]),
+    ])
+    def test_overflow_drop(self, overflow, expected):
+
+        gate = threading.Event()
+        calls = []
+
+        def handler(event):
+            gate.wait()
+            calls.append(event.event_id)
+
+        strategy = FullyParallelEventReceivingStrategy(
+            max_workers=1, queue_size=2, overflow=overflow)
+        strategy.add_handler(handler, True)
+        strategy.handle(Event(event_id=0))
+        # Wait for the worker to take the first call.
+        while strategy._queue:
+            time.sleep(0.01)
+        for i in range(1, 5):
+            strategy.handle(Event(event_id=i))
+        assert strategy.dropped_events == 2
+
+        gate.set()
+        while len(calls) < 3:
+            time.sleep(0.01)
+        assert calls == expected
+
+        strategy.deactivate()
+
+    @pytest.mark.timeout(10)
+    def test_overflow_block(self):
+
+        gate = threading.Event()
+        calls = []
+
+        def handler(event):
+            gate.wait()
+            calls.append(event.event_id)
+
+        strategy = FullyParallelEventReceivingStrategy(
+            max_workers=1, queue_size=1)
+        strategy.add_handler(handler, True)
+        strategy.handle(Event(event_id=0))
+        strategy.handle(Event(event_id=1))
+
+        producer = threading.Thread(
+            target=lambda: strategy.handle(Event(event_id=2)))
+        producer.start()
+        producer.join(0.2)
+        assert producer.is_alive()
+
+        gate.set()
+        producer.join()
+        while len(calls) < 3:
+            time.sleep(0.01)
+        assert calls == [0, 1, 2]
+        assert strategy.dropped_events == 0
+
+        strategy.deactivate()
+
+    @pytest.mark.parametrize('options', [
+        {'max_workers': 0},
+        {'queue_size': 0},
+        {'overflow': 'reject'},
+    ])
+    def test_invalid_options(self, options):
+        with pytest.raises(ValueError):
+            FullyParallelEventReceivingStrategy(**options)
@@ -167,6 +167,50 @@ class TestRpcRoundTrip:
                 for r in results:
                     r.get(10)
 
+    def test_parallel_execution_options(self):
+        running_calls = [0, 0]
+        call_lock = Condition()
+
+        with rsb.create_local_server(
+                '/limited',
+                in_process_no_introspection_config) as local_server:
+
+            def count_running_calls(e):
+                with call_lock:
+                    running_calls[0] += 1
+                    running_calls[1] = max(running_calls)
+                    call_lock.wait(0.05)
+                    running_calls[0] -= 1
+            local_server.add_method('count_running_calls',
+                                    count_running_calls, str,
+                                    allow_parallel_execution=True,
+                                    max_workers=1, queue_size=5)
+
+            with rsb.create_remote_server(
+                    '/limited',
+                    in_process_no_introspection_config) as remote_server:
+                results = [
+                    remote_server.count_running_calls.asynchronous(
+                        'call{}'.format(x))
+                    for x in range(3)]
+                for r in results:
+                    r.get(10)
+
+        assert running_calls[1] == 1
+
+    @pytest.mark.parametrize('options', [{'max_workers': 0},
+                                         {'queue_size': 0},
+                                         {'overflow': 'explode'}])
+    def test_invalid_parallel_execution_options(self, options):
+        with rsb.create_local_server(
+                '/invalid',
+                in_process_no_introspection_config) as local_server:
+            with pytest.raises(ValueError):
+                local_server.add_method('method', lambda x: x, str,
+                                        allow_parallel_execution=True,
+                                        **options)
+            assert local_server.methods == []
+
 
 class TestReader:
 
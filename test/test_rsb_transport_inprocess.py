@@ -21,6 +21,7 @@
 import time
 
 from rsb import Event, Scope
+from rsb.filter import FilterAction, MethodFilter
 from rsb.transport.local import (Bus,
                                  InConnector,
                                  OutConnector)
@@ -120,6 +121,29 @@ class TestInConnector:
         assert len(action.events) == 1
         assert e in action.events
 
+    def test_pushed_down_filters(self):
+        scope = Scope("/lets/go")
+
+        bus = Bus()
+        connector = InConnector(bus=bus)
+        connector.scope = scope
+        connector.activate()
+
+        action = StubSink(scope)
+        connector.set_observer_action(action)
+        the_filter = MethodFilter("REQUEST")
+        connector.filter_notify(the_filter, FilterAction.ADD)
+
+        reply = Event(scope=scope, method="REPLY")
+        request = Event(scope=scope, method="REQUEST")
+        bus.handle(reply)
+        bus.handle(request)
+        assert action.events == [request]
+
+        connector.filter_notify(the_filter, FilterAction.REMOVE)
+        bus.handle(reply)
+        assert action.events == [request, reply]
+
 
 class TestLocalTransport(TransportCheck):
 
@@ -0,0 +1,247 @@
+# ============================================================
+#
+# Copyright (C) 2018 Jan Moringen
+#
+# This file may be licensed under the terms of the
+# GNU Lesser General Public License Version 3 (the ``LGPL''),
+# or (at your option) any later version.
+#
+# Software distributed under the License is distributed
+# on an ``AS IS'' basis, WITHOUT WARRANTY OF ANY KIND, either
+# express or implied. See the LGPL for the specific language
+# governing rights and limitations.
+#
+# You should have received a copy of the LGPL along with this
+# program. If not, go to http://www.gnu.org/licenses/lgpl.html
+# or write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ============================================================
+
+import functools
+import gc
+import shutil
+import tempfile
+import threading
+import uuid
+
+import pytest
+
+import rsb
+from rsb.converter import (BytesConverter,
+                           ConverterMap,
+                           get_global_converter_map)
+from rsb.eventprocessing import ProcessPoolEventReceivingStrategy
+from rsb.transport.shm import (InConnector,
+                               OutConnector,
+                               RingBuffer,
+                               SegmentMap)
+from rsb.transport.transporttest import TransportCheck
+
+pytest.importorskip('fcntl')
+
+
+def get_connector(clazz, scope, activate=True, server='auto',
+                  converters=None, **kwargs):
+    options = {'server': server}
+    options.update(kwargs)
+    if converters is None:
+        converters = get_global_converter_map(bytes)
+    connector = clazz(converters=converters, options=options)
+    connector.scope = scope
+    if activate:
+        connector.activate()
+    return connector
+
+
+class TestShmTransport(TransportCheck):
+    """
+    Instantiation of the general transport test for the shm transport.
+
+    Uses the same server/client alternation as the socket transport test
+    such that the control channel performs real socket communication.
+    """
+
+    @pytest.fixture(autouse=True)
+    def set_up(self):
+        self.counter = 0
+
+    def get_server_arg(self):
+        try:
+            return '1' if self.counter == 0 else '0'
+        finally:
+            self.counter += 1
+
+    def _get_in_connector(self, scope, activate=True):
+        return get_connector(InConnector, scope, activate=activate,
+                             server=self.get_server_arg())
+
+    def _get_out_connector(self, scope, activate=True):
+        return get_connector(OutConnector, scope, activate=activate,
+                             server=self.get_server_arg())
+
+
+@pytest.fixture
+def directory():
+    directory = tempfile.mkdtemp()
+    yield directory
+    shutil.rmtree(directory)
+
+
+class TestRingBuffer:
+
+    def test_write_and_pin(self, directory):
+        ring = RingBuffer(directory, 4096, 0.0)
+        offset, length, generation = ring.write(b'payload')
+        segment = SegmentMap(ring_path(directory, ring))
+        view = segment.pin(offset, length, generation)
+        assert view.readonly
+        assert bytes(view) == b'payload'
+        assert segment.pin(offset, length, generation + 1) is None
+        del view
+        ring.close()
+
+    def test_pinned_slots_are_not_reclaimed(self, directory):
+        ring = RingBuffer(directory, 256, 0.0)
+        segment = SegmentMap(ring_path(directory, ring))
+        first = ring.write(b'x' * 100)
+        pinned = segment.pin(*first)
+        assert ring.write(b'y' * 100) is not None
+        # The ring is full and its first slot is pinned.
+        assert ring.write(b'z' * 100) is None
+        del pinned
+        segment.release(first[0], first[2])
+        # Both slots are unpinned now.
+        third = ring.write(b'z' * 100)
+        assert third is not None
+        assert third[0] == 0
+        assert segment.pin(*first) is None
+        assert bytes(segment.pin(*third)) == b'z' * 100
+        ring.close()
+
+    def test_retention(self, directory):
+        ring = RingBuffer(directory, 256, 10.0)
+        assert ring.write(b'x' * 100) is not None
+        assert ring.write(b'y' * 100) is not None
+        assert ring.write(b'z' * 100) is None
+        assert ring.allocated_slots == 2
+        ring.close()
+
+    def test_too_large(self, directory):
+        ring = RingBuffer(directory, 256, 0.0)
+        assert ring.write(b'x' * 256) is None
+        ring.close()
+
+    def test_close_removes_segment(self, directory):
+        ring = RingBuffer(directory, 256, 0.0)
+        path = ring_path(directory, ring)
+        ring.close()
+        with pytest.raises(FileNotFoundError):
+            SegmentMap(path)
+
+
+def ring_path(directory, ring):
+    return directory + '/' + ring.name
+
+
+def _record_size(path, event):
+    # Runs in the worker process of ProcessPoolEventReceivingStrategy.
+    with open(path, 'a') as stream:
+        stream.write('{}\n'.format(len(event.data)))
+
+
+class TestConnectors:
+
+    @pytest.mark.timeout(10)
+    def test_payload_in_shared_memory(self, directory):
+        received = []
+        condition = threading.Condition()
+
+        def receive(event):
+            with condition:
+                received.append(event)
+                condition.notify()
+
+        # Unlike the default converter for bytes, BytesConverter passes
+        # the wire data through.
+        converters = ConverterMap(bytes)
+        converters.add_converter(BytesConverter())
+        scope = rsb.Scope('/shm')
+        listener = get_connector(InConnector, scope, server='1',
+                                 converters=converters,
+                                 directory=directory)
+        listener.set_observer_action(receive)
+        informer = get_connector(OutConnector, scope, server='0',
+                                 converters=converters,
+                                 directory=directory, inlinesize='100',
+                                 retention='0')
+
+        def send(data):
+            informer.handle(rsb.Event(rsb.EventId(uuid.uuid4(), 0),
+                                      scope=scope, data=data,
+                                      data_type=bytes))
+
+        send(b'small')
+        send(b'x' * 1000)
+        with condition:
+            condition.wait_for(lambda: len(received) == 2, timeout=5)
+
+        small, large = received
+        assert bytes(small.data) == b'small'
+        assert isinstance(large.data, memoryview)
+        assert bytes(large.data) == b'x' * 1000
+        assert informer.ring.allocated_slots == 1
+
+        # Dropping the event releases its slot such that it is reclaimed
+        # by the next write.
+        del received[:], small, large
+        gc.collect()
+        assert informer.ring.write(b'y' * 1000)[0] == 0
+        assert informer.ring.allocated_slots == 1
+
+        informer.deactivate()
+        listener.deactivate()
+
+    @pytest.mark.timeout(20)
+    def test_lazy_data_in_process_pool(self, directory, tmp_path):
+        path = str(tmp_path / 'records')
+        converters = ConverterMap(bytes)
+        converters.add_converter(BytesConverter())
+        strategy = ProcessPoolEventReceivingStrategy(num_processes=1,
+                                                     max_in_flight=2)
+        strategy.add_handler(functools.partial(_record_size, path), True)
+        scope = rsb.Scope('/shm/pool')
+        listener = get_connector(InConnector, scope, server='1',
+                                 converters=converters,
+                                 directory=directory, lazydata='1')
+        listener.set_observer_action(strategy.handle)
+        informer = get_connector(OutConnector, scope, server='0',
+                                 converters=converters,
+                                 directory=directory, inlinesize='100')
+
+        # Payloads are sent inline and in shared memory.
+        for size in [10, 1000, 2000]:
+            informer.handle(rsb.Event(rsb.EventId(uuid.uuid4(), 0),
+                                      scope=scope, data=b'x' * size,
+                                      data_type=bytes))
+        with strategy._condition:
+            strategy._condition.wait_for(
+                lambda: strategy.processed_events == 3, timeout=10)
+
+        informer.deactivate()
+        listener.deactivate()
+        strategy.deactivate()
+        assert strategy.in_flight == 0
+        assert strategy.failed_events == 0
+        with open(path) as stream:
+            assert stream.read().split() == ['10', '1000', '2000']
+
+    def test_invalid_segment_size(self):
+        with pytest.raises(TypeError):
+            get_connector(OutConnector, rsb.Scope('/'), activate=False,
+                          segmentsize='1')
+
+    def test_transport_url(self):
+        connector = get_connector(InConnector, rsb.Scope('/'),
+                                  activate=False)
+        assert connector.get_transport_url().startswith('shm://')
@@ -18,18 +18,40 @@
 #
 # ============================================================
 
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
 import pytest
 
 import rsb
-from rsb.converter import get_global_converter_map
-from rsb.transport.socket import InConnector, OutConnector
+from rsb.converter import Converter, ConverterMap, get_global_converter_map
+import rsb.filter
+from rsb.protocol.FragmentedNotification_pb2 import FragmentedNotification
+from rsb.protocol.Notification_pb2 import Notification
+import rsb.transport.conversion as conversion
+from rsb.transport.conversion import notification_to_fragments
+from rsb.transport.socket import (AssemblyPool,
+                                  Bus,
+                                  BusClient,
+                                  BusConnection,
+                                  BusServer,
+                                  InConnector,
+                                  OutConnector,
+                                  SelectorLoop)
 from rsb.transport.transporttest import TransportCheck
 
 
-def get_connector(clazz, scope, activate=True, server='auto'):
+def get_connector(clazz, scope, activate=True, server='auto', **kwargs):
     options = dict(
         rsb.get_default_participant_config().get_transport('socket').options)
     options['server'] = server
+    options.update(kwargs)
     connector = clazz(
         converters=get_global_converter_map(bytes),
         options=options)
@@ -71,3 +93,1232 @@ class TestSocketTransport(TransportCheck):
     def _get_out_connector(self, scope, activate=True):
         return get_connector(OutConnector, scope, activate=activate,
                              server=self.get_server_arg())
+
+
+class TestSelectorSocketTransport(TestSocketTransport):
+    """
+    Instantiation of the general transport test for the selector I/O model.
+
+    Uses the same server/client alternation as :obj:`TestSocketTransport`
+    but requests a bus server which multiplexes its client connections in a
+    single I/O thread.
+    """
+
+    def _get_in_connector(self, scope, activate=True):
+        return get_connector(InConnector, scope, activate=activate,
+                             server=self.get_server_arg(), io='selector')
+
+    def _get_out_connector(self, scope, activate=True):
+        return get_connector(OutConnector, scope, activate=activate,
+                             server=self.get_server_arg(), io='selector')
+
+
+class TestCoalescingSocketTransport(TestSocketTransport):
+    """Instantiation of the general transport test with write coalescing."""
+
+    def _get_in_connector(self, scope, activate=True):
+        return get_connector(InConnector, scope, activate=activate,
+                             server=self.get_server_arg(),
+                             coalescewindow='1000')
+
+    def _get_out_connector(self, scope, activate=True):
+        return get_connector(OutConnector, scope, activate=activate,
+                             server=self.get_server_arg(),
+                             coalescewindow='1000')
+
+
+class TestLazySocketTransport(TestSocketTransport):
+    """Instantiation of the general transport test with lazy payloads."""
+
+    def _get_in_connector(self, scope, activate=True):
+        return get_connector(InConnector, scope, activate=activate,
+                             server=self.get_server_arg(), lazydata='1')
+
+
+class TestFragmentingSocketTransport(TestSocketTransport):
+    """Instantiation of the general transport test with small fragments."""
+
+    def _get_in_connector(self, scope, activate=True):
+        return get_connector(InConnector, scope, activate=activate,
+                             server=self.get_server_arg(),
+                             maxfragmentsize='10000', negotiate='1')
+
+    def _get_out_connector(self, scope, activate=True):
+        return get_connector(OutConnector, scope, activate=activate,
+                             server=self.get_server_arg(),
+                             maxfragmentsize='10000', negotiate='1')
+
+
+class TestUnixSocketTransport(TestSocketTransport):
+    """Instantiation of the general transport test for AF_UNIX sockets."""
+
+    @pytest.fixture(autouse=True)
+    def set_up_path(self):
+        directory = tempfile.mkdtemp()
+        self.path = os.path.join(directory, 'bus')
+        yield
+        shutil.rmtree(directory)
+
+    def _get_in_connector(self, scope, activate=True):
+        return get_connector(InConnector, scope, activate=activate,
+                             server=self.get_server_arg(), path=self.path)
+
+    def _get_out_connector(self, scope, activate=True):
+        return get_connector(OutConnector, scope, activate=activate,
+                             server=self.get_server_arg(), path=self.path)
+
+
+def test_invalid_io_option():
+    with pytest.raises(TypeError):
+        get_connector(InConnector, rsb.Scope('/'), activate=False,
+                      io='fibers')
+
+
+class RecordingConnection:
+
+    def __init__(self, max_fragment_size=0):
+        self.max_fragment_size = max_fragment_size
+        self.sent = []
+        self.batches = []
+
+    def send_notification(self, serialized, key=None, sender=None):
+        self.sent.append(serialized)
+
+    def send_fragments(self, fragments, key=None, sender=None):
+        self.sent.append(fragments)
+
+    def send_batch(self, items, keys=None, senders=None):
+        self.batches.append(items)
+        self.sent.extend(items)
+
+
+def make_notification(scope='/foo/'):
+    notification = Notification()
+    notification.event_id.sender_id = uuid.uuid4().bytes
+    notification.event_id.sequence_number = 1
+    notification.scope = scope.encode('ASCII')
+    notification.data = b'data'
+    return notification
+
+
+class TestBusSerialization:
+
+    def test_outgoing_serialized_once(self, monkeypatch):
+        calls = []
+        original = BusConnection.notification_to_buffer
+
+        def counting_to_buffer(notification):
+            calls.append(notification)
+            return original(notification)
+        monkeypatch.setattr(BusConnection, 'notification_to_buffer',
+                            staticmethod(counting_to_buffer))
+
+        bus = Bus()
+        connections = [RecordingConnection() for _ in range(5)]
+        bus.connections.extend(connections)
+        bus.activate()
+
+        bus.handle_outgoing(make_notification())
+
+        assert len(calls) == 1
+        buffers = {id(connection.sent[0]) for connection in connections}
+        assert len(buffers) == 1
+
+    def test_outgoing_many_batched(self):
+        bus = Bus()
+        whole, fragmenting = RecordingConnection(), RecordingConnection(1000)
+        bus.connections.extend([whole, fragmenting])
+        bus.activate()
+
+        big, fragments = make_fragments(b'x' * 5000)
+        notifications = [make_notification(), big, make_notification()]
+        bus.handle_outgoing_many(notifications)
+
+        serialized = [notification.SerializeToString()
+                      for notification in notifications]
+        assert whole.batches == [serialized]
+        assert fragmenting.batches == [
+            [serialized[0],
+             [fragment.SerializeToString() for fragment in fragments],
+             serialized[2]]]
+        # Each notification is serialized once for all connections.
+        assert whole.sent[0] is fragmenting.sent[0]
+
+    def test_incoming_relayed_without_serialization(self, monkeypatch):
+        def failing_to_buffer(notification):
+            pytest.fail('Relayed notification must not be serialized')
+        monkeypatch.setattr(BusConnection, 'notification_to_buffer',
+                            staticmethod(failing_to_buffer))
+
+        server = BusServer('localhost', 0, True)
+        sender, receiver = RecordingConnection(), RecordingConnection()
+        server.connections.extend([sender, receiver])
+
+        notification = make_notification()
+        serialized = notification.SerializeToString()
+        server.handle_incoming((sender, notification, serialized))
+
+        assert sender.sent == []
+        assert receiver.sent == [serialized]
+        assert receiver.sent[0] is serialized
+
+
+class CountingConverter(Converter):
+
+    def __init__(self):
+        super().__init__(bytes, bytes, 'counting')
+        self.calls = 0
+
+    def serialize(self, inp):
+        return inp, self.wire_schema
+
+    def deserialize(self, inp, wire_schema):
+        self.calls += 1
+        return bytearray(inp)
+
+
+class TestBusFanOut:
+
+    def test_deserialized_once_per_converter(self):
+        converter = CountingConverter()
+        converters = ConverterMap(bytes)
+        converters.add_converter(converter)
+
+        bus = Bus()
+        bus.activate()
+        received = []
+        for scope in ['/', '/foo/', '/foo/']:
+            connector = InConnector(converters=converters)
+            connector.scope = rsb.Scope(scope)
+            connector.set_observer_action(received.append)
+            bus.add_connector(connector)
+
+        notification = make_notification()
+        notification.wire_schema = b'counting'
+        notification.meta_data.create_time = 0
+        notification.meta_data.send_time = 0
+        bus.handle_incoming((None, notification, b''))
+
+        assert converter.calls == 1
+        assert len(received) == 3
+        assert all(event.data is received[0].data for event in received)
+        assert len({id(event.meta_data) for event in received}) == 3
+
+        received[0].meta_data.set_user_info('foo', 'bar')
+        assert received[1].meta_data.user_infos == {}
+
+    def test_lazy_deserialization(self):
+        converter = CountingConverter()
+        converters = ConverterMap(bytes)
+        converters.add_converter(converter)
+
+        bus = Bus()
+        bus.activate()
+        received = []
+        for _ in range(2):
+            connector = InConnector(converters=converters,
+                                    options={'lazydata': '1'})
+            connector.scope = rsb.Scope('/foo/')
+            connector.set_observer_action(received.append)
+            bus.add_connector(connector)
+
+        notification = make_notification()
+        notification.wire_schema = b'counting'
+        notification.meta_data.create_time = 0
+        notification.meta_data.send_time = 0
+        bus.handle_incoming((None, notification, b''))
+
+        assert len(received) == 2
+        assert converter.calls == 0
+        assert received[0].data == b'data'
+        assert received[1].data is received[0].data
+        assert converter.calls == 1
+
+    def test_conflation_per_sender(self):
+        server_socket, client_socket = connected_sockets()
+        connection = BusConnection(socket_=server_socket, is_server=True,
+                                   conflate=True)
+        assert client_socket.recv(4, socket.MSG_WAITALL) == b'\0\0\0\0'
+        # Register the inactive connection directly such that the bus
+        # queues the notifications without writing them.
+        bus = Bus()
+        bus.connections.append(connection)
+
+        # Samples of two senders on one scope do not replace each
+        # other. A newer sample of the same sender does.
+        first = make_notification()
+        second = make_notification()
+        newer = make_notification()
+        newer.event_id.sender_id = first.event_id.sender_id
+        newer.event_id.sequence_number = 2
+        for notification in [first, second, newer]:
+            assert bus._to_connections(notification) == []
+        assert connection.queue_depth == 2
+        assert connection.conflated_notifications == 1
+
+        connection.activate()
+        received = []
+        for frame in TestBusConnectionSending._receive_frames(
+                client_socket, 2):
+            notification = Notification()
+            notification.ParseFromString(frame)
+            received.append((notification.event_id.sender_id,
+                             notification.event_id.sequence_number))
+        assert received == [(first.event_id.sender_id, 2),
+                            (second.event_id.sender_id, 1)]
+
+        connection.shutdown()
+        client_socket.close()
+        connection.wait_for_deactivation()
+
+
+def notification_for(event):
+    event.meta_data.send_time = time.time()
+    notification = Notification()
+    conversion.event_to_notification(notification, event,
+                                     wire_schema='counting', data=b'data')
+    return notification
+
+
+class TestFilterPushdown:
+
+    ORIGIN = uuid.uuid4()
+    CAUSE = rsb.EventId(uuid.uuid4(), 7)
+
+    @pytest.mark.parametrize('the_filter', [
+        rsb.filter.ScopeFilter(rsb.Scope('/foo')),
+        rsb.filter.ScopeFilter(rsb.Scope('/foo/bar')),
+        rsb.filter.ScopeFilter(rsb.Scope('/fo')),
+        rsb.filter.OriginFilter(ORIGIN),
+        rsb.filter.OriginFilter(ORIGIN, invert=True),
+        rsb.filter.CauseFilter(CAUSE),
+        rsb.filter.CauseFilter(CAUSE, invert=True),
+        rsb.filter.MethodFilter('REQUEST'),
+        rsb.filter.MethodFilter('REPLY', invert=True),
+        rsb.filter.MethodFilter(None),
+    ])
+    def test_predicate_agrees_with_match(self, the_filter):
+        predicate = conversion.notification_predicate(the_filter)
+        converter = CountingConverter()
+        for origin in (self.ORIGIN, uuid.uuid4()):
+            for scope in ('/foo/', '/foo/bar/baz/', '/foobar/'):
+                for method in (None, 'REQUEST', 'REPLY'):
+                    for causes in ([], [self.CAUSE],
+                                   [rsb.EventId(self.ORIGIN, 7)]):
+                        event = rsb.Event(rsb.EventId(origin, 1),
+                                          scope=rsb.Scope(scope),
+                                          method=method, data=b'data',
+                                          causes=causes)
+                        notification = notification_for(event)
+                        decoded = conversion.notification_to_event(
+                            notification, wire_data=b'data',
+                            wire_schema='counting', converter=converter)
+                        assert predicate(notification) == \
+                            the_filter.match(decoded)
+
+    def test_unsupported_filter(self):
+        assert conversion.notification_predicate(
+            rsb.filter.TrueFilter()) is None
+
+    def test_discarded_before_decoding(self):
+        converter = CountingConverter()
+        converters = ConverterMap(bytes)
+        converters.add_converter(converter)
+
+        connector = InConnector(converters=converters)
+        connector.scope = rsb.Scope('/foo/')
+        received = []
+        connector.set_observer_action(received.append)
+        the_filter = rsb.filter.MethodFilter('REQUEST')
+        connector.filter_notify(the_filter, rsb.filter.FilterAction.ADD)
+        connector.filter_notify(rsb.filter.TrueFilter(),
+                                rsb.filter.FilterAction.ADD)
+
+        reply = notification_for(rsb.Event(
+            rsb.EventId(uuid.uuid4(), 1), scope=rsb.Scope('/foo/'),
+            method='REPLY', data=b'data'))
+        request = notification_for(rsb.Event(
+            rsb.EventId(uuid.uuid4(), 2), scope=rsb.Scope('/foo/'),
+            method='REQUEST', data=b'data'))
+        connector.handle(reply)
+        assert received == []
+        assert converter.calls == 0
+        connector.handle(request)
+        assert [event.method for event in received] == ['REQUEST']
+        assert converter.calls == 1
+
+        connector.filter_notify(the_filter, rsb.filter.FilterAction.REMOVE)
+        connector.handle(reply)
+        assert [event.method for event in received] == ['REQUEST', 'REPLY']
+
+
+def connected_sockets():
+    listen_socket = socket.socket()
+    listen_socket.bind(('localhost', 0))
+    listen_socket.listen(1)
+    client = socket.create_connection(listen_socket.getsockname())
+    server, _ = listen_socket.accept()
+    listen_socket.close()
+    return server, client
+
+
+class TestBusConnectionReceiving:
+
+    @pytest.mark.timeout(10)
+    def test_multiple_frames_per_read(self):
+        server_socket, client_socket = connected_sockets()
+        connection = BusConnection(socket_=server_socket, is_server=True)
+        assert client_socket.recv(4, socket.MSG_WAITALL) == b'\0\0\0\0'
+
+        received = []
+        done = threading.Event()
+
+        def handler(notification_and_buffer):
+            notification, _ = notification_and_buffer
+            received.append(notification.data)
+            if len(received) == len(payloads):
+                done.set()
+        connection.add_handler(handler)
+
+        # Small frames which fit into a single read as well as one frame
+        # which is larger than the initial receive buffer.
+        payloads = [bytes([i]) * 100 for i in range(50)]
+        payloads.insert(25, b'x' * (3 * BusConnection._RECEIVE_BUFFER_SIZE))
+        data = b''
+        for payload in payloads:
+            notification = make_notification()
+            notification.data = payload
+            serialized = notification.SerializeToString()
+            data += len(serialized).to_bytes(4, 'little') + serialized
+        # Split the data such that frames straddle the chunk boundaries.
+        connection.activate()
+        for offset in range(0, len(data), 7777):
+            client_socket.sendall(data[offset:offset + 7777])
+
+        assert done.wait(5)
+        assert received == payloads
+
+        connection.shutdown()
+        client_socket.close()
+        connection.wait_for_deactivation()
+
+
+class TestBusConnectionSending:
+
+    @staticmethod
+    def _receive_frames(client_socket, count):
+        frames = []
+        for _ in range(count):
+            size = int.from_bytes(client_socket.recv(4, socket.MSG_WAITALL),
+                                  'little')
+            frames.append(client_socket.recv(size, socket.MSG_WAITALL))
+        return frames
+
+    @pytest.mark.timeout(10)
+    def test_send_notifications(self):
+        server_socket, client_socket = connected_sockets()
+        connection = BusConnection(socket_=server_socket, is_server=True,
+                                   send_queue_size=0)
+        assert client_socket.recv(4, socket.MSG_WAITALL) == b'\0\0\0\0'
+
+        # Large frames cause partial writes which have to be resumed.
+        payloads = [bytes([i]) * (i * 10000) for i in range(1, 30)]
+        sender = threading.Thread(target=connection.send_notifications,
+                                  args=(payloads,))
+        sender.start()
+        assert self._receive_frames(client_socket, len(payloads)) == payloads
+        sender.join()
+
+        client_socket.close()
+        server_socket.close()
+
+    @pytest.mark.timeout(10)
+    def test_send_batch(self):
+        server_socket, client_socket = connected_sockets()
+        sender = BusConnection(socket_=server_socket, is_server=True)
+        receiver = BusConnection(socket_=client_socket)
+
+        received = []
+        done = threading.Event()
+
+        def handler(notification_and_buffer):
+            received.append(notification_and_buffer[0])
+            if len(received) == 3:
+                done.set()
+        receiver.add_handler(handler)
+
+        first, last = make_notification('/first/'), make_notification('/last/')
+        big, fragments = make_fragments(b'x' * 10000, 1000)
+        sender.send_batch([first.SerializeToString(),
+                           [fragment.SerializeToString()
+                            for fragment in fragments],
+                           last.SerializeToString()])
+        receiver.activate()
+        sender.activate()
+
+        assert done.wait(5)
+        assert sorted(received, key=lambda n: n.scope) == \
+            sorted([first, big, last], key=lambda n: n.scope)
+
+        sender.shutdown()
+        receiver.wait_for_deactivation()
+        sender.wait_for_deactivation()
+
+    @pytest.mark.timeout(10)
+    def test_coalescing(self):
+        server_socket, client_socket = connected_sockets()
+        connection = BusConnection(socket_=server_socket, is_server=True,
+                                   coalesce_window=0.01, coalesce_bytes=1000)
+        assert client_socket.recv(4, socket.MSG_WAITALL) == b'\0\0\0\0'
+        connection.activate()
+
+        # Frames below the size threshold are written by the flusher
+        # after the coalescing window, larger amounts immediately.
+        payloads = [bytes([i]) * 100 for i in range(50)]
+        for payload in payloads:
+            connection.send_notification(payload)
+        assert self._receive_frames(client_socket, len(payloads)) == payloads
+
+        # Pending frames are written when the connection is shut down.
+        connection.send_notification(b'last')
+        connection.shutdown()
+        assert self._receive_frames(client_socket, 1) == [b'last']
+
+        client_socket.close()
+        connection.wait_for_deactivation()
+
+    @pytest.mark.parametrize('overflow,expected,dropped', [
+        ('drop-oldest', [b'b', b'c'], 1),
+        ('drop-newest', [b'a', b'b'], 1),
+    ])
+    @pytest.mark.timeout(10)
+    def test_overflow_drop(self, overflow, expected, dropped):
+        server_socket, client_socket = connected_sockets()
+        connection = BusConnection(socket_=server_socket, is_server=True,
+                                   send_queue_size=2, overflow=overflow)
+        assert client_socket.recv(4, socket.MSG_WAITALL) == b'\0\0\0\0'
+
+        # The writer is not running before activation.
+        connection.send_notifications([b'a', b'b', b'c'])
+        assert connection.queue_depth == 2
+        assert connection.max_queue_depth == 2
+        assert connection.dropped_notifications == dropped
+
+        connection.activate()
+        assert self._receive_frames(client_socket, 2) == expected
+
+        connection.shutdown()
+        client_socket.close()
+        connection.wait_for_deactivation()
+
+    @pytest.mark.timeout(10)
+    def test_batch_joined_in_queue(self):
+        server_socket, client_socket = connected_sockets()
+        connection = BusConnection(socket_=server_socket, is_server=True,
+                                   send_queue_size=1, overflow='drop-newest')
+        assert client_socket.recv(4, socket.MSG_WAITALL) == b'\0\0\0\0'
+
+        # Each batch occupies a single place in the queue and is dropped
+        # as a whole.
+        connection.send_batch([b'a', b'b', b'c'])
+        connection.send_batch([b'd', b'e'])
+        assert connection.queue_depth == 1
+        assert connection.dropped_notifications == 2
+
+        connection.activate()
+        assert self._receive_frames(client_socket, 3) == [b'a', b'b', b'c']
+
+        connection.shutdown()
+        client_socket.close()
+        connection.wait_for_deactivation()
+
+    @pytest.mark.timeout(10)
+    def test_conflation(self):
+        server_socket, client_socket = connected_sockets()
+        connection = BusConnection(socket_=server_socket, is_server=True,
+                                   conflate=True)
+        assert client_socket.recv(4, socket.MSG_WAITALL) == b'\0\0\0\0'
+
+        # Queued notifications are replaced in place by newer ones with
+        # the same key. Notifications without key are never replaced.
+        connection.send_notification(b'a1', key=b'/a/')
+        connection.send_notification(b'b1', key=b'/b/')
+        connection.send_notification(b'x')
+        connection.send_batch([b'a2', b'y', b'a3'],
+                              keys=[b'/a/', None, b'/a/'])
+        assert connection.queue_depth == 4
+        assert connection.conflated_notifications == 2
+
+        connection.activate()
+        assert self._receive_frames(client_socket, 4) == \
+            [b'a3', b'b1', b'x', b'y']
+
+        # Once written, notifications are no longer replaced.
+        connection.flush()
+        connection.send_notification(b'a4', key=b'/a/')
+        assert self._receive_frames(client_socket, 1) == [b'a4']
+        assert connection.conflated_notifications == 2
+
+        connection.shutdown()
+        client_socket.close()
+        connection.wait_for_deactivation()
+
+    @pytest.mark.timeout(10)
+    def test_overflow_block(self):
+        server_socket, client_socket = connected_sockets()
+        connection = BusConnection(socket_=server_socket, is_server=True,
+                                   send_queue_size=2, overflow='block')
+        assert client_socket.recv(4, socket.MSG_WAITALL) == b'\0\0\0\0'
+
+        sender = threading.Thread(target=connection.send_notifications,
+                                  args=([b'a', b'b', b'c'],))
+        sender.start()
+        sender.join(0.1)
+        assert sender.is_alive()
+
+        connection.activate()
+        sender.join()
+        assert self._receive_frames(client_socket, 3) == [b'a', b'b', b'c']
+        assert connection.dropped_notifications == 0
+
+        connection.shutdown()
+        client_socket.close()
+        connection.wait_for_deactivation()
+
+    @pytest.mark.timeout(10)
+    def test_overflow_block_idle_writer(self):
+        server_socket, client_socket = connected_sockets()
+        connection = BusConnection(socket_=server_socket, is_server=True,
+                                   send_queue_size=2, overflow='block')
+        assert client_socket.recv(4, socket.MSG_WAITALL) == b'\0\0\0\0'
+        connection.activate()
+
+        # A single call which fills the queue has to wake the idle
+        # writer before blocking.
+        payloads = [bytes([i]) for i in range(10)]
+        connection.send_notifications(payloads)
+        assert self._receive_frames(client_socket, 10) == payloads
+
+        connection.shutdown()
+        client_socket.close()
+        connection.wait_for_deactivation()
+
+    @pytest.mark.timeout(10)
+    def test_overflow_disconnect(self):
+        server_socket, client_socket = connected_sockets()
+        connection = BusConnection(socket_=server_socket, is_server=True,
+                                   send_queue_size=2, overflow='disconnect')
+        assert client_socket.recv(4, socket.MSG_WAITALL) == b'\0\0\0\0'
+        disconnected = threading.Event()
+        connection.disconnect_hook = disconnected.set
+
+        connection.send_notifications([b'a', b'b', b'c'])
+        assert connection.queue_depth == 0
+        assert connection.dropped_notifications == 3
+        assert client_socket.recv(1) == b''
+
+        # The receiving side notices the closed connection.
+        connection.activate()
+        assert disconnected.wait(5)
+        client_socket.close()
+        connection.wait_for_deactivation()
+
+    @pytest.mark.timeout(20)
+    def test_loop_writes_without_threads(self):
+        loop = SelectorLoop()
+        loop.start()
+        threads = threading.active_count()
+        pairs = []
+        for _ in range(20):
+            server_socket, client_socket = connected_sockets()
+            connection = BusConnection(socket_=server_socket, is_server=True,
+                                       loop=loop)
+            assert client_socket.recv(4, socket.MSG_WAITALL) == b'\0\0\0\0'
+            connection.activate()
+            pairs.append((connection, client_socket))
+        assert threading.active_count() == threads
+
+        payloads = [bytes([i]) * 100000 for i in range(5)]
+        for (connection, client_socket) in pairs:
+            connection.send_notifications(payloads)
+        for (connection, client_socket) in pairs:
+            assert self._receive_frames(client_socket, 5) == payloads
+
+        for (connection, client_socket) in pairs:
+            connection.shutdown()
+            client_socket.close()
+            connection.wait_for_deactivation()
+            connection.deactivate()
+        loop.stop()
+
+    @pytest.mark.timeout(10)
+    def test_loop_blocking_sender_in_loop_thread(self):
+        loop = SelectorLoop()
+        loop.start()
+        server_socket, client_socket = connected_sockets()
+        connection = BusConnection(socket_=server_socket, is_server=True,
+                                   loop=loop, send_queue_size=2,
+                                   overflow='block')
+        assert client_socket.recv(4, socket.MSG_WAITALL) == b'\0\0\0\0'
+        connection.activate()
+
+        # A sender running in the loop thread must not wait for the
+        # loop when the queue is full.
+        payloads = [bytes([i]) for i in range(10)]
+        trigger, trigger_peer = socket.socketpair()
+
+        def send():
+            trigger.recv(1)
+            loop.remove(trigger)
+            connection.send_notifications(payloads)
+        loop.add(trigger, send)
+        trigger_peer.send(b'x')
+        assert self._receive_frames(client_socket, 10) == payloads
+
+        connection.shutdown()
+        client_socket.close()
+        connection.wait_for_deactivation()
+        connection.deactivate()
+        loop.stop()
+        trigger.close()
+        trigger_peer.close()
+
+    @pytest.mark.timeout(10)
+    @pytest.mark.filterwarnings(
+        'error::pytest.PytestUnhandledThreadExceptionWarning')
+    def test_loop_survives_closing_with_pending_write(self):
+        loop = SelectorLoop()
+        loop.start()
+        connections = []
+        for _ in range(2):
+            server_socket, client_socket = connected_sockets()
+            connection = BusConnection(socket_=server_socket, is_server=True,
+                                       loop=loop)
+            assert client_socket.recv(4, socket.MSG_WAITALL) == b'\0\0\0\0'
+            connection.activate()
+            connections.append((connection, client_socket))
+        (closed, closed_client), (alive, alive_client) = connections
+
+        # Keep the loop busy such that the write request queued by
+        # sending is still pending when the socket is closed.
+        busy = threading.Event()
+        release = threading.Event()
+        trigger, trigger_peer = socket.socketpair()
+
+        def block():
+            trigger.recv(1)
+            loop.remove(trigger)
+            busy.set()
+            release.wait()
+        loop.add(trigger, block)
+        trigger_peer.send(b'x')
+        assert busy.wait(5)
+        closed.send_notification(b'x' * 1000)
+        closed.deactivate()
+        # A write request for a closed socket which is not removed.
+        stray, stray_peer = socket.socketpair()
+        loop.add(stray, lambda: None, lambda: None)
+        loop.set_writing(stray, True)
+        stray.close()
+        release.set()
+
+        alive.send_notification(b'payload')
+        assert self._receive_frames(alive_client, 1) == [b'payload']
+
+        alive.shutdown()
+        alive_client.close()
+        alive.wait_for_deactivation()
+        alive.deactivate()
+        loop.stop()
+        closed_client.close()
+        stray_peer.close()
+        trigger.close()
+        trigger_peer.close()
+
+    @pytest.mark.timeout(10)
+    @pytest.mark.parametrize('use_loop', [False, True])
+    def test_shutdown_with_unresponsive_peer(self, use_loop):
+        loop = None
+        if use_loop:
+            loop = SelectorLoop()
+            loop.start()
+        server_socket, client_socket = connected_sockets()
+        client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        connection = BusConnection(socket_=server_socket, is_server=True,
+                                   loop=loop, drain_timeout=0.5)
+        assert client_socket.recv(4, socket.MSG_WAITALL) == b'\0\0\0\0'
+        connection.activate()
+
+        # The client never reads.
+        for _ in range(200):
+            connection.send_notification(b'x' * 100000)
+        start = time.monotonic()
+        connection.shutdown()
+        assert time.monotonic() - start < 3
+        assert connection.dropped_notifications > 0
+
+        client_socket.close()
+        connection.wait_for_deactivation()
+        connection.deactivate()
+        if loop is not None:
+            loop.stop()
+
+    def test_writer_is_daemon(self):
+        server_socket, client_socket = connected_sockets()
+        connection = BusConnection(socket_=server_socket, is_server=True)
+        assert client_socket.recv(4, socket.MSG_WAITALL) == b'\0\0\0\0'
+        connection.activate()
+        assert connection._writer.daemon
+
+        connection.shutdown()
+        client_socket.close()
+        connection.wait_for_deactivation()
+
+    @pytest.mark.filterwarnings(
+        'error::pytest.PytestUnraisableExceptionWarning')
+    def test_invalid_options(self):
+        server_socket, client_socket = connected_sockets()
+        for options in [{'send_queue_size': -1},
+                        {'overflow': 'explode'},
+                        {'send_queue_size': 0, 'coalesce_window': 0.1},
+                        {'send_queue_size': 0, 'conflate': True},
+                        {'drain_timeout': -1}]:
+            with pytest.raises(ValueError):
+                BusConnection(socket_=server_socket, is_server=True,
+                              **options)
+        client_socket.close()
+        server_socket.close()
+
+
+def free_port():
+    probe = socket.socket()
+    probe.bind(('localhost', 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    return port
+
+
+def receive_notification(client_socket):
+    size = int.from_bytes(client_socket.recv(4, socket.MSG_WAITALL),
+                          'little')
+    notification = Notification()
+    notification.ParseFromString(
+        client_socket.recv(size, socket.MSG_WAITALL))
+    return notification
+
+
+def send_control(client_socket, method, data=b'', sequence_number=1):
+    notification = make_notification('/__rsb/transport/socket/')
+    notification.event_id.sequence_number = sequence_number
+    notification.method = method
+    notification.data = data
+    notification.meta_data.create_time = 0
+    notification.meta_data.send_time = 0
+    serialized = notification.SerializeToString()
+    client_socket.sendall(len(serialized).to_bytes(4, 'little') + serialized)
+
+
+class TestSubscriptions:
+
+    @pytest.mark.timeout(10)
+    def test_server_forwards_subscribed_scopes(self):
+        port = free_port()
+        informer = get_connector(OutConnector, rsb.Scope('/'), server='1',
+                                 port=str(port))
+
+        def connect():
+            client = socket.create_connection(('localhost', port))
+            assert client.recv(4, socket.MSG_WAITALL) == b'\0\0\0\0'
+            return client
+
+        # A client which subscribes to /a/ only.
+        subscriber = connect()
+        send_control(subscriber, b'HELLO')
+        hello = receive_notification(subscriber)
+        assert hello.method == b'HELLO'
+        assert b'subscriptions' in hello.meta_data.user_infos[0].value
+        send_control(subscriber, b'SUBSCRIPTIONS', b'/a/', 1)
+        acknowledgement = receive_notification(subscriber)
+        assert acknowledgement.method == b'ACKNOWLEDGE'
+        assert acknowledgement.event_id.sequence_number == 1
+
+        # A client which does not understand subscriptions.
+        legacy = connect()
+        deadline = time.monotonic() + 5
+        while len(informer.bus.connections) < 2 and \
+                time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        def send(scope):
+            event = rsb.Event(rsb.EventId(uuid.uuid4(), 0),
+                              scope=rsb.Scope(scope),
+                              data=None, data_type=type(None))
+            informer.handle(event)
+
+        send('/b/')
+        send('/a/x/')
+        assert receive_notification(subscriber).scope == b'/a/x/'
+        assert receive_notification(legacy).scope == b'/b/'
+        assert receive_notification(legacy).scope == b'/a/x/'
+
+        # Changing subscriptions.
+        send_control(subscriber, b'SUBSCRIBE', b'/b/', 2)
+        assert receive_notification(subscriber).method == b'ACKNOWLEDGE'
+        send_control(subscriber, b'UNSUBSCRIBE', b'/a/', 3)
+        assert receive_notification(subscriber).method == b'ACKNOWLEDGE'
+        send('/a/')
+        send('/b/y/')
+        assert receive_notification(subscriber).scope == b'/b/y/'
+
+        subscriber.close()
+        legacy.close()
+        informer.deactivate()
+
+    @pytest.mark.timeout(10)
+    def test_legacy_client_receives_no_control_notifications(self):
+        port = free_port()
+        informer = get_connector(OutConnector, rsb.Scope('/'), server='1',
+                                 port=str(port))
+
+        # A client which does not know control notifications and
+        # receives everything. Urgent data would be read inline.
+        legacy = socket.socket()
+        legacy.setsockopt(socket.SOL_SOCKET, socket.SO_OOBINLINE, 1)
+        legacy.connect(('localhost', port))
+        assert legacy.recv(4, socket.MSG_WAITALL) == b'\0\0\0\0'
+        deadline = time.monotonic() + 5
+        while not informer.bus.connections and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        informer.handle(rsb.Event(rsb.EventId(uuid.uuid4(), 0),
+                                  scope=rsb.Scope('/a/'),
+                                  data=None, data_type=type(None)))
+        notification = receive_notification(legacy)
+        assert notification.scope == b'/a/'
+        legacy.settimeout(0.2)
+        with pytest.raises(socket.timeout):
+            legacy.recv(1)
+
+        legacy.close()
+        informer.deactivate()
+
+    @pytest.mark.timeout(10)
+    def test_bus_client_subscribes(self):
+        port = free_port()
+        informer = get_connector(OutConnector, rsb.Scope('/'), server='1',
+                                 port=str(port))
+        listener = get_connector(InConnector, rsb.Scope('/a'), server='0',
+                                 port=str(port), negotiate='1')
+        received = []
+        listener.set_observer_action(received.append)
+
+        server = informer.bus
+        assert isinstance(server, BusServer)
+        # The subscriptions are sent once the server replied.
+        deadline = time.monotonic() + 5
+        while not server._subscriptions and time.monotonic() < deadline:
+            time.sleep(0.01)
+        client_connection = listener.bus.connections[0]
+        assert b'subscriptions' in client_connection.peer_capabilities
+        with server.lock:
+            (server_connection, scopes), = server._subscriptions.items()
+        assert scopes == {b'/a/'}
+        assert b'subscriptions' in server_connection.peer_capabilities
+
+        for scope in ['/b/', '/a/x/']:
+            informer.handle(rsb.Event(rsb.EventId(uuid.uuid4(), 0),
+                                      scope=rsb.Scope(scope),
+                                      data=None, data_type=type(None)))
+        deadline = time.monotonic() + 5
+        while not received and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert [event.scope for event in received] == [rsb.Scope('/a/x/')]
+
+        listener.deactivate()
+        informer.deactivate()
+
+    @pytest.mark.timeout(10)
+    def test_legacy_server_receives_no_control_notifications(self):
+        # A bus server which does not know control notifications and
+        # relays everything it receives.
+        listen_socket = socket.socket()
+        listen_socket.bind(('localhost', 0))
+        listen_socket.listen(1)
+        port = listen_socket.getsockname()[1]
+        accepted = []
+
+        def accept():
+            client_socket, _ = listen_socket.accept()
+            client_socket.sendall(b'\0\0\0\0')
+            accepted.append(client_socket)
+        acceptor = threading.Thread(target=accept)
+        acceptor.start()
+
+        listener = get_connector(InConnector, rsb.Scope('/'), server='0',
+                                 port=str(port))
+        acceptor.join()
+        listen_socket.close()
+        legacy, = accepted
+
+        informer = get_connector(OutConnector, rsb.Scope('/a/'), server='0',
+                                 port=str(port))
+        informer.handle(rsb.Event(rsb.EventId(uuid.uuid4(), 0),
+                                  scope=rsb.Scope('/a/'),
+                                  data=None, data_type=type(None)))
+        assert receive_notification(legacy).scope == b'/a/'
+        legacy.settimeout(0.2)
+        with pytest.raises(socket.timeout):
+            legacy.recv(1)
+
+        legacy.close()
+        informer.deactivate()
+        listener.deactivate()
+
+
+class TestUnixSockets:
+
+    @pytest.fixture
+    def path(self):
+        directory = tempfile.mkdtemp()
+        yield os.path.join(directory, 'bus')
+        shutil.rmtree(directory)
+
+    @staticmethod
+    def roundtrip(path):
+        received = []
+        condition = threading.Condition()
+
+        def receive(event):
+            with condition:
+                received.append(event)
+                condition.notify()
+
+        listener = get_connector(InConnector, rsb.Scope('/unix'),
+                                 server='1', path=path)
+        listener.set_observer_action(receive)
+        informer = get_connector(OutConnector, rsb.Scope('/unix'),
+                                 server='0', path=path)
+        assert isinstance(informer.bus.connections[0], BusConnection)
+        informer.handle(rsb.Event(rsb.EventId(uuid.uuid4(), 0),
+                                  scope=rsb.Scope('/unix'),
+                                  data=b'payload', data_type=bytes))
+        with condition:
+            condition.wait_for(lambda: received, timeout=5)
+        informer.deactivate()
+        listener.deactivate()
+        assert [event.data for event in received] == [b'payload']
+
+    @pytest.mark.timeout(10)
+    def test_filesystem_path(self, path):
+        self.roundtrip(path)
+        assert not os.path.exists(path)
+
+    @pytest.mark.timeout(10)
+    @pytest.mark.skipif(not sys.platform.startswith('linux'),
+                        reason='abstract namespace requires Linux')
+    def test_abstract_namespace(self):
+        self.roundtrip('@rsb-test-{}'.format(uuid.uuid4().hex))
+
+    @pytest.mark.timeout(10)
+    def test_stale_socket_file_is_replaced(self, path):
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path)
+        stale.close()
+        assert os.path.exists(path)
+        self.roundtrip(path)
+
+    @pytest.mark.timeout(10)
+    def test_socket_file_in_use_is_kept(self, path):
+        server = BusServer(None, None, True, path=path)
+        server.activate()
+        try:
+            with pytest.raises(OSError):
+                BusServer(None, None, True, path=path).activate()
+            assert os.path.exists(path)
+        finally:
+            server.deactivate()
+
+    def test_transport_url(self, path):
+        connector = get_connector(InConnector, rsb.Scope('/'),
+                                  activate=False, path=path)
+        assert connector.get_transport_url().endswith('&path=' + path)
+
+
+def make_fragments(data, max_fragment_size=1000, sequence_number=1):
+    notification = make_notification()
+    notification.event_id.sequence_number = sequence_number
+    notification.wire_schema = b'bytes'
+    notification.data = data
+    notification.meta_data.create_time = 0
+    notification.meta_data.send_time = 0
+    return notification, notification_to_fragments(notification,
+                                                   max_fragment_size)
+
+
+class TestFragmentation:
+
+    def test_notification_to_fragments(self):
+        notification, fragments = make_fragments(bytes(range(256)) * 20)
+        assert len(fragments) > 1
+        for (i, fragment) in enumerate(fragments):
+            assert fragment.ByteSize() <= 1000
+            assert fragment.data_part == i
+            assert fragment.num_data_parts == len(fragments)
+        assert fragments[0].notification.scope == notification.scope
+        assert not fragments[1].notification.HasField('scope')
+        assert b''.join(fragment.notification.data
+                        for fragment in fragments) == notification.data
+
+    def test_notification_to_fragments_too_small(self):
+        with pytest.raises(ValueError):
+            make_fragments(b'x' * 1000, max_fragment_size=20)
+
+    def test_assembly_interleaved(self):
+        pool = AssemblyPool(1 << 20, 10)
+        first, first_fragments = make_fragments(b'a' * 5000, 1000, 1)
+        second, second_fragments = make_fragments(b'b' * 3000, 1000, 2)
+
+        completed = []
+        for pair in zip(first_fragments, second_fragments + [None] * 10):
+            for fragment in pair:
+                if fragment is not None:
+                    result = pool.add(fragment)
+                    if result is not None:
+                        completed.append(result)
+        assert completed == [second, first]
+        assert pool.pending_notifications == 0
+        assert pool.size == 0
+
+    def test_assembly_memory_limit(self):
+        pool = AssemblyPool(2500, 10)
+        first, first_fragments = make_fragments(b'a' * 5000, 1000, 1)
+        _, second_fragments = make_fragments(b'b' * 1500, 1000, 2)
+
+        for fragment in first_fragments[:2]:
+            assert pool.add(fragment) is None
+        # Exceeds the limit such that the oldest partial notification is
+        # discarded. Its remaining fragments are ignored.
+        assert pool.add(second_fragments[0]) is None
+        assert pool.discarded_notifications == 1
+        for fragment in first_fragments[2:]:
+            assert pool.add(fragment) is None
+        assert pool.add(second_fragments[1]).data == b'b' * 1500
+        assert pool.discarded_notifications == 1
+
+    def test_assembly_timeout(self):
+        pool = AssemblyPool(1 << 20, 0.05)
+        _, fragments = make_fragments(b'a' * 5000, 1000)
+        assert pool.add(fragments[0]) is None
+        time.sleep(0.1)
+        single = FragmentedNotification()
+        single.notification.CopyFrom(make_notification())
+        single.num_data_parts = 1
+        single.data_part = 0
+        assert pool.add(single) == single.notification
+        assert pool.discarded_notifications == 1
+        assert pool.pending_notifications == 0
+
+    def test_bus_fragments_large_notifications(self):
+        bus = Bus()
+        whole, fragmenting = RecordingConnection(), RecordingConnection(1000)
+        bus.connections.extend([whole, fragmenting])
+        bus.activate()
+
+        bus.handle_outgoing(make_notification())
+        notification, fragments = make_fragments(b'x' * 5000)
+        bus.handle_outgoing(notification)
+
+        assert len(whole.sent) == 2
+        assert whole.sent[1] == notification.SerializeToString()
+        assert isinstance(fragmenting.sent[0], bytes)
+        assert fragmenting.sent[1] == [fragment.SerializeToString()
+                                       for fragment in fragments]
+
+    @pytest.mark.timeout(10)
+    @pytest.mark.parametrize('same_sender', [False, True])
+    def test_fragments_interleaved_with_small_notifications(self,
+                                                            same_sender):
+        server_socket, client_socket = connected_sockets()
+        sender = BusConnection(socket_=server_socket, is_server=True)
+        receiver = BusConnection(socket_=client_socket)
+
+        received = []
+        done = threading.Event()
+
+        def handler(notification_and_buffer):
+            received.append(notification_and_buffer[0])
+            if len(received) == 2:
+                done.set()
+        receiver.add_handler(handler)
+
+        # Both are queued before the writer starts.
+        big, fragments = make_fragments(b'x' * 100000, 1000)
+        sender.send_fragments([fragment.SerializeToString()
+                               for fragment in fragments],
+                              sender=big.event_id.sender_id)
+        small = make_notification('/small/')
+        if same_sender:
+            small.event_id.sender_id = big.event_id.sender_id
+        sender.send_notification(small.SerializeToString(),
+                                 sender=small.event_id.sender_id)
+        receiver.activate()
+        sender.activate()
+
+        assert done.wait(5)
+        # Only notifications of other senders overtake the fragments.
+        if same_sender:
+            assert received == [big, small]
+        else:
+            assert received == [small, big]
+
+        sender.shutdown()
+        receiver.wait_for_deactivation()
+        sender.wait_for_deactivation()
+
+    @pytest.mark.timeout(10)
+    @pytest.mark.parametrize('io', ['threads', 'selector'])
+    def test_server_relays_reassembled_notifications(self, io):
+        port = free_port()
+        server = get_connector(InConnector, rsb.Scope('/'), server='1',
+                               port=str(port), io=io, maxfragmentsize='1000')
+        received = [[], [], []]
+        done = [threading.Event() for _ in received]
+
+        def make_action(index):
+            def action(event):
+                received[index].append(event)
+                done[index].set()
+            return action
+        server.set_observer_action(make_action(0))
+
+        clients = []
+        for index in range(3):
+            client = BusClient('localhost', port, True, negotiate=True,
+                               max_fragment_size=1000)
+            client.activate()
+            if index:
+                connector = InConnector(
+                    converters=get_global_converter_map(bytes))
+                connector.scope = rsb.Scope('/')
+                connector.set_observer_action(make_action(index))
+                client.add_connector(connector)
+            clients.append(client)
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and not (
+                len(server.bus.connections) == 3 and
+                all(b'fragments' in connection.peer_capabilities
+                    for connection in server.bus.connections +
+                    [client.connections[0] for client in clients])):
+            time.sleep(0.01)
+
+        notification, _ = make_fragments(b'x' * 5000)
+        clients[0].handle_outgoing(notification)
+
+        for event in done:
+            assert event.wait(5)
+        for events in received:
+            assert [event.data for event in events] == [b'x' * 5000]
+
+        for client in clients:
+            client.deactivate()
+        server.deactivate()
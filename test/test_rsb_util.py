@@ -19,6 +19,7 @@
 # ============================================================
 
 import random
+import threading
 from threading import Condition
 import time
 
@@ -150,3 +151,125 @@ class TestOrderedQueueDispatcherPool:
         time.sleep(0.1)
 
         assert len(receiver.messages) == 0
+
+    def test_unregister_pending(self):
+
+        pool = OrderedQueueDispatcherPool(2, self.deliver)
+
+        removed = self.StubReciever()
+        kept = self.StubReciever()
+        pool.register_receiver(removed)
+        pool.register_receiver(kept)
+
+        # Both receivers are in the ready queue before the pool is
+        # started.
+        for i in range(3):
+            pool.push(i)
+        assert pool.unregister_receiver(removed)
+
+        pool.start()
+        with kept.condition:
+            while len(kept.messages) < 3:
+                kept.condition.wait()
+        pool.stop()
+
+        assert kept.messages == [0, 1, 2]
+        assert removed.messages == []
+
+    @pytest.mark.timeout(10)
+    @pytest.mark.parametrize('overflow,expected', [
+        ('drop-oldest', [0, 3, 4]),
+        ('drop-newest', [0, 1, 2]),
+    ])
+    def test_bounded_queue_drop(self, overflow, expected):
+
+        gate = threading.Event()
+        entered = threading.Event()
+        received = []
+
+        def deliver(receiver, message):
+            entered.set()
+            gate.wait()
+            received.append(message)
+
+        pool = OrderedQueueDispatcherPool(1, deliver, queue_size=2,
+                                          overflow=overflow)
+        pool.register_receiver(self.StubReciever())
+        pool.start()
+
+        pool.push(0)
+        entered.wait(5)
+        for i in range(1, 5):
+            pool.push(i)
+        assert pool.dropped_messages == 2
+        assert pool.max_queue_depth == 2
+        assert pool.queue_depth == 2
+
+        gate.set()
+        while len(received) < 3:
+            time.sleep(0.01)
+        pool.stop()
+        assert received == expected
+
+    @pytest.mark.timeout(10)
+    def test_bounded_queue_block(self):
+
+        gate = threading.Event()
+        entered = threading.Event()
+        received = []
+
+        def deliver(receiver, message):
+            entered.set()
+            gate.wait()
+            received.append(message)
+
+        pool = OrderedQueueDispatcherPool(1, deliver, queue_size=1)
+        pool.register_receiver(self.StubReciever())
+        pool.start()
+
+        pool.push(0)
+        entered.wait(5)
+        pool.push(1)
+        producer = threading.Thread(target=pool.push, args=(2,))
+        producer.start()
+        producer.join(0.2)
+        assert producer.is_alive()
+
+        gate.set()
+        producer.join()
+        while len(received) < 3:
+            time.sleep(0.01)
+        pool.stop()
+        assert received == [0, 1, 2]
+        assert pool.dropped_messages == 0
+
+    @pytest.mark.parametrize('options', [
+        {'queue_size': 0},
+        {'overflow': 'reject'},
+    ])
+    def test_invalid_options(self, options):
+        with pytest.raises(ValueError):
+            OrderedQueueDispatcherPool(1, self.deliver, **options)
+
+    def test_push_to(self):
+
+        pool = OrderedQueueDispatcherPool(2, self.deliver)
+        first = self.StubReciever()
+        second = self.StubReciever()
+        pool.register_receiver(first)
+        pool.register_receiver(second)
+        pool.start()
+
+        pool.push_to(first, 1)
+        pool.push(2)
+        pool.push_to(second, 3)
+        for receiver, expected in ((first, [1, 2]), (second, [2, 3])):
+            with receiver.condition:
+                while len(receiver.messages) < 2:
+                    receiver.condition.wait()
+            assert receiver.messages == expected
+
+        pool.unregister_receiver(first)
+        with pytest.raises(KeyError):
+            pool.push_to(first, 4)
+        pool.stop()